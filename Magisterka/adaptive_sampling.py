@@ -0,0 +1,117 @@
+import time
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence
+from online_stats import OnlineAggregator
+
+SAMPLING_FILENAME = "sampling.json"
+MIN_ITERATIONS = 20
+CONFIDENCE = 0.95
+
+# Reasons for stopping the sampling of a config
+CONVERGED = 'converged'
+ITERATION_BUDGET = 'iteration_budget'
+TIME_BUDGET = 'time_budget'
+
+
+class AdaptiveSampler:
+    def __init__(self, aggregator: OnlineAggregator, target_width: float, metrics: Sequence[str],
+                 min_iterations: int = MIN_ITERATIONS, time_budget: Optional[float] = None,
+                 confidence: float = CONFIDENCE):
+        """
+        Initialize the AdaptiveSampler, the stopping rule of the sequential sampling of a config.
+
+        The sampling stops once the confidence interval of the mean of every metric of every algorithm is narrower
+        than the target relative to the mean, or once the time budget runs out.
+
+        Args:
+            aggregator (OnlineAggregator): Running statistics of the config, fed with every results row.
+            target_width (float): Target width of the confidence intervals relative to the mean, 0.1 is +-5%.
+            metrics (Sequence[str]): Results columns that have to converge.
+            min_iterations (int): Iterations of every algorithm before convergence is checked.
+            time_budget (Optional[float]): Seconds of sampling after which the config stops. Defaults to no limit.
+            confidence (float): Confidence level of the intervals.
+        """
+        self.aggregator = aggregator
+        self.target_width = target_width
+        self.metrics = list(metrics)
+        self.min_iterations = min_iterations
+        self.time_budget = time_budget
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self.time_start = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """
+        Get the time since the sampling started.
+
+        Returns:
+            float: Elapsed seconds.
+        """
+        return time.perf_counter() - self.time_start
+
+    def relative_widths(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the relative confidence interval widths.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Width relative to the mean, keyed by algorithm name and metric.
+        """
+        widths: Dict[str, Dict[str, float]] = {}
+        for (name, metric), stats in self.aggregator.running.items():
+            if metric in self.metrics:
+                widths.setdefault(name, {})[metric] = stats.relative_ci_width(self.z)
+        return widths
+
+    def converged(self, algorithm_names: List[str]) -> bool:
+        """
+        Check if every metric of every algorithm reached the target width.
+
+        Args:
+            algorithm_names (List[str]): Names of the algorithms of the config.
+
+        Returns:
+            bool: True if the sampling can stop.
+        """
+        for name in algorithm_names:
+            for metric in self.metrics:
+                stats = self.aggregator.running.get((name, metric))
+                if stats is None or stats.count < self.min_iterations \
+                        or stats.relative_ci_width(self.z) > self.target_width:
+                    return False
+        return True
+
+    def stop_reason(self, algorithm_names: List[str]) -> Optional[str]:
+        """
+        Check if the sampling should stop before the next iteration.
+
+        Args:
+            algorithm_names (List[str]): Names of the algorithms of the config.
+
+        Returns:
+            Optional[str]: CONVERGED or TIME_BUDGET, None to keep sampling.
+        """
+        if self.converged(algorithm_names):
+            return CONVERGED
+        if self.time_budget is not None and self.elapsed() >= self.time_budget:
+            return TIME_BUDGET
+        return None
+
+    def report(self, reason: str, iterations: int) -> Dict[str, Any]:
+        """
+        Describe why and when the sampling of the config stopped.
+
+        Args:
+            reason (str): The stopping reason.
+            iterations (int): Number of iterations run on the config, including resumed ones.
+
+        Returns:
+            Dict[str, Any]: The sampling record of the config.
+        """
+        return {
+            'stopping_reason': reason,
+            'iterations': iterations,
+            'elapsed_s': round(self.elapsed(), 3),
+            'target_ci_width': self.target_width,
+            'min_iterations': self.min_iterations,
+            'time_budget_s': self.time_budget,
+            'relative_ci_widths': self.relative_widths(),
+        }
@@ -1,8 +1,18 @@
 import heapq
+import itertools
 from typing import List, Tuple, Set
+from enums.tie_breaking import TieBreaking as tie_breaking
 from spot import Spot
 from utils import reconstruct_path, draw_spot, manhattan_heuristic
 
+# Secondary heap keys for frontier entries (f, tie, seq, spot), seq is unique so Spot is never compared
+TIE_BREAKING_KEYS = {
+    tie_breaking.FIFO: lambda g, h, seq: seq,
+    tie_breaking.LIFO: lambda g, h, seq: -seq,
+    tie_breaking.HIGH_G: lambda g, h, seq: -g,
+    tie_breaking.LOW_H: lambda g, h, seq: h,
+}
+
 
 def a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwargs) -> Tuple[List[Spot], Set[Spot]]:
     """
@@ -13,7 +23,9 @@ def a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwar
         start_spot (Spot): The starting spot of the search.
         end_spot (Spot): The ending spot of the search.
         kwargs: Additional optional arguments like 'win' (Pygame window), 'draw_updates' (whether to draw updates),
-                'window_mode' (whether to display in windowed mode).
+                'window_mode' (whether to display in windowed mode), 'tie_breaking' (TieBreaking policy for
+                equal f_score entries, FIFO by default) and 'stats' (SearchStats collecting the operation counts,
+                not collected by default).
 
     Returns:
         Tuple[List[Spot], Set[Spot]]: A tuple containing the path from start to end and the set of visited spots.
@@ -21,8 +33,12 @@ def a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwar
     win = kwargs.get('win')
     draw_updates = kwargs.get('draw_updates', True)
     window_mode = kwargs.get('window_mode', True)
+    stats = kwargs.get('stats')
+
+    tie_key = TIE_BREAKING_KEYS[tie_breaking(kwargs.get('tie_breaking', tie_breaking.FIFO))]
+    counter = itertools.count()
 
-    pq = [(0, start_spot)]  # Priority queue initialized with the start spot
+    pq = [(0, 0, next(counter), start_spot)]  # Priority queue initialized with the start spot
     visited = set()
     path = []
 
@@ -34,7 +50,7 @@ def a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwar
     came_from = {spot: None for row in grid_maze for spot in row}  # Track the most efficient path
 
     while pq:
-        current_f_score, current_spot = heapq.heappop(pq)
+        current_f_score, _, _, current_spot = heapq.heappop(pq)
 
         if current_spot in visited:
             continue
@@ -51,11 +67,14 @@ def a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwar
                 current_spot = came_from[current_spot]
             path.reverse()
             reconstruct_path(path, grid_maze, start_spot, end_spot, draw_updates, win, window_mode=window_mode)
+            __finish_stats(stats, (pq, visited))
             return path, visited
 
         __explore_neighbours(pq, current_spot, came_from, visited, g_score, f_score, end_spot, start_spot,
-                             draw_updates, window_mode, win)
+                             draw_updates, window_mode, win, counter, tie_key,
+                             stats.forward if stats is not None else None)
 
+    __finish_stats(stats, (pq, visited))
     return [], visited
 
 
@@ -68,7 +87,8 @@ def equalized_bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot
         grid_maze (List[List[Spot]]): The grid maze containing all the spots.
         start_spot (Spot): The starting spot of the search.
         end_spot (Spot): The ending spot of the search.
-        kwargs: Additional optional arguments like 'win', 'draw_updates', 'window_mode'.
+        kwargs: Additional optional arguments like 'win', 'draw_updates', 'window_mode', 'tie_breaking' and
+                'stats'.
 
     Returns:
         Tuple[List[Spot], Set[Spot]]: A tuple containing the path from start to end and the set of visited spots.
@@ -76,9 +96,14 @@ def equalized_bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot
     win = kwargs.get('win')
     draw_updates = kwargs.get('draw_updates', True)
     window_mode = kwargs.get('window_mode', True)
+    stats = kwargs.get('stats')
 
-    pq_start = [(0, start_spot)]  # Priority queue for the start search
-    pq_end = [(0, end_spot)]  # Priority queue for the end search
+    tie_key = TIE_BREAKING_KEYS[tie_breaking(kwargs.get('tie_breaking', tie_breaking.FIFO))]
+    counter_start = itertools.count()
+    counter_end = itertools.count()
+
+    pq_start = [(0, 0, next(counter_start), start_spot)]  # Priority queue for the start search
+    pq_end = [(0, 0, next(counter_end), end_spot)]  # Priority queue for the end search
 
     visited_start = set()
     visited_end = set()
@@ -98,7 +123,7 @@ def equalized_bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot
 
     while pq_start and pq_end:
         if len(pq_end) >= len(pq_start) > 0:
-            current_f_score_start, current_spot_start = heapq.heappop(pq_start)
+            current_f_score_start, _, _, current_spot_start = heapq.heappop(pq_start)
 
             if current_spot_start in visited_start:
                 continue
@@ -113,13 +138,15 @@ def equalized_bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot
                 current_spot_start.make_closed()
                 path = __reconstruct_bidirectional_path(current_spot_start, came_from_start, came_from_end)
                 reconstruct_path(path, grid_maze, start_spot, end_spot, draw_updates, win, window_mode=window_mode)
+                __finish_stats(stats, (pq_start, visited_start), (pq_end, visited_end))
                 return path, visited_start.union(visited_end)
 
             __explore_neighbours(pq_start, current_spot_start, came_from_start, visited_start,
                                  g_score_start, f_score_start, end_spot, start_spot,
-                                 draw_updates, window_mode, win)
+                                 draw_updates, window_mode, win, counter_start, tie_key,
+                                 stats.forward if stats is not None else None)
         else:
-            current_f_score_end, current_spot_end = heapq.heappop(pq_end)
+            current_f_score_end, _, _, current_spot_end = heapq.heappop(pq_end)
 
             if current_spot_end in visited_end:
                 continue
@@ -134,12 +161,15 @@ def equalized_bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot
                 current_spot_end.make_closed()
                 path = __reconstruct_bidirectional_path(current_spot_end, came_from_start, came_from_end)
                 reconstruct_path(path, grid_maze, start_spot, end_spot, draw_updates, win, window_mode=window_mode)
+                __finish_stats(stats, (pq_start, visited_start), (pq_end, visited_end))
                 return path, visited_start.union(visited_end)
 
             __explore_neighbours(pq_end, current_spot_end, came_from_end, visited_end,
                                  g_score_end, f_score_end, start_spot, end_spot,
-                                 draw_updates, window_mode, win)
+                                 draw_updates, window_mode, win, counter_end, tie_key,
+                                 stats.backward if stats is not None else None)
 
+    __finish_stats(stats, (pq_start, visited_start), (pq_end, visited_end))
     return [], visited_start.union(visited_end)
 
 
@@ -152,7 +182,8 @@ def bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot
         grid_maze (List[List[Spot]]): The grid maze containing all the spots.
         start_spot (Spot): The starting spot of the search.
         end_spot (Spot): The ending spot of the search.
-        kwargs: Additional optional arguments like 'win', 'draw_updates', 'window_mode', and 'heuristic_method'.
+        kwargs: Additional optional arguments like 'win', 'draw_updates', 'window_mode', 'heuristic_method',
+                'tie_breaking' and 'stats'.
 
     Returns:
         Tuple[List[Spot], Set[Spot]]: A tuple containing the path from start to end and the set of visited spots.
@@ -160,9 +191,14 @@ def bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot
     win = kwargs.get('win')
     draw_updates = kwargs.get('draw_updates', True)
     window_mode = kwargs.get('window_mode', True)
+    stats = kwargs.get('stats')
+
+    tie_key = TIE_BREAKING_KEYS[tie_breaking(kwargs.get('tie_breaking', tie_breaking.FIFO))]
+    counter_start = itertools.count()
+    counter_end = itertools.count()
 
-    pq_start = [(0, start_spot)]  # Priority queue for the start search
-    pq_end = [(0, end_spot)]  # Priority queue for the end search
+    pq_start = [(0, 0, next(counter_start), start_spot)]  # Priority queue for the start search
+    pq_end = [(0, 0, next(counter_end), end_spot)]  # Priority queue for the end search
 
     visited_start = set()
     visited_end = set()
@@ -181,7 +217,7 @@ def bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot
     came_from_end = {spot: None for row in grid_maze for spot in row}
 
     while pq_start and pq_end:
-        current_f_score_start, current_spot_start = heapq.heappop(pq_start)
+        current_f_score_start, _, _, current_spot_start = heapq.heappop(pq_start)
 
         if current_spot_start in visited_start:
             continue
@@ -195,12 +231,14 @@ def bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot
         if current_spot_start in visited_end:
             path = __reconstruct_bidirectional_path(current_spot_start, came_from_start, came_from_end)
             reconstruct_path(path, grid_maze, start_spot, end_spot, draw_updates, win, window_mode=window_mode)
+            __finish_stats(stats, (pq_start, visited_start), (pq_end, visited_end))
             return path, visited_start.union(visited_end)
 
         __explore_neighbours(pq_start, current_spot_start, came_from_start, visited_start, g_score_start, f_score_start,
-                             end_spot, start_spot, draw_updates, window_mode, win)
+                             end_spot, start_spot, draw_updates, window_mode, win, counter_start, tie_key,
+                             stats.forward if stats is not None else None)
 
-        current_f_score_end, current_spot_end = heapq.heappop(pq_end)
+        current_f_score_end, _, _, current_spot_end = heapq.heappop(pq_end)
 
         if current_spot_end in visited_end:
             continue
@@ -214,11 +252,14 @@ def bidirectional_a_star(grid_maze: List[List[Spot]], start_spot: Spot, end_spot
         if current_spot_end in visited_start:
             path = __reconstruct_bidirectional_path(current_spot_end, came_from_start, came_from_end)
             reconstruct_path(path, grid_maze, start_spot, end_spot, draw_updates, win, window_mode=window_mode)
+            __finish_stats(stats, (pq_start, visited_start), (pq_end, visited_end))
             return path, visited_start.union(visited_end)
 
         __explore_neighbours(pq_end, current_spot_end, came_from_end, visited_end, g_score_end, f_score_end,
-                             start_spot, end_spot, draw_updates, window_mode, win)
+                             start_spot, end_spot, draw_updates, window_mode, win, counter_end, tie_key,
+                             stats.backward if stats is not None else None)
 
+    __finish_stats(stats, (pq_start, visited_start), (pq_end, visited_end))
     return [], visited_start.union(visited_end)
 
 
@@ -230,7 +271,7 @@ def dijkstra(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kw
         grid_maze (List[List[Spot]]): The grid maze containing all the spots.
         start_spot (Spot): The starting spot of the search.
         end_spot (Spot): The ending spot of the search.
-        kwargs: Additional optional arguments like 'win', 'draw_updates', and 'window_mode'.
+        kwargs: Additional optional arguments like 'win', 'draw_updates', 'window_mode' and 'stats'.
 
     Returns:
         Tuple[List[Spot], Set[Spot]]: A tuple containing the path from start to end and the set of visited spots.
@@ -238,8 +279,10 @@ def dijkstra(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kw
     win = kwargs.get('win')
     draw_updates = kwargs.get('draw_updates', True)
     window_mode = kwargs.get('window_mode', True)
+    stats = kwargs.get('stats')
 
-    pq = [(0, start_spot)]  # Priority queue initialized with the start spot
+    counter = itertools.count()  # Insertion order breaks distance ties, so Spot is never compared
+    pq = [(0, next(counter), start_spot)]  # Priority queue initialized with the start spot
 
     g_score = {spot: float('inf') for row in grid_maze for spot in row}
     g_score[start_spot] = 0
@@ -248,7 +291,7 @@ def dijkstra(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kw
     came_from = {spot: None for row in grid_maze for spot in row}
 
     while pq:
-        current_distance, current_spot = heapq.heappop(pq)
+        current_distance, _, current_spot = heapq.heappop(pq)
         if current_spot in visited:
             continue
         visited.add(current_spot)
@@ -266,19 +309,24 @@ def dijkstra(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kw
                 current = came_from[current]
             path.reverse()
             reconstruct_path(path, grid_maze, start_spot, end_spot, draw_updates, win, window_mode=window_mode)
+            __finish_stats(stats, (pq, visited))
             return path, visited
 
+        frontier_size = len(pq)
         for neighbor in current_spot.neighbors:
             distance = current_distance + neighbor.spot_value
             if distance < g_score[neighbor]:
                 g_score[neighbor] = distance
                 came_from[neighbor] = current_spot
-                heapq.heappush(pq, (distance, neighbor))
+                heapq.heappush(pq, (distance, next(counter), neighbor))
                 if neighbor != start_spot and neighbor != end_spot:
                     neighbor.make_next()
                     if draw_updates and window_mode:
                         draw_spot(win=win, spot=neighbor)
+        if stats is not None:
+            stats.forward.record_expansion(len(pq) - frontier_size, len(pq), len(current_spot.neighbors))
 
+    __finish_stats(stats, (pq, visited))
     return [], visited
 
 
@@ -291,7 +339,7 @@ def limited_deep_dfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Sp
         grid_maze (List[List[Spot]]): The grid maze containing all the spots.
         start_spot (Spot): The starting spot of the search.
         end_spot (Spot): The ending spot of the search.
-        kwargs: Additional optional arguments like 'win', 'draw_updates', and 'window_mode'.
+        kwargs: Additional optional arguments like 'win', 'draw_updates', 'window_mode' and 'stats'.
 
     Returns:
         Tuple[List[Spot], Set[Spot]]: A tuple containing the path from start to end and the set of visited spots.
@@ -299,6 +347,7 @@ def limited_deep_dfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Sp
     win = kwargs.get('win')
     draw_updates = kwargs.get('draw_updates', True)
     window_mode = kwargs.get('window_mode', True)
+    stats = kwargs.get('stats')
 
     depth = 0
     stack = [(start_spot, None)]  # Stack initialized with the start spot
@@ -331,8 +380,10 @@ def limited_deep_dfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Sp
                     current_spot = came_from[current_spot]
                 path.reverse()
                 reconstruct_path(path, grid_maze, start_spot, end_spot, draw_updates, win, window_mode=window_mode)
+                __finish_stats(stats, (stack, visited))
                 return path, visited
 
+            frontier_size = len(stack)
             for neighbor in current_spot.neighbors:
                 if neighbor not in visited:
                     stack.append((neighbor, current_spot))
@@ -340,7 +391,11 @@ def limited_deep_dfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Sp
                         neighbor.make_next()
                         if draw_updates and window_mode:
                             draw_spot(win=win, spot=neighbor)
+            if stats is not None:
+                pushed = len(stack) - frontier_size
+                stats.forward.record_expansion(pushed, len(stack), pushed)
 
+    __finish_stats(stats, (stack, visited))
     return [], visited
 
 
@@ -352,7 +407,7 @@ def dfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwargs)
         grid_maze (List[List[Spot]]): The grid maze containing all the spots.
         start_spot (Spot): The starting spot of the search.
         end_spot (Spot): The ending spot of the search.
-        kwargs: Additional optional arguments like 'win', 'draw_updates', and 'window_mode'.
+        kwargs: Additional optional arguments like 'win', 'draw_updates', 'window_mode' and 'stats'.
 
     Returns:
         Tuple[List[Spot], Set[Spot]]: A tuple containing the path from start to end and the set of visited spots.
@@ -360,6 +415,7 @@ def dfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwargs)
     win = kwargs.get('win')
     draw_updates = kwargs.get('draw_updates', True)
     window_mode = kwargs.get('window_mode', True)
+    stats = kwargs.get('stats')
 
     stack = [(start_spot, None)]  # Stack initialized with the start spot
     visited = set()
@@ -384,8 +440,10 @@ def dfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwargs)
                     current_spot = came_from[current_spot]
                 path.reverse()
                 reconstruct_path(path, grid_maze, start_spot, end_spot, draw_updates, win, window_mode=window_mode)
+                __finish_stats(stats, (stack, visited))
                 return path, visited
 
+            frontier_size = len(stack)
             for neighbor in current_spot.neighbors:
                 if neighbor not in visited:
                     stack.append((neighbor, current_spot))
@@ -393,7 +451,11 @@ def dfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwargs)
                         neighbor.make_next()
                         if draw_updates and window_mode:
                             draw_spot(win=win, spot=neighbor)
+            if stats is not None:
+                pushed = len(stack) - frontier_size
+                stats.forward.record_expansion(pushed, len(stack), pushed)
 
+    __finish_stats(stats, (stack, visited))
     return [], visited
 
 
@@ -405,7 +467,7 @@ def bfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwargs)
         grid_maze (List[List[Spot]]): The grid maze containing all the spots.
         start_spot (Spot): The starting spot of the search.
         end_spot (Spot): The ending spot of the search.
-        kwargs: Additional optional arguments like 'win', 'draw_updates', and 'window_mode'.
+        kwargs: Additional optional arguments like 'win', 'draw_updates', 'window_mode' and 'stats'.
 
     Returns:
         Tuple[List[Spot], Set[Spot]]: A tuple containing the path from start to end and the set of visited spots.
@@ -413,6 +475,7 @@ def bfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwargs)
     win = kwargs.get('win')
     draw_updates = kwargs.get('draw_updates', True)
     window_mode = kwargs.get('window_mode', True)
+    stats = kwargs.get('stats')
 
     queue = [(start_spot, None)]  # Queue initialized with the start spot
     visited = set()
@@ -438,8 +501,10 @@ def bfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwargs)
                     current_spot = came_from[current_spot]
                 path.reverse()
                 reconstruct_path(path, grid_maze, start_spot, end_spot, draw_updates, win, window_mode=window_mode)
+                __finish_stats(stats, (queue, visited))
                 return path, visited
 
+            frontier_size = len(queue)
             for neighbor in current_spot.neighbors:
                 if neighbor not in visited:
                     queue.append((neighbor, current_spot))
@@ -447,7 +512,11 @@ def bfs(grid_maze: List[List[Spot]], start_spot: Spot, end_spot: Spot, **kwargs)
                         neighbor.make_next()
                         if draw_updates and window_mode:
                             draw_spot(win=win, spot=neighbor)
+            if stats is not None:
+                pushed = len(queue) - frontier_size
+                stats.forward.record_expansion(pushed, len(queue), pushed)
 
+    __finish_stats(stats, (queue, visited))
     return [], visited
 
 
@@ -480,8 +549,25 @@ def __reconstruct_bidirectional_path(meeting_spot, came_from_start, came_from_en
     return path_start + path_end[1:]
 
 
+def __finish_stats(stats, *frontiers):
+    """
+    Derive the pops of every frontier when a search stops.
+
+    Args:
+        stats (Optional[SearchStats]): The operation counters of the search, nothing is done when None.
+        frontiers (Tuple[list, set]): The frontier and the visited set of the forward search, followed by the
+                                      backward search for bidirectional algorithms.
+
+    Returns:
+        None
+    """
+    if stats is not None:
+        for frontier_stats, (frontier, visited) in zip((stats.forward, stats.backward), frontiers):
+            frontier_stats.finish(len(frontier), len(visited))
+
+
 def __explore_neighbours(pq, current_spot, came_from, visited, g_score, f_score, end_spot, start_spot,
-                         draw_updates, window_mode, win):
+                         draw_updates, window_mode, win, counter, tie_key, stats=None):
     """
     Explore the neighbors of the current spot for pathfinding algorithms.
 
@@ -497,20 +583,29 @@ def __explore_neighbours(pq, current_spot, came_from, visited, g_score, f_score,
         draw_updates (bool): Whether to draw updates on the grid.
         window_mode (bool): Whether the search is displayed in a window.
         win (Any): The Pygame window for drawing updates.
+        counter (Iterator[int]): The insertion counter of the priority queue.
+        tie_key (Callable[[int, int, int], int]): Secondary heap key built from g, h and the insertion number.
+        stats (Optional[FrontierStats]): The operation counters of the frontier, not collected when None.
 
     Returns:
         None
     """
+    frontier_size = len(pq)
     for neighbor in current_spot.neighbors:
         if neighbor not in visited:
             temp_g_score = g_score[current_spot] + neighbor.spot_value
             if temp_g_score < g_score[neighbor]:
                 came_from[neighbor] = current_spot
                 g_score[neighbor] = temp_g_score
-                f_score[neighbor] = temp_g_score + manhattan_heuristic(neighbor, end_spot)
-                heapq.heappush(pq, (f_score[neighbor], neighbor))
+                h_score = manhattan_heuristic(neighbor, end_spot)
+                f_score[neighbor] = temp_g_score + h_score
+                seq = next(counter)
+                heapq.heappush(pq, (f_score[neighbor], tie_key(temp_g_score, h_score, seq), seq, neighbor))
 
                 if neighbor != start_spot and neighbor != end_spot:
                     neighbor.make_next()
                     if draw_updates and window_mode:
                         draw_spot(win=win, spot=neighbor)
+    if stats is not None:
+        stats.record_expansion(len(pq) - frontier_size, len(pq),
+                               sum(neighbor not in visited for neighbor in current_spot.neighbors))
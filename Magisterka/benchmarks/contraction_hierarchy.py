@@ -0,0 +1,81 @@
+"""
+Measure the preprocessing of a contraction hierarchy on a static maze, its time, peak memory and file size, and the
+speed-up of its path queries against Dijkstra's algorithm on the same random start and end spots, the path costs of
+both have to match.
+
+Run from the Magisterka directory:
+    python -m benchmarks.contraction_hierarchy [--rows 641] [--queries 100] [--dijkstra-queries 20]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from algorithms import dijkstra
+from contraction_hierarchy import ContractionHierarchy, CH_EXTENSION
+from grid import Grid
+from main import WIDTH
+from memory_probe import measure_memory
+from utils import reset_grid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=641, help='Number of rows in the grid.')
+    parser.add_argument('--open-pct', type=int, default=5, help='Open cell percentage of the maze.')
+    parser.add_argument('--queries', type=int, default=100, help='Queries answered by the hierarchy.')
+    parser.add_argument('--dijkstra-queries', type=int, default=20,
+                        help='Leading queries also answered by Dijkstra to compare costs and times.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the maze and the queries.')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    grid = Grid(args.rows, max(1, WIDTH // args.rows), args.open_pct)
+    cells = [spot for row in grid.grid_maze for spot in row if not spot.is_barrier()]
+    picks = random.Random(args.seed)
+    pairs = [picks.sample(cells, 2) for _ in range(args.queries)]
+
+    time_start = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(grid.grid_maze)
+    build_time = time.perf_counter() - time_start
+    # Traced separately, tracemalloc slows the build down
+    _, build_peak, _ = measure_memory(lambda: ContractionHierarchy.build(grid.grid_maze))
+    path = os.path.join(tempfile.mkdtemp(), f"maze{CH_EXTENSION}")
+    hierarchy.save(path)
+    time_start = time.perf_counter()
+    hierarchy = ContractionHierarchy.load(path)
+    load_time = time.perf_counter() - time_start
+
+    print(f"{args.rows}x{args.rows} maze, {len(cells)} open cells, {len(hierarchy.middles)} shortcuts, "
+          f"{hierarchy.edge_count} upward edges")
+    print(f"{'build s':>8} {'peak MiB':>9} {'file MiB':>9} {'load s':>7}")
+    print(f"{build_time:>8.2f} {build_peak / 2 ** 20:>9.1f} {os.path.getsize(path) / 2 ** 20:>9.2f} {load_time:>7.2f}")
+
+    ch_time = dijkstra_time = 0.0
+    ch_settled = dijkstra_settled = 0
+    for query, (start, end) in enumerate(pairs):
+        time_start = time.perf_counter()
+        ch_path, settled = hierarchy.search(grid.grid_maze, start, end)
+        ch_time += time.perf_counter() - time_start
+        ch_settled += len(settled)
+        if query >= args.dijkstra_queries:
+            continue
+        time_start = time.perf_counter()
+        dijkstra_path, visited = dijkstra(grid.grid_maze, start, end, window_mode=False)
+        dijkstra_time += time.perf_counter() - time_start
+        dijkstra_settled += len(visited)
+        reset_grid(grid.grid_maze, window_mode=False)
+        if sum(spot.spot_value for spot in ch_path[1:]) != sum(spot.spot_value for spot in dijkstra_path[1:]):
+            raise AssertionError('Contraction hierarchy path differs in cost from the Dijkstra path.')
+
+    compared = min(args.dijkstra_queries, args.queries)
+    print(f"{'engine':>12} {'queries':>8} {'ms/query':>9} {'settled':>9}")
+    print(f"{'dijkstra':>12} {compared:>8} {dijkstra_time / compared * 1e3:>9.2f} {dijkstra_settled / compared:>9.0f}")
+    print(f"{'hierarchy':>12} {args.queries:>8} {ch_time / args.queries * 1e3:>9.2f} "
+          f"{ch_settled / args.queries:>9.0f}")
+    print(f"Query speed-up {dijkstra_time / compared / (ch_time / args.queries):.1f}x, preprocessing pays off after "
+          f"{build_time / (dijkstra_time / compared):.0f} queries")
+
+
+if __name__ == "__main__":
+    main()
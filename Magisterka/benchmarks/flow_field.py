@@ -0,0 +1,59 @@
+"""
+Compare one A* search per agent with a single cached flow field when many agents head to the same goal, the path
+costs of both have to match.
+
+Run from the Magisterka directory:
+    python -m benchmarks.flow_field [--rows 161] [--agents 1 10 100 1000]
+"""
+import argparse
+import random
+import time
+from algorithms import a_star
+from flow_field import FlowFieldCache
+from grid import Grid
+from main import WIDTH
+from utils import reset_grid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=161, help='Number of rows in the grid.')
+    parser.add_argument('--open-pct', type=int, default=5, help='Open cell percentage of the maze.')
+    parser.add_argument('--agents', type=int, nargs='+', default=[1, 10, 100, 1000], help='Agent counts.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the maze and the agents.')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    grid = Grid(args.rows, WIDTH // args.rows, args.open_pct)
+    goal = grid.end_spot
+    cells = [spot for row in grid.grid_maze for spot in row if not spot.is_barrier() and spot != goal]
+
+    print(f"{'agents':>7} {'a_star ms':>10} {'field ms':>9} {'cached ms':>10} {'speedup':>8}")
+    for agents in args.agents:
+        starts = random.Random(agents).choices(cells, k=agents)
+
+        time_start = time.perf_counter()
+        costs = []
+        for start in starts:
+            path, _ = a_star(grid.grid_maze, start, goal, window_mode=False)
+            costs.append(sum(spot.spot_value for spot in path[1:]))
+            reset_grid(grid.grid_maze, window_mode=False)
+        a_star_time = time.perf_counter() - time_start
+
+        cache = FlowFieldCache(grid)
+        time_start = time.perf_counter()
+        paths = [cache.path(start, goal) for start in starts]
+        field_time = time.perf_counter() - time_start
+        time_start = time.perf_counter()
+        for start in starts:
+            cache.path(start, goal)
+        cached_time = time.perf_counter() - time_start
+
+        if [sum(spot.spot_value for spot in path[1:]) for path in paths] != costs:
+            raise AssertionError('Flow field paths differ in cost from the A* paths.')
+        print(f"{agents:>7} {a_star_time * 1e3:>10.1f} {field_time * 1e3:>9.1f} {cached_time * 1e3:>10.1f} "
+              f"{a_star_time / field_time:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
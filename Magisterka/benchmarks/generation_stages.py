@@ -0,0 +1,197 @@
+"""
+Time every stage of Grid.generate_grid_maze separately over a fixed-seed set of mazes of each size and open
+percentage, and report the per-stage medians of the time and the peak memory. Stage times exclude the stages nested
+in them, select_start_end_spots calls update_all_neighbors, while the peaks include them.
+
+A saved baseline turns the run into a stage-by-stage comparison, exiting with status 1 when a stage's median time
+grows by more than the threshold and by more than a floor in milliseconds, so stages that take microseconds do not
+fail on timer noise.
+
+Run from the Magisterka directory:
+    python -m benchmarks.generation_stages [--sizes 41 161 641] [--open-pcts 0 5 25] [--mazes 5]
+        [--save-baseline generation_stages.json | --baseline generation_stages.json [--threshold 0.1] [--min-ms 0.1]]
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from statistics import median
+from typing import Any, Callable, Dict, List
+from grid import Grid
+from main import WIDTH, maze_seed
+
+STAGES = ["carve_path", "carve_additional_passages", "select_start_end_spots", "update_all_neighbors",
+          "ensure_path_to_end", "add_special_spots"]
+REGRESSION_THRESHOLD = 0.1
+# Smallest growth of a stage median time in ms that can fail the comparison
+REGRESSION_FLOOR_MS = 0.1
+
+
+class StageProbe:
+    def __init__(self, trace_memory: bool):
+        """
+        Initialize the StageProbe, the exclusive time and the peak memory of every stage of one maze.
+
+        Args:
+            trace_memory (bool): Measure the peak memory under tracemalloc instead of the time.
+        """
+        self.trace_memory = trace_memory
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.peaks: Dict[str, int] = defaultdict(int)
+        # Time spent in the nested stages of every running stage
+        self.nested: List[float] = []
+        # Traced memory peak of every running stage, kept across the peak resets of its nested stages
+        self.open_peaks: List[int] = []
+
+    def run(self, stage: str, func: Callable[[], Any]) -> Any:
+        """
+        Run a stage and record it.
+
+        Args:
+            stage (str): Name of the stage.
+            func (Callable[[], Any]): The stage.
+
+        Returns:
+            Any: The result of the stage.
+        """
+        if self.trace_memory:
+            if self.open_peaks:
+                self.open_peaks[-1] = max(self.open_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            self.open_peaks.append(0)
+        self.nested.append(0.0)
+        time_start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - time_start
+        self.seconds[stage] += elapsed - self.nested.pop()
+        if self.nested:
+            self.nested[-1] += elapsed
+        if self.trace_memory:
+            peak = max(self.open_peaks.pop(), tracemalloc.get_traced_memory()[1])
+            self.peaks[stage] = max(self.peaks[stage], peak - base)
+            if self.open_peaks:
+                self.open_peaks[-1] = max(self.open_peaks[-1], peak)
+        return result
+
+
+class StagedGrid(Grid):
+    def __init__(self, rows: int, cell_open_percentage: int, probe: StageProbe):
+        """
+        Initialize the StagedGrid, a Grid generated with every stage run through a probe.
+
+        Args:
+            rows (int): Number of rows in the grid.
+            cell_open_percentage (int): Open cell percentage of the maze.
+            probe (StageProbe): Probe recording the stages.
+        """
+        self.probe = probe
+        super().__init__(rows, max(1, WIDTH // rows), cell_open_percentage)
+
+    def carve_path(self) -> None:
+        self.probe.run('carve_path', super().carve_path)
+
+    def carve_additional_passages(self) -> None:
+        self.probe.run('carve_additional_passages', super().carve_additional_passages)
+
+    def select_start_end_spots(self) -> None:
+        self.probe.run('select_start_end_spots', super().select_start_end_spots)
+
+    def update_all_neighbors(self) -> None:
+        self.probe.run('update_all_neighbors', super().update_all_neighbors)
+
+    def ensure_path_to_end(self) -> bool:
+        return self.probe.run('ensure_path_to_end', super().ensure_path_to_end)
+
+    def add_special_spots(self) -> None:
+        self.probe.run('add_special_spots', super().add_special_spots)
+
+
+def measure_config(rows: int, cell_open_percentage: int, mazes: int, base_seed: int) -> Dict[str, Dict[str, float]]:
+    """
+    Generate the fixed-seed mazes of a config, once timed and once under tracemalloc.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cell_open_percentage (int): Open cell percentage of the mazes.
+        mazes (int): Number of mazes.
+        base_seed (int): Seed of the set, the mazes are the ones the sweep generates with this seed.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Median time in ms and median peak memory in KiB of every stage.
+    """
+    seconds, peaks = defaultdict(list), defaultdict(list)
+    for trace_memory in (False, True):
+        for iteration in range(mazes):
+            probe = StageProbe(trace_memory)
+            random.seed(maze_seed(rows, cell_open_percentage, iteration, base_seed))
+            if trace_memory:
+                tracemalloc.start()
+            try:
+                StagedGrid(rows, cell_open_percentage, probe)
+            finally:
+                if trace_memory:
+                    tracemalloc.stop()
+            for stage in STAGES:
+                if trace_memory:
+                    peaks[stage].append(probe.peaks[stage])
+                else:
+                    seconds[stage].append(probe.seconds[stage])
+    return {stage: {'median_ms': median(seconds[stage]) * 1e3, 'peak_kib': median(peaks[stage]) / 1024}
+            for stage in STAGES}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[41, 161, 641], help='Maze sizes.')
+    parser.add_argument('--open-pcts', type=int, nargs='+', default=[0, 5, 25], help='Open cell percentages.')
+    parser.add_argument('--mazes', type=int, default=5, help='Fixed-seed mazes per config.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the maze set.')
+    parser.add_argument('--save-baseline', type=str, default=None, help='Write the medians to this JSON file.')
+    parser.add_argument('--baseline', type=str, default=None, help='Compare the medians to this JSON file.')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Relative growth of a stage median time that fails the comparison, 0.1 is 10%%.')
+    parser.add_argument('--min-ms', type=float, default=REGRESSION_FLOOR_MS,
+                        help='Growth of a stage median time in ms it also has to exceed to fail the comparison.')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if (baseline['mazes'], baseline['seed']) != (args.mazes, args.seed):
+            print(f"Baseline measured {baseline['mazes']} mazes of seed {baseline['seed']}, the medians differ in "
+                  f"the maze set", file=sys.stderr)
+
+    results, regressions = {}, []
+    print(f"{'config':>10} {'stage':>26} {'median ms':>10} {'peak KiB':>9}" + (' vs baseline' if baseline else ''))
+    for size in args.sizes:
+        for pct in args.open_pcts:
+            config = f"{size}_{pct}"
+            results[config] = measure_config(size, pct, args.mazes, args.seed)
+            for stage, medians in results[config].items():
+                line = f"{config:>10} {stage:>26} {medians['median_ms']:>10.2f} {medians['peak_kib']:>9.1f}"
+                reference = baseline['configs'].get(config, {}).get(stage) if baseline else None
+                if reference is not None and reference['median_ms'] > 0:
+                    change = medians['median_ms'] / reference['median_ms'] - 1
+                    line += f" {change:>+11.1%}"
+                    if change > args.threshold and medians['median_ms'] - reference['median_ms'] > args.min_ms:
+                        regressions.append(f"{config} {stage}: {change:+.1%}")
+                print(line)
+
+    if args.save_baseline is not None:
+        with open(args.save_baseline, 'w') as file:
+            json.dump({'mazes': args.mazes, 'seed': args.seed, 'python': platform.python_version(),
+                       'configs': results}, file, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+    if regressions:
+        print("Stages slower than the baseline above the threshold:\n\t" + '\n\t'.join(regressions), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure the start-up cost of the headless entry points: the import time of each module in a fresh interpreter, and
+which GUI or plotting dependencies the import pulls in.
+
+Run from the Magisterka directory:
+    python -m benchmarks.import_time [--runs 10]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from statistics import median
+
+MODULES = ["algorithms", "grid", "main", "parallel_sweep"]
+HEAVY_DEPENDENCIES = ["pygame", "colorama", "matplotlib", "pandas", "numpy"]
+
+# Executed by every fresh interpreter, prints the import time and the heavy dependencies that were loaded
+PROBE = """
+import json, sys, time
+time_start = time.perf_counter_ns()
+import {module}
+elapsed = time.perf_counter_ns() - time_start
+print(json.dumps([elapsed, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+def measure_import(module: str) -> tuple:
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module (str): Name of the module.
+
+    Returns:
+        tuple: Import time in ns and the heavy dependencies loaded by the import.
+    """
+    output = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_DEPENDENCIES)],
+                            capture_output=True, text=True, check=True).stdout
+    elapsed, loaded = json.loads(output.strip().splitlines()[-1])
+    return elapsed, loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters per module.')
+    args = parser.parse_args()
+
+    print(f"{'module':>15} {'median ms':>10} {'min ms':>8}  heavy dependencies")
+    for module in MODULES:
+        timings, loaded = [], []
+        for _ in range(args.runs):
+            elapsed, loaded = measure_import(module)
+            timings.append(elapsed / 1e6)
+        print(f"{module:>15} {median(timings):>10.1f} {min(timings):>8.1f}  {', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Load-test the path query service: concurrent clients send path queries between random open cells of a maze and the
+client-side latency percentiles and throughput are reported, together with the service's own queue and batching
+metrics, for every batch size.
+
+Run from the Magisterka directory:
+    python -m benchmarks.path_service_load [--size 161] [--clients 16] [--queries 50] [--batch-sizes 1 32]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from statistics import quantiles
+from typing import List, Tuple
+from main import ALGORITHMS
+from path_service import PathClient, PathService, generate_grid, BATCH_WINDOW, LATENCY_PERCENTILES
+
+
+async def run_client(socket_path: str, grid_id: str, cells: List[Tuple[int, int]], queries: int,
+                     algorithms: List[str], seed: int) -> List[float]:
+    """
+    Send path queries one after another over a single connection.
+
+    Args:
+        socket_path (str): Path of the service's Unix socket.
+        grid_id (str): Id of the loaded grid.
+        cells (List[Tuple[int, int]]): Open cells to pick the start and end spots from.
+        queries (int): Number of queries.
+        algorithms (List[str]): Algorithms to pick from.
+        seed (int): Seed of the client's picks.
+
+    Returns:
+        List[float]: Latency of every query in ms.
+    """
+    picks = random.Random(seed)
+    client = await PathClient.connect(socket_path)
+    latencies = []
+    for _ in range(queries):
+        start, end = picks.sample(cells, 2)
+        time_start = time.perf_counter()
+        await client.request(op='path', grid=grid_id, algorithm=picks.choice(algorithms), start=start, end=end)
+        latencies.append((time.perf_counter() - time_start) * 1e3)
+    await client.close()
+    return latencies
+
+
+async def run_load(args: argparse.Namespace, batch_size: int, cells: List[Tuple[int, int]]) -> None:
+    """
+    Start a service with the batch size and measure it under the load of the concurrent clients.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+        batch_size (int): Maximal number of queries of a batch.
+        cells (List[Tuple[int, int]]): Open cells of the maze.
+    """
+    socket_path = os.path.join(tempfile.mkdtemp(), 'path_service.sock')
+    service = PathService(args.workers, batch_size, args.batch_window)
+    server = await service.start(socket_path)
+    try:
+        async with server:
+            grid_id = (await service.load_grid(args.size, args.open_pct, args.seed))['grid']
+            # Every worker rebuilds the grid on its first batch, warm them up outside of the measurement
+            await asyncio.gather(*[run_client(socket_path, grid_id, cells, 2, args.algorithms, -client)
+                                   for client in range(service.workers * 2)])
+            time_start = time.perf_counter()
+            latencies = await asyncio.gather(*[run_client(socket_path, grid_id, cells, args.queries,
+                                                          args.algorithms, client) for client in range(args.clients)])
+            elapsed = time.perf_counter() - time_start
+            metrics = service.metrics()
+    finally:
+        await service.close()
+
+    latencies = [latency for client in latencies for latency in client]
+    cut_points = quantiles(latencies, n=100, method='inclusive')
+    print(f"{batch_size:>10} {len(latencies) / elapsed:>10.1f} "
+          + ' '.join(f"{cut_points[percentile - 1]:>9.2f}" for percentile in LATENCY_PERCENTILES)
+          + f" {metrics['mean_batch_size']:>10.2f} {metrics['max_queue_depth']:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=161, help='Maze size.')
+    parser.add_argument('--open-pct', type=int, default=5, help='Open cell percentage of the maze.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the maze and the queries.')
+    parser.add_argument('--algorithms', nargs='+', default=['A*'], choices=list(ALGORITHMS),
+                        help='Algorithms the queries pick from.')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent client connections.')
+    parser.add_argument('--queries', type=int, default=50, help='Queries per client.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes of the service.')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32], help='Batch sizes to compare.')
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW,
+                        help='Seconds a batch waits for more queries.')
+    args = parser.parse_args()
+
+    rows, maze, _, _ = generate_grid(args.size, args.open_pct, args.seed)
+    cells = [divmod(cell, rows) for cell, weight in enumerate(maze) if weight]
+    print(f"{args.clients} clients x {args.queries} queries of {', '.join(args.algorithms)} on a {rows}x{rows} maze, "
+          f"{args.workers} workers")
+    print(f"{'batch size':>10} {'queries/s':>10} " + ' '.join(f"{f'p{p} ms':>9}" for p in LATENCY_PERCENTILES)
+          + f" {'mean batch':>10} {'max queue':>9}")
+    for batch_size in args.batch_sizes:
+        asyncio.run(run_load(args, batch_size, cells))
+
+
+if __name__ == "__main__":
+    main()
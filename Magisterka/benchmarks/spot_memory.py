@@ -0,0 +1,74 @@
+"""
+Measure the memory footprint of the Spot grid representation for every benchmark size config.
+
+Run from the Magisterka directory:
+    python -m benchmarks.spot_memory
+"""
+import gc
+import tracemalloc
+from typing import Callable, List
+from enums.colors import Colors as colors
+from enums.spot_state import SpotState as spot_state
+from enums.weight import Weight as spot_weight
+from main import WIDTH, MIN_SIZE, MID_SIZE, MAX_SIZE
+from spot import Spot, GridGeometry
+
+
+class DictSpot:
+    """
+    Replica of the previous Spot layout (per-instance __dict__, copied grid constants, Colors member state).
+    """
+
+    def __init__(self, row: int, col: int, width: int, total_rows: int, color: colors,
+                 spot_value: int = spot_weight.DEFAULT.value):
+        self.row = row
+        self.col = col
+        self.x = row * width
+        self.y = col * width
+        self.color = color
+        self.neighbors = []
+        self.width = width
+        self.total_rows = total_rows
+        self.spot_value = spot_value
+
+
+def build_dict_grid(rows: int, gap: int) -> List[List[DictSpot]]:
+    return [[DictSpot(y, x, gap, rows, colors.BLACK) for x in range(rows)] for y in range(rows)]
+
+
+def build_slotted_grid(rows: int, gap: int) -> List[List[Spot]]:
+    geometry = GridGeometry(gap, rows)
+    return [[Spot(y, x, geometry, spot_state.BARRIER) for x in range(rows)] for y in range(rows)]
+
+
+def measure(builder: Callable[[int, int], list], rows: int, gap: int) -> int:
+    """
+    Measure the memory retained by a freshly built grid.
+
+    Args:
+        builder (Callable[[int, int], list]): Function building the grid for the given rows and gap.
+        rows (int): Number of rows in the grid.
+        gap (int): Gap between the spots.
+
+    Returns:
+        int: Retained memory in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    grid = builder(rows, gap)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del grid
+    return retained
+
+
+if __name__ == "__main__":
+    print(f"{'rows':>6} {'cells':>8} {'dict (MiB)':>11} {'slots (MiB)':>12} {'saved (MiB)':>12} {'saved %':>8}")
+    for size in [MIN_SIZE, MID_SIZE, MAX_SIZE]:
+        rows = size + 1 if not size % 2 else size
+        gap = WIDTH // rows
+        dict_bytes = measure(build_dict_grid, rows, gap)
+        slot_bytes = measure(build_slotted_grid, rows, gap)
+        saved = dict_bytes - slot_bytes
+        print(f"{rows:>6} {rows * rows:>8} {dict_bytes / 2 ** 20:>11.2f} {slot_bytes / 2 ** 20:>12.2f} "
+              f"{saved / 2 ** 20:>12.2f} {100 * saved / dict_bytes:>7.1f}%")
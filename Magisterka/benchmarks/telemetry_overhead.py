@@ -0,0 +1,84 @@
+"""
+Measure the cost of the telemetry calls per use, with DEBUG disabled unless stated, against the eager f-string
+debug logs and the per-instance logging.basicConfig call they replace, and the cost of a whole maze generation with
+the stage records off and on.
+
+Run from the Magisterka directory:
+    python -m benchmarks.telemetry_overhead [--calls 200000] [--rows 161]
+"""
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+import timeit
+from grid import Grid
+from logger import configure_logging
+from telemetry import Stage, close_sink, debug_event, open_sink
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=200000, help='Calls per measured statement.')
+    parser.add_argument('--rows', type=int, default=161, help='Number of rows of the generated mazes.')
+    parser.add_argument('--mazes', type=int, default=5, help='Mazes generated per measurement.')
+    args = parser.parse_args()
+
+    configure_logging()
+    logger = logging.getLogger('TelemetryOverhead')
+    logger.setLevel(logging.INFO)
+    metrics = (12.3456, 4321, 987.0)
+    sink_path = os.path.join(tempfile.mkdtemp(), 'metrics.jsonl')
+
+    def eager_debug() -> None:
+        logger.debug(f"\n\tExecution_time: {metrics[0]} ms,\n\tSearched cells : {metrics[1]}"
+                     f"\n\tTotal path cost: {metrics[2]}\n")
+
+    def event() -> None:
+        debug_event(logger, 'algorithm_run', exec_time=metrics[0], searched=metrics[1], path_cost=metrics[2])
+
+    def guarded_event() -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_event(logger, 'algorithm_run', exec_time=metrics[0], searched=metrics[1], path_cost=metrics[2])
+
+    def stage() -> None:
+        with Stage('stage', logger, rows=args.rows):
+            pass
+
+    def basic_config() -> None:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        logging.getLogger('matplotlib.font_manager').setLevel(logging.WARNING)
+        logging.getLogger('PIL').setLevel(logging.WARNING)
+
+    statements = [
+        ('f-string debug', eager_debug, False),
+        ('debug_event', event, False),
+        ('guarded debug_event', guarded_event, False),
+        ('Stage', stage, False),
+        ('Stage, sink open', stage, True),
+        ('basicConfig per instance', basic_config, False),
+        ('configure_logging', configure_logging, False),
+    ]
+    print(f"{'statement':>26} {'ns/call':>9}")
+    for label, statement, sink in statements:
+        if sink:
+            open_sink(sink_path)
+        seconds = min(timeit.repeat(statement, number=args.calls, repeat=3))
+        close_sink()
+        print(f"{label:>26} {seconds / args.calls * 1e9:>9.0f}")
+
+    print(f"\n{'maze generation':>26} {'ms/maze':>9}")
+    for label, sink in (('stages off', False), ('stages to the sink', True)):
+        if sink:
+            open_sink(sink_path)
+        random.seed(0)
+        time_start = time.perf_counter()
+        for _ in range(args.mazes):
+            Grid(args.rows, 1, 5)
+        print(f"{label:>26} {(time.perf_counter() - time_start) / args.mazes * 1e3:>9.1f}")
+        close_sink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare the expansions ("Searched Cells") of the A*-family engines under every tie-breaking policy.
+
+Run from the Magisterka directory:
+    python -m benchmarks.tie_breaking [--rows 161] [--mazes 20]
+"""
+import argparse
+import random
+from statistics import mean
+from algorithms import a_star, bidirectional_a_star, equalized_bidirectional_a_star
+from enums.tie_breaking import TieBreaking as tie_breaking
+from grid import Grid
+from main import WIDTH
+from utils import reset_grid
+
+ALGORITHMS = {
+    "A*": a_star,
+    "BA*": bidirectional_a_star,
+    "EBA*": equalized_bidirectional_a_star,
+}
+CELL_OPEN_PERCENTAGES = [25, 5, 0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=161, help='Number of rows in the grid.')
+    parser.add_argument('--mazes', type=int, default=20, help='Number of seeded mazes per open percentage.')
+    args = parser.parse_args()
+
+    policies = list(tie_breaking)
+    print(f"{'open %':>6} {'algorithm':>9} " + ' '.join(f"{policy.value:>10}" for policy in policies))
+    for cell_open_percentage in CELL_OPEN_PERCENTAGES:
+        searched = {(name, policy): [] for name in ALGORITHMS for policy in policies}
+        for seed in range(args.mazes):
+            random.seed(seed)
+            grid = Grid(args.rows, WIDTH // args.rows, cell_open_percentage)
+            for name, algorithm in ALGORITHMS.items():
+                for policy in policies:
+                    _, visited = algorithm(grid.grid_maze, grid.start_spot, grid.end_spot, window_mode=False,
+                                           tie_breaking=policy)
+                    searched[(name, policy)].append(len(visited))
+                    reset_grid(grid.grid_maze, window_mode=False)
+        for name in ALGORITHMS:
+            print(f"{cell_open_percentage:>6} {name:>9} "
+                  + ' '.join(f"{mean(searched[(name, policy)]):>10.1f}" for policy in policies))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measure the wall time of tiled maze generation for growing tile counts and chart the scaling, together with the
+single-process Grid generator as the baseline on sizes it can still handle.
+
+Run from the Magisterka directory:
+    python -m benchmarks.tiled_generation [--rows 5001] [--tiles-per-side 1 2 4 8] [--workers 4]
+"""
+import argparse
+import os
+import random
+import time
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+from grid import Grid
+from tiled_maze import TiledMazeGenerator
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5001, help='Number of rows of the maze.')
+    parser.add_argument('--open-pct', type=int, default=5, help='Percentage of removable walls to open.')
+    parser.add_argument('--tiles-per-side', type=int, nargs='+', default=[1, 2, 4, 8], help='Tile grids to compare.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of worker processes.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the mazes.')
+    parser.add_argument('--baseline', action='store_true', help='Also time the single-process Grid generator.')
+    parser.add_argument('--output', type=str, default='tiled_generation.png', help='Path of the chart.')
+    args = parser.parse_args()
+
+    baseline_time = None
+    if args.baseline:
+        random.seed(args.seed)
+        time_start = time.perf_counter()
+        Grid(args.rows, 1, args.open_pct)
+        baseline_time = time.perf_counter() - time_start
+
+    print(f"{args.rows}x{args.rows} maze, {args.workers} workers")
+    print(f"{'tiles':>6} {'wall s':>8} {'speedup':>8}")
+    tile_counts, wall_times = [], []
+    for tiles_per_side in args.tiles_per_side:
+        generator = TiledMazeGenerator(args.rows, tiles_per_side, args.open_pct, args.seed, args.workers)
+        time_start = time.perf_counter()
+        generator.generate()
+        tile_counts.append(tiles_per_side ** 2)
+        wall_times.append(time.perf_counter() - time_start)
+        print(f"{tile_counts[-1]:>6} {wall_times[-1]:>8.2f} {wall_times[0] / wall_times[-1]:>8.2f}")
+    if baseline_time is not None:
+        print(f"{'Grid':>6} {baseline_time:>8.2f} {wall_times[0] / baseline_time:>8.2f}")
+
+    plt.figure(figsize=(10, 6))
+    plt.plot(tile_counts, wall_times, marker='o', label=f'Tiled ({args.workers} workers)')
+    if baseline_time is not None:
+        plt.axhline(baseline_time, color='gray', linestyle='--', label='Grid (single process)')
+    plt.xscale('log', base=2)
+    plt.xlabel('Tiles')
+    plt.ylabel('Wall Time (s)')
+    plt.title(f'Tiled Generation of a {args.rows}x{args.rows} Maze')
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(args.output)
+    plt.close()
+    print(f"Chart saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+CHECKPOINT_FILENAME = "checkpoint.jsonl"
+
+# Metadata fields that have to match for completed work units to be reused
+RESUME_KEYS = ['rows', 'cell_open_percentage', 'base_seed', 'tie_breaking', 'warmup_runs', 'repetitions', 'disable_gc',
+               'output_format', 'measure_memory', 'count_operations']
+# Values of resume keys added later, assumed for checkpoints written before them
+RESUME_DEFAULTS = {'measure_memory': False, 'count_operations': False}
+
+
+class SweepCheckpoint:
+    def __init__(self, directory: str):
+        """
+        Initialize the SweepCheckpoint, the record of completed (iteration, algorithm) work units of a config.
+
+        The checkpoint is a JSON-lines file, the first line holds the run metadata and every following line one
+        completed iteration with the algorithms that finished on it.
+
+        Args:
+            directory (str): Directory of the config.
+        """
+        self.path = os.path.join(directory, CHECKPOINT_FILENAME)
+        self.metadata: Dict[str, Any] = {}
+        self.completed: Set[Tuple[int, str]] = set()
+
+    def exists(self) -> bool:
+        """
+        Check if the checkpoint file exists.
+
+        Returns:
+            bool: True if a previous run left a checkpoint, False otherwise.
+        """
+        return os.path.exists(self.path)
+
+    def start(self, metadata: Dict[str, Any]) -> None:
+        """
+        Start a new checkpoint, dropping all recorded work units.
+
+        Args:
+            metadata (Dict[str, Any]): Seed and config of the run.
+        """
+        self.metadata = metadata
+        self.completed = set()
+        with open(self.path, mode='w') as file:
+            file.write(json.dumps({'metadata': metadata}, default=str) + '\n')
+
+    def resume(self, metadata: Dict[str, Any]) -> None:
+        """
+        Load the completed work units of a previous run, or start a new checkpoint if there is none.
+
+        Args:
+            metadata (Dict[str, Any]): Seed and config of the run.
+
+        Raises:
+            ValueError: If the previous run used a different seed or config.
+        """
+        if not self.exists():
+            self.start(metadata)
+            return
+        lines = []
+        with open(self.path) as file:
+            for line in file:
+                try:
+                    lines.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # The previous run was interrupted while writing its last record
+        self.metadata = lines[0]['metadata'] if lines else {}
+        mismatched = [key for key in RESUME_KEYS
+                      if self.metadata.get(key, RESUME_DEFAULTS.get(key)) != metadata.get(key)]
+        if mismatched:
+            raise ValueError(f"Cannot resume {self.path}, the previous run used different {', '.join(mismatched)}. "
+                             f"Start the config over instead.")
+        self.completed = {(line['iteration'], name) for line in lines[1:] for name in line['algorithms']}
+
+    def record(self, units: Iterable[Tuple[int, Iterable[str]]]) -> None:
+        """
+        Record finished work units, their results must already be written.
+
+        Args:
+            units (Iterable[Tuple[int, Iterable[str]]]): Iteration numbers with the names of the algorithms that
+                                                         finished on them.
+        """
+        lines = []
+        for iteration, algorithm_names in units:
+            algorithm_names = list(algorithm_names)
+            self.completed.update((iteration, name) for name in algorithm_names)
+            lines.append(json.dumps({'iteration': iteration, 'algorithms': algorithm_names}) + '\n')
+        with open(self.path, mode='a') as file:
+            file.writelines(lines)
+
+    def pending(self, iterations: int, algorithm_names: Iterable[str]) -> Dict[int, List[str]]:
+        """
+        Get the work units that still have to run.
+
+        Args:
+            iterations (int): Number of iterations of the config, may be larger than in the previous run.
+            algorithm_names (Iterable[str]): Names of the algorithms of the config.
+
+        Returns:
+            Dict[int, List[str]]: Algorithm names still to run, keyed by iteration.
+        """
+        algorithm_names = list(algorithm_names)
+        pending = {}
+        for iteration in range(iterations):
+            names = [name for name in algorithm_names if (iteration, name) not in self.completed]
+            if names:
+                pending[iteration] = names
+        return pending
@@ -0,0 +1,168 @@
+import argparse
+import glob
+import os
+import sys
+import pandas as pd
+from typing import Dict, List
+from logger import ProjectLogger
+from result_statistics import mann_whitney_u
+from results_store import load_results, EXTENSIONS
+
+# Compared metrics, lower is better for all of them
+COMPARED_METRICS = {
+    'exec_time': 'Execution Time (ms)',
+    'searched_cells': 'Searched Cells',
+    'path_cost': 'Total Path Cost',
+}
+SIGNIFICANCE = 0.05
+REGRESSION_THRESHOLD = 0.05
+
+
+def find_results(root: str) -> Dict[str, str]:
+    """
+    Find the results file of every config directory below the root.
+
+    Args:
+        root (str): Directory holding the size*_open_cells_pct* config directories.
+
+    Returns:
+        Dict[str, str]: Results file path, keyed by the config directory name.
+    """
+    results = {}
+    for directory in sorted(glob.glob(os.path.join(root, 'size*_open_cells_pct*'))):
+        for extension in EXTENSIONS.values():
+            files = glob.glob(os.path.join(directory, f"algorithms_results_*{extension}"))
+            if files:
+                results[os.path.basename(directory)] = files[0]
+                break
+    return results
+
+
+class ResultsComparator(ProjectLogger):
+    def __init__(self, baseline: str, candidate: str, significance: float = SIGNIFICANCE,
+                 threshold: float = REGRESSION_THRESHOLD):
+        """
+        Initialize the ResultsComparator.
+
+        Args:
+            baseline (str): Directory of the baseline results.
+            candidate (str): Directory of the candidate results.
+            significance (float): p-value below which a difference is significant.
+            threshold (float): Relative change of the median above which a significant regression fails the
+                               comparison, 0.05 is 5%.
+        """
+        super().__init__()
+        self.baseline = baseline
+        self.candidate = candidate
+        self.significance = significance
+        self.threshold = threshold
+
+    def compare(self) -> pd.DataFrame:
+        """
+        Test every (config, algorithm, metric) present in both results sets.
+
+        Returns:
+            pd.DataFrame: Side-by-side report with the medians, relative change, p-value and verdict.
+        """
+        baseline_results = find_results(self.baseline)
+        candidate_results = find_results(self.candidate)
+        for config in sorted(set(baseline_results) ^ set(candidate_results)):
+            self.logger.warning(f"{config} is only in one of the results sets, skipping it")
+
+        rows = []
+        for config in sorted(set(baseline_results) & set(candidate_results)):
+            baseline_df = load_results(baseline_results[config])
+            candidate_df = load_results(candidate_results[config])
+            for algorithm_name in sorted(set(baseline_df['Algorithm_name']) & set(candidate_df['Algorithm_name'])):
+                baseline_runs = baseline_df[baseline_df['Algorithm_name'] == algorithm_name]
+                candidate_runs = candidate_df[candidate_df['Algorithm_name'] == algorithm_name]
+                for metric, column in COMPARED_METRICS.items():
+                    rows.append(self.compare_metric(config, algorithm_name, metric, baseline_runs[column],
+                                                    candidate_runs[column]))
+        return pd.DataFrame(rows)
+
+    def compare_metric(self, config: str, algorithm_name: str, metric: str, baseline: pd.Series,
+                       candidate: pd.Series) -> Dict[str, object]:
+        """
+        Test a single metric of an algorithm and classify the change.
+
+        Args:
+            config (str): Name of the config directory.
+            algorithm_name (str): Name of the algorithm.
+            metric (str): Name of the metric.
+            baseline (pd.Series): Baseline runs.
+            candidate (pd.Series): Candidate runs.
+
+        Returns:
+            Dict[str, object]: A row of the report.
+        """
+        baseline_median, candidate_median = baseline.median(), candidate.median()
+        change = (candidate_median - baseline_median) / baseline_median if baseline_median else 0.0
+        _, p_value = mann_whitney_u(baseline, candidate)
+        verdict = 'unchanged'
+        if p_value < self.significance and candidate_median != baseline_median:
+            verdict = 'regression' if candidate_median > baseline_median else 'improvement'
+        return {
+            'config': config,
+            'Algorithm_name': algorithm_name,
+            'metric': metric,
+            'baseline_runs': len(baseline),
+            'candidate_runs': len(candidate),
+            'baseline_median': baseline_median,
+            'candidate_median': candidate_median,
+            'relative_change_pct': round(change * 100, 2),
+            'p_value': p_value,
+            'verdict': verdict,
+            'fails': verdict == 'regression' and change > self.threshold,
+        }
+
+    def failed(self, report: pd.DataFrame) -> List[str]:
+        """
+        List the significant regressions above the threshold.
+
+        Args:
+            report (pd.DataFrame): The report from compare.
+
+        Returns:
+            List[str]: One description per failing (config, algorithm, metric).
+        """
+        if report.empty:
+            return []
+        return [f"{row['config']} {row['Algorithm_name']} {row['metric']}: +{row['relative_change_pct']}% "
+                f"(p={row['p_value']:.3g})" for _, row in report[report['fails']].iterrows()]
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the compared results sets and the test options from the command line.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Compare a candidate results set against a baseline and exit "
+                                                 "with status 1 on significant regressions above the threshold.")
+    parser.add_argument('baseline', help='Directory with the baseline size*_open_cells_pct* results.')
+    parser.add_argument('candidate', help='Directory with the candidate size*_open_cells_pct* results.')
+    parser.add_argument('--significance', type=float, default=SIGNIFICANCE,
+                        help='p-value below which a difference is significant.')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Relative median change above which a significant regression fails, 0.05 is 5%%.')
+    parser.add_argument('--report', default='comparison_report.csv', help='Path of the side-by-side CSV report.')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    comparator = ResultsComparator(args.baseline, args.candidate, args.significance, args.threshold)
+    comparison = comparator.compare()
+    if comparison.empty:
+        comparator.logger.error('No config and algorithm is present in both results sets.')
+        sys.exit(2)
+    comparison.to_csv(args.report, index=False)
+    comparator.logger.info(f"Baseline {args.baseline} vs candidate {args.candidate}:\n"
+                           f"{comparison.drop(columns=['fails']).to_string(index=False)}\n")
+    regressions = comparator.failed(comparison)
+    if regressions:
+        comparator.logger.error("Regressions above the threshold:\n\t" + '\n\t'.join(regressions))
+        sys.exit(1)
+    comparator.logger.info('No regressions above the threshold.')
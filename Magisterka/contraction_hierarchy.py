@@ -0,0 +1,302 @@
+import heapq
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+from logger import ProjectLogger
+
+if TYPE_CHECKING:
+    from spot import Spot
+
+CH_EXTENSION = ".ch"
+MAGIC = b'MTCH'
+VERSION = 1
+# Magic, version, rows, node count and upward edge count
+HEADER = struct.Struct('<4sHHII')
+# Nodes settled by a witness search before it gives up and the shortcut is added anyway
+WITNESS_SETTLE_LIMIT = 64
+NO_MIDDLE = 0xFFFFFFFF
+
+
+class ContractionHierarchy(ProjectLogger):
+    def __init__(self, rows: int, cells: List[int], weights: List[int], upward: List[List[Tuple[int, int]]],
+                 middles: Dict[Tuple[int, int], int]):
+        """
+        Initialize the ContractionHierarchy of a static maze, see build.
+
+        The open cells are the nodes. Moving into a cell costs its weight, so the cell graph is directed. The
+        hierarchy uses the symmetric cost w(u) + w(v) of every edge instead, the cost of a path from s to t is then
+        twice its directed cost plus w(s) - w(t), a constant of the query, so both have the same shortest paths.
+
+        Args:
+            rows (int): Number of rows (and columns) of the maze.
+            cells (List[int]): Cell index of every node.
+            weights (List[int]): Weight of every node.
+            upward (List[List[Tuple[int, int]]]): Edges of every node to higher-ranked nodes with their symmetric
+                                                  costs, original edges and shortcuts.
+            middles (Dict[Tuple[int, int], int]): Contracted node of every shortcut, keyed by its (lower, higher)
+                                                  node pair.
+        """
+        super().__init__()
+        self.rows = rows
+        self.cells = cells
+        self.weights = weights
+        self.upward = upward
+        self.middles = middles
+        self.nodes = {cell: node for node, cell in enumerate(cells)}
+
+    @classmethod
+    def build(cls, grid_maze: List[List['Spot']]) -> 'ContractionHierarchy':
+        """
+        Contract the nodes of a maze one by one, cheapest first, adding a shortcut between two neighbours of the
+        contracted node whenever no witness path avoiding it is as cheap.
+
+        The priority of a node is its edge difference (shortcuts added minus edges removed) plus the number of its
+        already contracted neighbours, updated lazily when the node reaches the top of the queue.
+
+        Args:
+            grid_maze (List[List[Spot]]): The grid of spots.
+
+        Returns:
+            ContractionHierarchy: The hierarchy.
+        """
+        rows = len(grid_maze)
+        spots = [spot for row in grid_maze for spot in row if not spot.is_barrier()]
+        cells = [spot.row * rows + spot.col for spot in spots]
+        nodes = {cell: node for node, cell in enumerate(cells)}
+        weights = [spot.spot_value for spot in spots]
+        adjacency: List[Optional[Dict[int, int]]] = [
+            {nodes[neighbor.row * rows + neighbor.col]: weights[node] + neighbor.spot_value
+             for neighbor in spot.neighbors} for node, spot in enumerate(spots)]
+
+        def witness_distances(source: int, excluded: int, targets: Dict[int, int], limit: int) -> Dict[int, int]:
+            distances = {source: 0}
+            heap = [(0, source)]
+            settled = 0
+            remaining = len(targets)
+            while heap and settled < WITNESS_SETTLE_LIMIT:
+                distance, node = heapq.heappop(heap)
+                if distance > distances[node]:
+                    continue
+                if distance > limit:
+                    break
+                settled += 1
+                if node in targets:
+                    remaining -= 1
+                    if not remaining:
+                        break
+                for neighbor, cost in adjacency[node].items():
+                    if neighbor != excluded and distance + cost < distances.get(neighbor, float('inf')):
+                        distances[neighbor] = distance + cost
+                        heapq.heappush(heap, (distance + cost, neighbor))
+            return distances
+
+        def shortcuts_of(node: int) -> List[Tuple[int, int, int]]:
+            neighbors = list(adjacency[node].items())
+            shortcuts = []
+            for i, (u, cost_u) in enumerate(neighbors[:-1]):
+                targets = {w: cost_u + cost_w for w, cost_w in neighbors[i + 1:]}
+                # Tentative distances are costs of real paths, so they are valid witnesses as well
+                distances = witness_distances(u, node, targets, max(targets.values()))
+                shortcuts.extend((u, w, cost) for w, cost in targets.items()
+                                 if distances.get(w, float('inf')) > cost)
+            return shortcuts
+
+        deleted_neighbors = [0] * len(cells)
+        heap = [(len(shortcuts_of(node)) - len(adjacency[node]), node) for node in range(len(cells))]
+        heapq.heapify(heap)
+        upward: List[List[Tuple[int, int]]] = [[] for _ in cells]
+        middles: Dict[Tuple[int, int], int] = {}
+        while heap:
+            _, node = heapq.heappop(heap)
+            shortcuts = shortcuts_of(node)
+            priority = len(shortcuts) - len(adjacency[node]) + deleted_neighbors[node]
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, node))
+                continue
+            # The remaining neighbours are contracted later, so every edge left is an upward edge
+            upward[node] = list(adjacency[node].items())
+            for neighbor in adjacency[node]:
+                del adjacency[neighbor][node]
+                deleted_neighbors[neighbor] += 1
+            for u, w, cost in shortcuts:
+                if cost < adjacency[u].get(w, float('inf')):
+                    adjacency[u][w] = adjacency[w][u] = cost
+                    middles[(u, w) if u < w else (w, u)] = node
+            adjacency[node] = None
+        hierarchy = cls(rows, cells, weights, upward, middles)
+        hierarchy.logger.info(f"Contracted {len(cells)} nodes: {hierarchy.edge_count} upward edges, "
+                              f"{len(middles)} shortcuts")
+        return hierarchy
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Get the number of upward edges.
+
+        Returns:
+            int: Original edges and shortcuts, each counted once.
+        """
+        return sum(len(edges) for edges in self.upward)
+
+    def query(self, source: int, target: int) -> Tuple[float, List[int], Set[int]]:
+        """
+        Find the cheapest path between two nodes with a bidirectional search on the upward edges.
+
+        Args:
+            source (int): Start node.
+            target (int): End node.
+
+        Returns:
+            Tuple[float, List[int], Set[int]]: Symmetric cost and nodes of the path with the shortcuts unpacked,
+            empty if there is none, and the nodes settled by both searches.
+        """
+        distances = ({source: 0}, {target: 0})
+        parents: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+        heaps = ([(0, source)], [(0, target)])
+        settled: Set[int] = set()
+        best, meeting = (0, source) if source == target else (float('inf'), None)
+        while True:
+            # Expand the direction with the smaller key, a direction is done once its key reaches the best cost
+            open_directions = [d for d in (0, 1) if heaps[d] and heaps[d][0][0] < best]
+            if not open_directions:
+                break
+            direction = min(open_directions, key=lambda d: heaps[d][0][0])
+            distance, node = heapq.heappop(heaps[direction])
+            if distance > distances[direction][node]:
+                continue
+            settled.add(node)
+            other = distances[1 - direction]
+            for neighbor, cost in self.upward[node]:
+                candidate = distance + cost
+                if candidate < distances[direction].get(neighbor, float('inf')):
+                    distances[direction][neighbor] = candidate
+                    parents[direction][neighbor] = node
+                    heapq.heappush(heaps[direction], (candidate, neighbor))
+                    if neighbor in other and candidate + other[neighbor] < best:
+                        best, meeting = candidate + other[neighbor], neighbor
+        if meeting is None:
+            return float('inf'), [], settled
+
+        forward = [meeting]
+        while forward[-1] in parents[0]:
+            forward.append(parents[0][forward[-1]])
+        backward = [meeting]
+        while backward[-1] in parents[1]:
+            backward.append(parents[1][backward[-1]])
+        return best, self.unpack(forward[::-1] + backward[1:]), settled
+
+    def unpack(self, nodes: List[int]) -> List[int]:
+        """
+        Replace every shortcut of a path by the nodes it was contracted from.
+
+        Args:
+            nodes (List[int]): Path through the hierarchy.
+
+        Returns:
+            List[int]: The path through original edges only.
+        """
+        path = [nodes[0]]
+        for node in nodes[1:]:
+            stack = [node]
+            while stack:
+                current, following = path[-1], stack[-1]
+                middle = self.middles.get((current, following) if current < following else (following, current))
+                if middle is None:
+                    path.append(stack.pop())
+                else:
+                    stack.append(middle)
+        return path
+
+    def search(self, grid_maze: List[List['Spot']], start_spot: 'Spot',
+               end_spot: 'Spot') -> Tuple[List['Spot'], Set['Spot']]:
+        """
+        Answer a path query on the maze the hierarchy was built on, returned like the search engines do.
+
+        Args:
+            grid_maze (List[List[Spot]]): The grid of spots.
+            start_spot (Spot): The starting spot.
+            end_spot (Spot): The target spot.
+
+        Returns:
+            Tuple[List[Spot], Set[Spot]]: The path from start to end, empty if there is none, and the settled spots.
+        """
+        _, nodes, settled = self.query(self.nodes[start_spot.row * self.rows + start_spot.col],
+                                       self.nodes[end_spot.row * self.rows + end_spot.col])
+        spot_of = lambda node: grid_maze[self.cells[node] // self.rows][self.cells[node] % self.rows]  # noqa: E731
+        return [spot_of(node) for node in nodes], {spot_of(node) for node in settled}
+
+    def path_cost(self, start_spot: 'Spot', end_spot: 'Spot') -> float:
+        """
+        Get the cost of the cheapest path, the sum of the weights of the entered cells like the g-score of the engines.
+
+        Args:
+            start_spot (Spot): The starting spot.
+            end_spot (Spot): The target spot.
+
+        Returns:
+            float: The cost, inf if there is no path.
+        """
+        source = self.nodes[start_spot.row * self.rows + start_spot.col]
+        target = self.nodes[end_spot.row * self.rows + end_spot.col]
+        cost, _, _ = self.query(source, target)
+        return (cost - self.weights[source] + self.weights[target]) / 2
+
+    def save(self, path: str) -> None:
+        """
+        Write the hierarchy to a binary file, the upward edges in compressed sparse row form.
+
+        Args:
+            path (str): Path of the hierarchy file.
+        """
+        offsets, targets, costs, middles = array('I', [0]), array('I'), array('I'), array('I')
+        for node, edges in enumerate(self.upward):
+            for neighbor, cost in edges:
+                targets.append(neighbor)
+                costs.append(cost)
+                middles.append(self.middles.get((node, neighbor) if node < neighbor else (neighbor, node), NO_MIDDLE))
+            offsets.append(len(targets))
+        arrays = [array('I', self.cells), array('I', self.weights), offsets, targets, costs, middles]
+        if sys.byteorder == 'big':
+            for values in arrays:
+                values.byteswap()
+        with open(path, mode='wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.rows, len(self.cells), len(targets)))
+            for values in arrays:
+                file.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'ContractionHierarchy':
+        """
+        Read a hierarchy from a binary file.
+
+        Args:
+            path (str): Path of the hierarchy file.
+
+        Returns:
+            ContractionHierarchy: The hierarchy.
+
+        Raises:
+            ValueError: If the file is not a hierarchy of a supported version.
+        """
+        with open(path, mode='rb') as file:
+            magic, version, rows, node_count, edge_count = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} contraction hierarchy.")
+            arrays = []
+            for count in (node_count, node_count, node_count + 1, edge_count, edge_count, edge_count):
+                values = array('I')
+                values.frombytes(file.read(count * values.itemsize))
+                if sys.byteorder == 'big':
+                    values.byteswap()
+                arrays.append(values)
+        cells, weights, offsets, targets, costs, middle_nodes = arrays
+        upward = [list(zip(targets[offsets[node]:offsets[node + 1]], costs[offsets[node]:offsets[node + 1]]))
+                  for node in range(node_count)]
+        middles = {}
+        for node in range(node_count):
+            for edge in range(offsets[node], offsets[node + 1]):
+                if middle_nodes[edge] != NO_MIDDLE:
+                    neighbor = targets[edge]
+                    middles[(node, neighbor) if node < neighbor else (neighbor, node)] = middle_nodes[edge]
+        return cls(rows, list(cells), list(weights), upward, middles)
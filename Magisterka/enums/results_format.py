@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ResultsFormat(Enum):
+    CSV = 'csv'
+    PARQUET = 'parquet'
+    NPZ = 'npz'
+    COLUMNAR = 'columnar'
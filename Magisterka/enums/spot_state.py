@@ -0,0 +1,12 @@
+from enum import IntFlag
+
+
+class SpotState(IntFlag):
+    OPEN = 0
+    BARRIER = 1
+    START = 2
+    END = 4
+    CLOSED = 8
+    NEXT = 16
+    PATH = 32
+    PATH_ALT = 64
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class TieBreaking(Enum):
+    FIFO = 'fifo'
+    LIFO = 'lifo'
+    HIGH_G = 'high_g'
+    LOW_H = 'low_h'
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class TraceEvent(Enum):
+    OPEN = 0
+    CLOSE = 1
+    PATH = 2
+    PATH_ALT = 3
@@ -0,0 +1,168 @@
+import heapq
+from array import array
+from collections import OrderedDict
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from grid import Grid
+    from spot import Spot
+
+# Moves of the direction array, the position of a move is its direction code
+DIRECTIONS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+DIRECTION_CODES = {move: code for code, move in enumerate(DIRECTIONS)}
+NO_DIRECTION = -1
+FLOW_FIELD_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class FlowField:
+    __slots__ = ('rows', 'goal', 'version', 'cost', 'direction')
+
+    def __init__(self, grid: 'Grid', goal: 'Spot'):
+        """
+        Initialize the FlowField of a goal, one reverse Dijkstra from the goal over the weights of the grid.
+
+        Every cell stores its cost to the goal, the sum of the weights of the cells entered on the way like the g-score
+        of the engines, and the direction of its next step. A path from any cell is then read in O(path length).
+
+        Args:
+            grid (Grid): The grid, its version is recorded to detect later cell changes.
+            goal (Spot): The common destination.
+        """
+        grid_maze = grid.grid_maze
+        rows = len(grid_maze)
+        self.rows = rows
+        self.goal = goal.row * rows + goal.col
+        self.version = grid.version
+        self.cost = array('d', [float('inf')]) * (rows * rows)
+        self.direction = array('b', [NO_DIRECTION]) * (rows * rows)
+
+        cost, direction = self.cost, self.direction
+        cost[self.goal] = 0
+        heap = [(0, self.goal)]
+        while heap:
+            current_cost, index = heapq.heappop(heap)
+            if current_cost > cost[index]:
+                continue
+            spot = grid_maze[index // rows][index % rows]
+            # A neighbour steps into the current spot, which costs the current spot's weight
+            step_cost = current_cost + spot.spot_value
+            for neighbor in spot.neighbors:
+                neighbor_index = neighbor.row * rows + neighbor.col
+                if step_cost < cost[neighbor_index]:
+                    cost[neighbor_index] = step_cost
+                    direction[neighbor_index] = DIRECTION_CODES[(spot.row - neighbor.row, spot.col - neighbor.col)]
+                    heapq.heappush(heap, (step_cost, neighbor_index))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Get the memory held by the cost and direction arrays.
+
+        Returns:
+            int: Size of the arrays in bytes.
+        """
+        return len(self.cost) * self.cost.itemsize + len(self.direction) * self.direction.itemsize
+
+    def cost_from(self, spot: 'Spot') -> float:
+        """
+        Get the cost of the cheapest path from a spot to the goal.
+
+        Args:
+            spot (Spot): The agent's spot.
+
+        Returns:
+            float: The cost, without the weight of the agent's own spot, inf if the goal cannot be reached.
+        """
+        return self.cost[spot.row * self.rows + spot.col]
+
+    def path(self, grid_maze: List[List['Spot']], start_spot: 'Spot') -> List['Spot']:
+        """
+        Follow the directions from a spot to the goal.
+
+        Args:
+            grid_maze (List[List[Spot]]): The grid of spots the field was built on.
+            start_spot (Spot): The agent's spot.
+
+        Returns:
+            List[Spot]: The path from the start spot to the goal, both included, empty if the goal cannot be reached.
+        """
+        if self.cost_from(start_spot) == float('inf'):
+            return []
+        row, col = start_spot.row, start_spot.col
+        path = [start_spot]
+        direction = self.direction[row * self.rows + col]
+        while direction != NO_DIRECTION:
+            d_row, d_col = DIRECTIONS[direction]
+            row, col = row + d_row, col + d_col
+            path.append(grid_maze[row][col])
+            direction = self.direction[row * self.rows + col]
+        return path
+
+
+class FlowFieldCache:
+    def __init__(self, grid: 'Grid', max_bytes: int = FLOW_FIELD_CACHE_BYTES):
+        """
+        Initialize the FlowFieldCache, the flow fields of a grid's goals with least-recently-used eviction.
+
+        All fields are dropped once the grid version changes, any cell change can reroute any field.
+
+        Args:
+            grid (Grid): The grid the fields are built on.
+            max_bytes (int): Memory bound of the cached fields, the most recent field is always kept.
+        """
+        self.grid = grid
+        self.max_bytes = max_bytes
+        self.version = grid.version
+        self.fields: 'OrderedDict[int, FlowField]' = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, goal: 'Spot') -> FlowField:
+        """
+        Get the flow field of a goal, building it on a miss.
+
+        Args:
+            goal (Spot): The destination.
+
+        Returns:
+            FlowField: The up-to-date field.
+        """
+        if self.version != self.grid.version:
+            self.invalidate()
+        key = goal.row * len(self.grid.grid_maze) + goal.col
+        field = self.fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(key)
+            return field
+        self.misses += 1
+        field = self.fields[key] = FlowField(self.grid, goal)
+        self.nbytes += field.nbytes
+        while self.nbytes > self.max_bytes and len(self.fields) > 1:
+            _, evicted = self.fields.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+        return field
+
+    def path(self, start_spot: 'Spot', goal: 'Spot') -> List['Spot']:
+        """
+        Get the cheapest path from a spot to a goal through the goal's cached flow field.
+
+        Args:
+            start_spot (Spot): The agent's spot.
+            goal (Spot): The destination.
+
+        Returns:
+            List[Spot]: The path, both ends included, empty if the goal cannot be reached.
+        """
+        return self.get(goal).path(self.grid.grid_maze, start_spot)
+
+    def invalidate(self) -> None:
+        """
+        Drop all cached fields.
+        """
+        self.fields.clear()
+        self.nbytes = 0
+        self.version = self.grid.version
@@ -1,17 +1,18 @@
 import random
-import time
-from typing import Tuple
+from typing import Optional, Tuple
 from logger import ProjectLogger
+from telemetry import Stage, debug_event
 from algorithms import a_star
-from colorama import Fore, init
 from enums.colors import Colors as colors
+from enums.spot_state import SpotState as spot_state
 from enums.weight import Weight as spot_weight
-from spot import Spot
+from spot import Spot, GridGeometry
 from utils import is_within_bounds, reset_grid, manhattan_heuristic
 
 
 class Grid(ProjectLogger):
-    def __init__(self, rows: int, gap: int, cell_open_percentage: int = 0, print_maze: bool = False):
+    def __init__(self, rows: int, gap: int, cell_open_percentage: int = 0, print_maze: bool = False,
+                 arrays: Optional[Tuple[bytes, int, int]] = None):
         """
         Initialize the Grid.
 
@@ -19,9 +20,9 @@ class Grid(ProjectLogger):
             rows (int): Number of rows in the grid.
             gap (int): Gap between the spots.
             print_maze (bool): Flag to print the maze to the console.
+            arrays (Optional[Tuple[bytes, int, int]]): Maze from to_arrays, rebuilt instead of generating a new one.
         """
         super().__init__()
-        init()
         self.cell_open_percentage = cell_open_percentage
         self.grid_maze = []
         self.end_spot = None
@@ -29,11 +30,14 @@ class Grid(ProjectLogger):
         self.gap = gap
         self.rows = rows
         self.print_flag = print_maze
+        # Bumped by every cell change, caches built on the grid compare it to detect stale entries
+        self.version = 0
 
-        self.logger.debug(f"Generating {rows}x{rows} maze...")
-        time_start = time.time()
-        self.generate_grid_maze()
-        self.logger.debug(f"Maze generated in {round(time.time() - time_start, 4)}s\n")
+        if arrays is not None:
+            self.load_arrays(*arrays)
+        else:
+            with Stage('generate_grid_maze', self.logger, rows=rows):
+                self.generate_grid_maze()
         if self.print_flag:
             self.print_grid_maze_to_console()
 
@@ -50,29 +54,27 @@ class Grid(ProjectLogger):
         """
         Generate the grid maze with paths and special spots.
         """
-        self.logger.debug("Carving path...")
-        time_start = time.time()
-        self.carve_path()
-        self.logger.debug(f"Path carved in {round(time.time() - time_start, 4)}s\n")
-
-        self.logger.debug("Carving additional paths...")
-        time_start = time.time()
-        self.carve_additional_passages()
-        self.logger.debug(f"Additional paths carved in {round(time.time() - time_start, 4)}s\n")
-
-        self.select_start_end_spots()
-        self.logger.debug(f"Start spot: {self.start_spot}, End spot: {self.end_spot}\n")
-
-        if not self.ensure_path_to_end():
-            raise Exception("Maze generated incorrectly!")
-        self.add_special_spots()
+        with Stage('carve_path', self.logger, rows=self.rows):
+            self.carve_path()
+        with Stage('carve_additional_passages', self.logger, rows=self.rows):
+            self.carve_additional_passages()
+        with Stage('select_start_end_spots', self.logger, rows=self.rows):
+            self.select_start_end_spots()
+        debug_event(self.logger, 'start_end_spots', start=self.start_spot, end=self.end_spot)
+
+        with Stage('ensure_path_to_end', self.logger, rows=self.rows):
+            if not self.ensure_path_to_end():
+                raise Exception("Maze generated incorrectly!")
+        with Stage('add_special_spots', self.logger, rows=self.rows):
+            self.add_special_spots()
 
     def carve_path(self) -> None:
         """
         Carve the main path in the grid maze using a depth-first search approach.
         """
         dim = self.rows // 2
-        self.grid_maze = [[Spot(y, x, self.gap, 2 * dim + 1, colors.BLACK) for x in range(2 * dim + 1)]
+        geometry = GridGeometry(self.gap, 2 * dim + 1)
+        self.grid_maze = [[Spot(y, x, geometry, spot_state.BARRIER) for x in range(2 * dim + 1)]
                           for y in range(2 * dim + 1)]
         x, y = (0, 0)
         stack = [(x, y)]
@@ -235,7 +237,6 @@ class Grid(ProjectLogger):
         Returns:
             bool: True if a valid path exists, False otherwise.
         """
-        self.logger.debug("Verifying path...")
         path, _ = a_star(self.grid_maze, self.start_spot, self.end_spot, window_mode=False,
                          heuristic_method=manhattan_heuristic)
         if not len(path) > 0:
@@ -245,21 +246,81 @@ class Grid(ProjectLogger):
         reset_grid(self.grid_maze, window_mode=False)
         return True
 
+    def to_arrays(self) -> Tuple[bytes, int, int]:
+        """
+        Flatten the maze, to be rebuilt by another process.
+
+        Returns:
+            Tuple[bytes, int, int]: Weight of every spot in row-major order with 0 for barriers, and the cell indices
+            of the start and end spots.
+        """
+        rows = len(self.grid_maze)
+        maze = bytes(0 if spot.is_barrier() else spot.spot_value for row in self.grid_maze for spot in row)
+        return (maze, self.start_spot.row * rows + self.start_spot.col,
+                self.end_spot.row * rows + self.end_spot.col)
+
+    def load_arrays(self, maze: bytes, start: int, end: int) -> None:
+        """
+        Rebuild the grid maze from to_arrays instead of generating it.
+
+        Args:
+            maze (bytes): Weight of every spot in row-major order, 0 for barriers.
+            start (int): Cell index of the start spot.
+            end (int): Cell index of the end spot.
+        """
+        geometry = GridGeometry(self.gap, self.rows)
+        self.grid_maze = [[Spot(y, x, geometry, spot_state.BARRIER) if not maze[y * self.rows + x]
+                           else Spot(y, x, geometry, spot_value=maze[y * self.rows + x]) for x in range(self.rows)]
+                          for y in range(self.rows)]
+        self.start_spot = self.grid_maze[start // self.rows][start % self.rows]
+        self.end_spot = self.grid_maze[end // self.rows][end % self.rows]
+        self.start_spot.make_start()
+        self.end_spot.make_end()
+        self.update_all_neighbors()
+
+    def update_cell(self, row: int, col: int, weight: int) -> None:
+        """
+        Change the weight of a cell after the maze was generated, and bump the grid version.
+
+        Args:
+            row (int): Row of the cell.
+            col (int): Column of the cell.
+            weight (int): New weight of the cell, 0 turns it into a barrier.
+
+        Raises:
+            ValueError: If the cell is the start or end spot.
+        """
+        spot = self.grid_maze[row][col]
+        if spot == self.start_spot or spot == self.end_spot:
+            raise ValueError(f"The start and end spots cannot be changed, got {row}, {col}.")
+        if weight:
+            spot.make_open()
+            spot.spot_value = weight
+        else:
+            spot.make_barrier()
+        last = len(self.grid_maze) - 1
+        for r, c in [(row, col), (row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]:
+            if 0 <= r <= last and 0 <= c <= last:
+                self.grid_maze[r][c].update_open_neighbors(self.grid_maze)
+        self.version += 1
+
     def update_all_neighbors(self) -> None:
         """
         Update neighbors for all spots in the grid maze.
         """
-        self.logger.debug("Updating neighbors...")
-        time_start = time.time()
-        for row in self.grid_maze:
-            for spot in row:
-                spot.update_open_neighbors(self.grid_maze)
-        self.logger.debug(f"Neighbors updated in {round(time.time() - time_start, 4)}s\n")
+        with Stage('update_all_neighbors', self.logger, rows=self.rows):
+            for row in self.grid_maze:
+                for spot in row:
+                    spot.update_open_neighbors(self.grid_maze)
 
     def print_grid_maze_to_console(self) -> None:
         """
         Print the grid maze to the console.
         """
+        # colorama is only needed for the console output, generating mazes does not import it
+        from colorama import Fore, init
+
+        init()
         for row in self.grid_maze:
             for spot in row:
                 if spot.color == colors.BLACK:
@@ -1,5 +1,23 @@
 import logging
 
+# basicConfig only has to run once per process, not for every grid and analyzer
+_configured = False
+
+
+def configure_logging() -> None:
+    """
+    Set up the root handler and quiet the third-party loggers, once per process.
+    """
+    global _configured
+    if _configured:
+        return
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    # Suppress unnecessary logging from third-party libraries
+    logging.getLogger('matplotlib.font_manager').setLevel(logging.WARNING)
+    logging.getLogger('PIL').setLevel(logging.WARNING)
+    _configured = True
+
 
 class ProjectLogger:
     """
@@ -16,11 +34,7 @@ class ProjectLogger:
         This constructor sets up a logger for the class that derives from this base class.
         The logger's level is set to INFO by default, and the log format includes the timestamp,
         log level, and message. It also suppresses logging from 'matplotlib.font_manager' and 'PIL'
-        to avoid cluttering the log output with unnecessary warnings.
+        to avoid cluttering the log output with unnecessary warnings, see configure_logging.
         """
         self.logger = logging.getLogger(self.__class__.__name__)
-        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-        # Suppress unnecessary logging from third-party libraries
-        logging.getLogger('matplotlib.font_manager').setLevel(logging.WARNING)
-        logging.getLogger('PIL').setLevel(logging.WARNING)
+        configure_logging()
@@ -1,26 +1,81 @@
+import argparse
+import json
+import logging
 import os
+import random
 import shutil
-import csv
 import time
+from statistics import median
 from logger import ProjectLogger
-from utils import draw_grid, reset_grid
-import pygame
+from online_stats import OnlineAggregator
+from adaptive_sampling import (AdaptiveSampler, SAMPLING_FILENAME, MIN_ITERATIONS, CONVERGED,
+                               ITERATION_BUDGET)
+from memory_probe import measure_memory
+from profiling import AlgorithmProfiler, PROFILES_DIRECTORY
+from utils import draw_grid, flush_display, reset_grid
 from grid import Grid
+from checkpoint import SweepCheckpoint
 from algorithms import (a_star, dijkstra, bfs, dfs, limited_deep_dfs, bidirectional_a_star,
                         equalized_bidirectional_a_star)
-from typing import Tuple, Dict, Any, Optional
-from scoring_and_plot import analyze_results_and_generate_plot
+from enums.results_format import ResultsFormat as results_format
+from enums.tie_breaking import TieBreaking as tie_breaking
+from typing import Tuple, Dict, Any, Optional, List, Set
+from results_store import ResultsSink, EXTENSIONS, resolve_format, load_results
+from search_stats import SearchStats, STATS_HEADER
+from search_trace import SearchTrace, trace_path
+from telemetry import Stage, debug_event, open_sink, METRICS_FILENAME
+from timing import TimingHarness
 
 WIDTH = 1440
 EXECUTION_NUMBER = 500
+WARMUP_RUNS = 1
+SUMMARY_INTERVAL = 60
+TIMING_REPETITIONS = 3
 MIN_SIZE = 40
 MID_SIZE = 160
 MAX_SIZE = 640
 
+RESULTS_HEADER = ["Algorithm_name", "Execution Time (ms)", "Searched Cells", "Total Path Cost"]
+MEMORY_HEADER = ["Peak Memory (KiB)", "Allocated Blocks"]
+ALGORITHMS = {
+    "A*": a_star,
+    "DIJKSTRA": dijkstra,
+    "DFS": dfs,
+    "BFS": bfs,
+    "BA*": bidirectional_a_star,
+    "EBA*": equalized_bidirectional_a_star,
+    "DFS_LIM": limited_deep_dfs,
+}
+
+
+def maze_seed(rows: int, cell_open_percentage: int, iteration: int, base_seed: int = 0) -> str:
+    """
+    Build the random seed of a single maze, so every (config, iteration) work unit is reproducible on its own.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cell_open_percentage (int): The percentage of opened passages to complicate maze.
+        iteration (int): Iteration number within the config.
+        base_seed (int): Seed of the whole sweep.
+
+    Returns:
+        str: Seed accepted by random.seed.
+    """
+    return f"{base_seed}-{rows}-{cell_open_percentage}-{iteration}"
+
 
 class AlgorithmAnalyzer(ProjectLogger):
     def __init__(self, rows: int, draw_updates: bool, directory: str, window_mode: bool = True, show_plot: bool = False,
-                 cell_open_percentage: int = 0, display_time: int = 1):
+                 cell_open_percentage: int = 0, display_time: int = 1,
+                 tie_breaking_policy: tie_breaking = tie_breaking.FIFO, base_seed: int = 0, run: bool = True,
+                 warmup_runs: int = 0, repetitions: int = 1, disable_gc: bool = True,
+                 iterations: int = EXECUTION_NUMBER, output_format: results_format = results_format.CSV,
+                 algorithms: Optional[Dict[str, Any]] = None, resume: bool = False, checkpoint_interval: int = 10,
+                 measure_memory: bool = False, memory_weight: float = 0.0, count_operations: bool = False,
+                 profile: bool = False, target_ci_width: Optional[float] = None,
+                 min_iterations: int = MIN_ITERATIONS, time_budget: Optional[float] = None,
+                 adaptive_metrics: Optional[List[str]] = None, charts: bool = True, record_traces: bool = False,
+                 metrics_path: Optional[str] = None):
         """
         Initialize the AlgorithmAnalyzer.
 
@@ -31,6 +86,37 @@ class AlgorithmAnalyzer(ProjectLogger):
             window_mode (bool): Flag for window mode.
             show_plot (bool): Flag to show plot after analysis.
             display_time (int): Time to display the result.
+            tie_breaking_policy (tie_breaking): Tie-breaking policy for the A*-family frontiers.
+            base_seed (int): Seed of the sweep, each maze is seeded with maze_seed.
+            run (bool): Run the algorithms and the analysis right away. Disabled by the parallel sweep workers.
+            warmup_runs (int): Untimed runs of every algorithm before its measurement.
+            repetitions (int): Timed runs of every algorithm per maze, the median is recorded.
+            disable_gc (bool): Pause the garbage collector during the timed regions.
+            iterations (int): Number of mazes to run the algorithms on, the iteration budget in adaptive mode.
+            output_format (results_format): Format of the results file.
+            algorithms (Optional[Dict[str, Any]]): Algorithms to run, keyed by name. Defaults to ALGORITHMS.
+            resume (bool): Skip the work units recorded in the config's checkpoint and append to its results.
+            checkpoint_interval (int): Number of iterations between results flushes and checkpoint records.
+            measure_memory (bool): Run every algorithm once more under tracemalloc and record its peak memory and
+                                   allocated blocks.
+            memory_weight (float): Exponent of the peak memory in the overall score, 0 leaves it out of the ranking.
+            count_operations (bool): Run every algorithm once more with SearchStats and record its frontier operation
+                                     counts.
+            profile (bool): Profile the maze generation, an extra untimed run of every algorithm and the analysis,
+                            and write the profiles aggregated across iterations to the 'profiles' directory.
+            target_ci_width (Optional[float]): Enables adaptive sampling, iterations stop once the confidence
+                                               interval of every metric of every algorithm is narrower than this,
+                                               relative to its mean.
+            min_iterations (int): Iterations of every algorithm before convergence is checked in adaptive mode.
+            time_budget (Optional[float]): Seconds after which adaptive sampling stops. Defaults to no limit.
+            adaptive_metrics (Optional[List[str]]): Results columns that have to converge. Defaults to execution
+                                                    time, searched cells and path cost.
+            charts (bool): Draw the charts of the config right after its analysis. Disabled when the reporting stage
+                           draws all configs after the sweep.
+            record_traces (bool): Run every algorithm once more, untimed, and write the sequence of cells it opened,
+                                  closed and put on the path to the 'traces' directory, see replay_viewer.
+            metrics_path (Optional[str]): JSON lines file the maze generation and analysis stage timings are appended
+                                          to, see telemetry. Defaults to no stage records.
         """
         super().__init__()
         if not draw_updates and window_mode:
@@ -40,10 +126,37 @@ class AlgorithmAnalyzer(ProjectLogger):
         self.start_spot = None
         self.grid_object = None
         self.cell_open_percentage = cell_open_percentage
+        self.tie_breaking_policy = tie_breaking_policy
+        self.base_seed = base_seed
+        self.timing_harness = TimingHarness(warmup_runs, repetitions, disable_gc)
+        self.iterations = iterations
+        self.output_format = resolve_format(output_format)
+        self.results_sink = None
+        self.aggregator = None
+        self.summary_written = time.perf_counter()
+        self.algorithms = algorithms or ALGORITHMS
+        self.resume = resume
+        self.resumed = False
+        self.checkpoint_interval = checkpoint_interval
+        self.measure_memory = measure_memory
+        self.memory_weight = memory_weight
+        self.count_operations = count_operations
+        self.profiler = AlgorithmProfiler() if profile else None
+        self.target_ci_width = target_ci_width
+        self.min_iterations = min_iterations
+        self.time_budget = time_budget
+        self.adaptive_metrics = adaptive_metrics or RESULTS_HEADER[1:]
+        self.sampler = None
+        self.results_header = (RESULTS_HEADER + (MEMORY_HEADER if measure_memory else [])
+                               + (STATS_HEADER if count_operations else []))
         self.window_mode = window_mode
         self.display_time = display_time
         self.draw_updates = draw_updates
         self.show_plot = show_plot
+        self.charts = charts
+        self.record_traces = record_traces
+        if metrics_path is not None:
+            open_sink(metrics_path)
         self.rows = rows
         if not self.rows % 2:
             self.rows += 1
@@ -55,57 +168,139 @@ class AlgorithmAnalyzer(ProjectLogger):
         # Directory for storing CSV and PNG files
         self.directory = directory
 
-        # Create CSV file inside the directory
-        self.filename = os.path.join(self.directory, f"algorithms_results_{self.rows}_{cell_open_percentage}.csv")
-
-        # Create CSV file and write the header
-        with open(self.filename, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Algorithm_name", "Execution Time (ms)", "Searched Cells", "Total Path Cost"])
-
-        algorithms = {
-            "A*": a_star,
-            "DIJKSTRA": dijkstra,
-            "DFS": dfs,
-            "BFS": bfs,
-            "BA*": bidirectional_a_star,
-            "EBA*": equalized_bidirectional_a_star,
-            "DFS_LIM": limited_deep_dfs,
-        }
+        # Results file inside the directory
+        self.results_base = os.path.join(self.directory, f"algorithms_results_{self.rows}_{cell_open_percentage}")
+        self.filename = self.results_base + EXTENSIONS[self.output_format]
+        self.checkpoint = SweepCheckpoint(self.directory)
+
+        if run:
+            self.open_checkpoint()
+            self.create_results_sink(append=self.resumed)
+            self.window_handler(self.algorithms)
+            self.results_sink.close()
+            self.analyze_results(rows)
+            if self.profiler is not None:
+                self.profiler.dump(os.path.join(self.directory, PROFILES_DIRECTORY))
+
+    def open_checkpoint(self) -> None:
+        """
+        Resume the config's checkpoint when requested and present, otherwise start a new one.
+        """
+        self.resumed = self.resume and self.checkpoint.exists()
+        if self.resumed:
+            self.checkpoint.resume(self.run_metadata())
+            self.logger.info(f"Resuming {self.directory}: {len(self.checkpoint.completed)} work units already done")
+        else:
+            self.checkpoint.start(self.run_metadata())
 
-        self.window_handler(algorithms)
-        self.analyze_results(rows)
+    def create_results_sink(self, append: bool = False) -> None:
+        """
+        Create the results file, the buffered sink writing into it and the online aggregator of its rows.
 
-    def generate_maze(self) -> None:
+        Args:
+            append (bool): Keep the rows of an existing results file, they are aggregated first.
+        """
+        self.aggregator = OnlineAggregator(self.results_header)
+        exists = os.path.exists(self.filename)
+        # The sink is created first, it combines the part files an interrupted columnar run left behind
+        self.results_sink = ResultsSink(self.results_base, self.results_header, self.output_format,
+                                        metadata=self.run_metadata(), append=append)
+        if append and exists:
+            for row in load_results(self.filename)[self.results_header].itertuples(index=False, name=None):
+                self.aggregator.add(row)
+
+    def run_metadata(self) -> Dict[str, Any]:
+        """
+        Describe the seed and config of the run, stored together with the results.
+
+        Returns:
+            Dict[str, Any]: The run metadata.
+        """
+        return {
+            'rows': self.rows,
+            'cell_open_percentage': self.cell_open_percentage,
+            'base_seed': self.base_seed,
+            'iterations': self.iterations,
+            'algorithms': list(self.algorithms),
+            'tie_breaking': self.tie_breaking_policy.value,
+            'warmup_runs': self.timing_harness.warmup_runs,
+            'repetitions': self.timing_harness.repetitions,
+            'disable_gc': self.timing_harness.disable_gc,
+            'output_format': self.output_format.value,
+            'measure_memory': self.measure_memory,
+            'count_operations': self.count_operations,
+        }
+
+    def generate_maze(self, arrays: Optional[Tuple[bytes, int, int]] = None) -> None:
         """
         Generate the maze using the Grid class and initialize start and end spots.
+
+        Args:
+            arrays (Optional[Tuple[bytes, int, int]]): Maze from Grid.to_arrays, generated by another process, loaded
+                                                       instead of generating one.
         """
-        self.grid_object = Grid(self.rows, self.gap, self.cell_open_percentage)
+        self.grid_object = Grid(self.rows, self.gap, self.cell_open_percentage, arrays=arrays)
         self.grid_maze = self.grid_object.grid_maze
         self.start_spot, self.end_spot = self.grid_object.start_spot, self.grid_object.end_spot
 
-    def solv_maze(self, algorithm: Any, **kwargs: Any) -> Tuple[float, int, float]:
+    def solv_maze(self, algorithm: Any, **kwargs: Any) -> Tuple[float, ...]:
         """
         Run a given algorithm and measure its performance.
 
+        The timed runs are headless and the grid reset between them is not timed. In memory mode the algorithm runs
+        once more under tracemalloc and with operation counting once more with SearchStats, both separately from the
+        timed runs. In profiling mode it runs once more under the profiler of its name, and with trace recording once
+        more into a search trace. In window mode the search is replayed once more, untimed, for display.
+
         Args:
             algorithm (Any): The algorithm to run.
-            kwargs (Any): Additional arguments like 'win' and 'heuristic'.
+            kwargs (Any): Additional arguments like 'win', 'name', 'iteration' and 'heuristic'.
 
         Returns:
-            Tuple[float, int, float]: Execution time, number of visited cells, and total path cost.
+            Tuple[float, ...]: Median execution time in ms, number of visited cells, and total path cost, followed by
+            the peak memory in KiB and the allocated blocks in memory mode and the STATS_HEADER counters with
+            operation counting.
         """
         win = kwargs.get('win')
 
-        time_start = time.time()
-        path, visited = algorithm(self.grid_maze, self.start_spot, self.end_spot, win=win,
-                                  draw_updates=self.draw_updates, window_mode=self.window_mode)
-        end_time = round(time.time() - time_start, 10)
+        def run() -> Tuple[List[Any], Set[Any]]:
+            return algorithm(self.grid_maze, self.start_spot, self.end_spot, draw_updates=False, window_mode=False,
+                             tie_breaking=self.tie_breaking_policy)
+
+        (path, visited), timings = self.timing_harness.measure(
+            run, lambda: reset_grid(self.grid_maze, window_mode=False))
+        exec_time = median(timings) / 1e6
         path_cost = sum(spot.spot_value for spot in path)
+        metrics = (exec_time, len(visited), path_cost)
+        if self.measure_memory:
+            reset_grid(self.grid_maze, window_mode=False)
+            _, peak, blocks = measure_memory(run)
+            metrics += (peak / 1024, blocks)
+        if self.count_operations:
+            reset_grid(self.grid_maze, window_mode=False)
+            stats = SearchStats()
+            algorithm(self.grid_maze, self.start_spot, self.end_spot, draw_updates=False, window_mode=False,
+                      tie_breaking=self.tie_breaking_policy, stats=stats)
+            metrics += tuple(stats.as_row())
+        if self.profiler is not None:
+            reset_grid(self.grid_maze, window_mode=False)
+            self.profiler.run(kwargs.get('name', algorithm.__name__), run)
+        if self.record_traces:
+            reset_grid(self.grid_maze, window_mode=False)
+            name = kwargs.get('name', algorithm.__name__)
+            trace = SearchTrace.from_grid(self.grid_maze, self.start_spot, self.end_spot, name)
+            # The trace stands in for the window, the search takes its display path without drawing anything
+            algorithm(self.grid_maze, self.start_spot, self.end_spot, win=trace, draw_updates=True, window_mode=True,
+                      tie_breaking=self.tie_breaking_policy)
+            trace.save(trace_path(self.directory, kwargs.get('iteration', 0), name))
         if self.window_mode:
+            reset_grid(self.grid_maze, win, self.window_mode)
+            algorithm(self.grid_maze, self.start_spot, self.end_spot, win=win, draw_updates=self.draw_updates,
+                      window_mode=self.window_mode, tie_breaking=self.tie_breaking_policy)
+            flush_display()
             time.sleep(self.display_time)
         reset_grid(self.grid_maze, win, self.window_mode)
-        return end_time * 1000, len(visited), path_cost
+        return metrics
 
     def window_handler(self, algorithms: Dict[str, Any]) -> None:
         """
@@ -115,8 +310,11 @@ class AlgorithmAnalyzer(ProjectLogger):
             algorithms (Dict[str, Any]): Dictionary of algorithms to run.
         """
         win = None
-        n = EXECUTION_NUMBER
+        n = self.iterations
         if self.window_mode:
+            # Rendering is only loaded for window mode, headless runs and sweep workers never import pygame
+            import pygame
+
             pygame.display.set_caption("Path Finding Algorithm")
             win = pygame.display.set_mode((self.width, self.width))
             self.run_algorithms_n_times(n, algorithms, win)
@@ -126,39 +324,122 @@ class AlgorithmAnalyzer(ProjectLogger):
 
     def run_algorithms_n_times(self, n: int, algorithms: Dict[str, Any], win: Optional[Any]) -> None:
         """
-        Run each algorithm 'n' times and log the results.
+        Run each algorithm 'n' times and log the results, skipping the work units already in the checkpoint.
+
+        In adaptive mode the iterations stop early once the sampler converges or runs out of time.
 
         Args:
             n (int): Number of times to run each algorithm.
             algorithms (Dict[str, Any]): Dictionary of algorithms to run.
             win (Optional[Any]): Pygame window to draw the grid.
         """
-        for i in range(n):
-            self.logger.debug(f"{i} iteration running...")
-            self.generate_maze()
-            if self.window_mode:
-                draw_grid(win, self.grid_maze)
-            for name, algorithm in algorithms.items():
-                self.logger.debug(f'Executing {name} algorithm...\n')
-                exec_time, searched, path_cost = self.solv_maze(algorithm, win=win)
-                self.logger.debug(f"\n\tExecution_time: {exec_time} ms,"
-                                  f"\n\tSearched cells : {searched}"
-                                  f"\n\tTotal path cost: {path_cost}\n")
-                self.dump_results_into_csv(name, exec_time, searched, path_cost)
+        finished = []
+        stop_reason = None
+        if self.target_ci_width is not None:
+            self.start_sampling()
+        for i, names in self.checkpoint.pending(n, algorithms).items():
+            if self.sampler is not None:
+                stop_reason = self.sampler.stop_reason(list(algorithms))
+                if stop_reason:
+                    break
+            for name, *metrics in self.run_iteration(i, {name: algorithms[name] for name in names}, win):
+                self.dump_results(name, *metrics)
+            finished.append((i, names))
+            if len(finished) >= self.checkpoint_interval:
+                self.save_checkpoint(finished)
+        self.save_checkpoint(finished)
+        if self.sampler is not None:
+            if stop_reason is None:
+                stop_reason = CONVERGED if self.sampler.converged(list(algorithms)) else ITERATION_BUDGET
+            self.save_sampling_report(stop_reason)
+
+    def start_sampling(self) -> None:
+        """
+        Start the adaptive sampler on the running statistics of the config, including resumed results.
+        """
+        self.sampler = AdaptiveSampler(self.aggregator, self.target_ci_width, self.adaptive_metrics,
+                                       self.min_iterations, self.time_budget)
+
+    def save_sampling_report(self, stop_reason: str) -> None:
+        """
+        Record why the adaptive sampling of the config stopped.
+
+        Args:
+            stop_reason (str): CONVERGED, ITERATION_BUDGET or TIME_BUDGET.
+        """
+        iterations = len({iteration for iteration, _ in self.checkpoint.completed})
+        self.logger.info(f"Sampling of {self.directory} stopped after {iterations} iterations: {stop_reason}")
+        with open(os.path.join(self.directory, SAMPLING_FILENAME), mode='w') as file:
+            json.dump(self.sampler.report(stop_reason, iterations), file, indent=2)
+
+    def save_checkpoint(self, finished: List[Tuple[int, List[str]]]) -> None:
+        """
+        Flush the results and record the finished work units in the checkpoint.
+
+        Args:
+            finished (List[Tuple[int, List[str]]]): Iterations with the names of the algorithms that finished on them,
+                                                    cleared once recorded.
+        """
+        self.results_sink.flush()
+        self.checkpoint.record(finished)
+        finished.clear()
+        if time.perf_counter() - self.summary_written >= SUMMARY_INTERVAL:
+            self.write_summary()
+
+    def write_summary(self) -> None:
+        """
+        Write the ranked summary of the results aggregated so far to summary.csv, without reading the results file.
+        """
+        from ranking import rank_algorithms, SUMMARY_FILENAME
+
+        rank_algorithms(self.aggregator.summary_frame(), self.memory_weight).to_csv(
+            os.path.join(self.directory, SUMMARY_FILENAME), index=False)
+        self.summary_written = time.perf_counter()
+
+    def run_iteration(self, iteration: int, algorithms: Dict[str, Any], win: Optional[Any],
+                      arrays: Optional[Tuple[bytes, int, int]] = None) -> List[Tuple[Any, ...]]:
+        """
+        Generate the seeded maze of a single iteration and run every algorithm on it.
+
+        Args:
+            iteration (int): Iteration number within the config.
+            algorithms (Dict[str, Any]): Dictionary of algorithms to run.
+            win (Optional[Any]): Pygame window to draw the grid.
+            arrays (Optional[Tuple[bytes, int, int]]): The seeded maze of the iteration, generated ahead by the
+                                                       pipelined sweep. Defaults to generating it here.
+
+        Returns:
+            List[Tuple[Any, ...]]: Algorithm name, execution time, searched cells and path cost for every algorithm,
+            followed by the peak memory and allocated blocks in memory mode and the operation counts.
+        """
+        debug_event(self.logger, 'iteration', rows=self.rows, iteration=iteration)
+        random.seed(maze_seed(self.rows, self.cell_open_percentage, iteration, self.base_seed))
+        self.profiled('generate_maze', self.generate_maze, arrays)
+        if self.window_mode:
+            draw_grid(win, self.grid_maze)
+        results = []
+        for name, algorithm in algorithms.items():
+            metrics = self.solv_maze(algorithm, win=win, name=name, iteration=iteration)
+            # The fields are only built when DEBUG is enabled, this runs for every algorithm of every iteration
+            if self.logger.isEnabledFor(logging.DEBUG):
+                debug_event(self.logger, 'algorithm_run', algorithm=name,
+                            **dict(zip(self.results_header[1:], metrics)))
+            results.append((name, *metrics))
+        return results
 
-    def dump_results_into_csv(self, alg_name: str, exec_time: float, searched: int, path_cost: float) -> None:
+    def dump_results(self, alg_name: str, *metrics: float) -> None:
         """
-        Dump the results of algorithm execution into a CSV file.
+        Pass the results of algorithm execution to the buffered results sink.
 
         Args:
             alg_name (str): Name of the algorithm.
-            exec_time (float): Execution time in ms.
-            searched (int): Number of searched cells.
-            path_cost (float): Total cost of the path.
+            metrics (float): Execution time in ms, number of searched cells and total cost of the path, followed by
+                             the peak memory in KiB and the allocated blocks in memory mode and the operation
+                             counts.
         """
-        with open(self.filename, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow([alg_name, exec_time, searched, path_cost])
+        row = [alg_name, *metrics]
+        self.results_sink.append(row)
+        self.aggregator.add(row)
 
     def analyze_results(self, rows: int) -> None:
         """
@@ -167,23 +448,141 @@ class AlgorithmAnalyzer(ProjectLogger):
         Args:
             rows (int): Number of rows in the grid.
         """
-        analyze_results_and_generate_plot(self.filename, rows, self.logger, self.show_plot, self.cell_open_percentage)
+        # pandas and matplotlib are only loaded for the analysis, the sweep workers never import them
+        from scoring_and_plot import analyze_results_and_generate_plot
+
+        aggregated = self.aggregator is not None and self.aggregator.running
+        summary = self.aggregator.summary_frame() if aggregated else None
+        with Stage('analysis', self.logger, rows=self.rows, cell_open_percentage=self.cell_open_percentage):
+            self.profiled('analysis', analyze_results_and_generate_plot, self.filename, rows, self.logger,
+                          self.show_plot, self.cell_open_percentage, memory_weight=self.memory_weight,
+                          summary=summary, charts=self.charts, directory=self.directory)
+
+    def profiled(self, label: str, func: Any, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a function, under the profiler of the label in profiling mode.
+
+        Args:
+            label (str): Profiled stage, calls with the same label are aggregated.
+            func (Any): The called function.
+            args (Any): Positional arguments of the function.
+            kwargs (Any): Keyword arguments of the function.
+
+        Returns:
+            Any: The result of the function.
+        """
+        if self.profiler is None:
+            return func(*args, **kwargs)
+        return self.profiler.run(label, func, *args, **kwargs)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the sweep matrix and the run options from the command line.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the path finding algorithms over a config matrix. "
+                                                 "Configs are resumed from their checkpoints unless --fresh is set.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[MIN_SIZE, MID_SIZE, MAX_SIZE],
+                        help='Maze sizes to benchmark.')
+    parser.add_argument('--open-pcts', type=int, nargs='+', default=[25, 5, 0],
+                        help='Open cell percentages to benchmark for every size.')
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS),
+                        help='Algorithms to benchmark.')
+    parser.add_argument('--iterations', type=int, default=EXECUTION_NUMBER,
+                        help='Number of mazes per config, raise it to extend finished configs.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Number of worker processes, 1 runs the configs serially in this process.')
+    parser.add_argument('--generators', type=int, default=0,
+                        help='Pipeline the sweep: this many processes generate the mazes ahead into shared memory '
+                             'and the --workers processes only solve them.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the sweep.')
+    parser.add_argument('--format', type=results_format, default=results_format.CSV,
+                        choices=list(results_format), metavar='{' + ','.join(f.value for f in results_format) + '}',
+                        help='Format of the results files.')
+    parser.add_argument('--tie-breaking', type=tie_breaking, default=tie_breaking.FIFO, choices=list(tie_breaking),
+                        metavar='{' + ','.join(t.value for t in tie_breaking) + '}',
+                        help='Tie-breaking policy for the A*-family frontiers.')
+    parser.add_argument('--warmup-runs', type=int, default=WARMUP_RUNS, help='Untimed runs before each measurement.')
+    parser.add_argument('--repetitions', type=int, default=TIMING_REPETITIONS, help='Timed runs per maze.')
+    parser.add_argument('--measure-memory', action='store_true',
+                        help='Record the peak memory and allocated blocks of every algorithm run, untimed.')
+    parser.add_argument('--memory-weight', type=float, default=0.0,
+                        help='Exponent of the peak memory in the overall score: 1 weighs it like the other metrics, '
+                             'larger values favour low-memory algorithms, 0 leaves it out of the ranking.')
+    parser.add_argument('--count-operations', action='store_true',
+                        help='Record the frontier operation counts of every algorithm run, untimed.')
+    parser.add_argument('--profile', action='store_true',
+                        help='Write cProfile and collapsed stack profiles of every algorithm, maze generation and '
+                             'analysis to each config directory.')
+    parser.add_argument('--target-ci-width', type=float, default=None,
+                        help='Enable adaptive sampling: stop a config once the 95%% confidence interval of every '
+                             'metric is narrower than this fraction of its mean (0.1 is +-5%%). --iterations becomes '
+                             'the iteration budget. Runs serially.')
+    parser.add_argument('--min-iterations', type=int, default=MIN_ITERATIONS,
+                        help='Iterations before convergence is checked in adaptive mode.')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Seconds per config after which adaptive sampling stops.')
+    parser.add_argument('--record-traces', action='store_true',
+                        help='Write a binary trace of every search to each config directory, see replay_viewer.py.')
+    parser.add_argument('--metrics', nargs='?', const=METRICS_FILENAME, default=None,
+                        help=f'Append the stage timings of maze generation and analysis to a JSON lines file '
+                             f'(default file: {METRICS_FILENAME}).')
+    parser.add_argument('--fresh', action='store_true', help='Remove existing results and start every config over.')
+    parser.add_argument('--window', action='store_true', help='Display the searches, runs serially.')
+    parser.add_argument('--show-plot', action='store_true', help='Show the plots after each analysis.')
+    parser.add_argument('--no-report', action='store_true',
+                        help='Skip the reporting stage drawing the charts of all configs and the HTML index.')
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    display_results = False
-    debug_update_draw = False
-    show_plt = False
-
-    for size in [MIN_SIZE, MID_SIZE, MAX_SIZE]:
-        for cell_open_pct in [25, 5, 0]:
-            # Directory for storing CSV and PNG files
-            directory_name = f"size{size}_open_cells_pct{cell_open_pct}"
-            # Check if the directory exists and remove its contents if it does
-            if os.path.exists(directory_name):
-                shutil.rmtree(directory_name)
-            # Recreate the directory
-            os.makedirs(directory_name)
-
-            AlgorithmAnalyzer(rows=size, draw_updates=debug_update_draw, directory=directory_name,
-                              window_mode=display_results, show_plot=show_plt, cell_open_percentage=cell_open_pct)
+    args = parse_arguments()
+    selected_algorithms = {name: ALGORITHMS[name] for name in args.algorithms}
+
+    if (args.workers > 1 or args.generators) and not args.window and args.target_ci_width is None:
+        from parallel_sweep import ParallelSweep
+        from maze_pipeline import PipelinedSweep
+
+        # The pipelined sweep generates the mazes in separate processes, its workers only solve them
+        sweep_class, pipeline_kwargs = (PipelinedSweep, {'generators': args.generators}) if args.generators \
+            else (ParallelSweep, {})
+        sweep_class(sizes=args.sizes, cell_open_percentages=args.open_pcts, iterations=args.iterations,
+                    workers=args.workers, base_seed=args.seed, show_plot=args.show_plot,
+                    tie_breaking_policy=args.tie_breaking, warmup_runs=args.warmup_runs,
+                    repetitions=args.repetitions, output_format=args.format, algorithm_names=args.algorithms,
+                    fresh=args.fresh, measure_memory=args.measure_memory, memory_weight=args.memory_weight,
+                    count_operations=args.count_operations, profile=args.profile,
+                    charts=args.show_plot, record_traces=args.record_traces, metrics_path=args.metrics,
+                    **pipeline_kwargs).run()
+    else:
+        for size in args.sizes:
+            for cell_open_pct in args.open_pcts:
+                # Directory for storing CSV and PNG files
+                directory_name = f"size{size}_open_cells_pct{cell_open_pct}"
+                # Start the config over only when requested, otherwise it is resumed from its checkpoint
+                if args.fresh and os.path.exists(directory_name):
+                    shutil.rmtree(directory_name)
+                os.makedirs(directory_name, exist_ok=True)
+
+                AlgorithmAnalyzer(rows=size, draw_updates=args.window, directory=directory_name,
+                                  window_mode=args.window, show_plot=args.show_plot,
+                                  cell_open_percentage=cell_open_pct, tie_breaking_policy=args.tie_breaking,
+                                  base_seed=args.seed, warmup_runs=args.warmup_runs, repetitions=args.repetitions,
+                                  iterations=args.iterations, output_format=args.format,
+                                  algorithms=selected_algorithms, resume=True, measure_memory=args.measure_memory,
+                                  memory_weight=args.memory_weight, count_operations=args.count_operations,
+                                  profile=args.profile, target_ci_width=args.target_ci_width,
+                                  min_iterations=args.min_iterations, time_budget=args.time_budget,
+                                  charts=args.show_plot, record_traces=args.record_traces,
+                                  metrics_path=args.metrics)
+
+    # Charts of the swept configs are drawn once, in parallel and without a window, next to the cross-config
+    # figures and the index, also when --show-plot has shown them already
+    if not args.no_report:
+        from reporting import ReportGenerator
+
+        ReportGenerator(workers=args.workers,
+                        configs=[(size, pct) for size in args.sizes for pct in args.open_pcts]).run()
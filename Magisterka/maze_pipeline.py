@@ -0,0 +1,246 @@
+import json
+import multiprocessing
+import os
+import queue
+import random
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Tuple
+from main import AlgorithmAnalyzer, maze_seed
+from parallel_sweep import ParallelSweep, create_analyzer, run_work_unit
+
+PIPELINE_REPORT = "pipeline_utilization.json"
+# Mazes generated ahead of the solvers, every one holds a shared memory slot
+QUEUE_SIZE = 4
+# Seconds between the parent's checks of crashed processes while it waits for events
+POLL_INTERVAL = 1.0
+
+
+def generate_mazes(tasks: Any, free: Any, ready: Any, events: Any, slot_names: List[str],
+                   analyzer_kwargs: Dict[str, Any], root: str) -> None:
+    """
+    Generate the seeded mazes of the work units into free shared memory slots, run in the generator processes.
+
+    The maze is written as Grid.to_arrays bytes, only the slot index and the start and end cells pass through the
+    ready queue. Taking a slot blocks while all of them wait for the solvers, which bounds the mazes generated ahead.
+
+    Args:
+        tasks (multiprocessing.Queue): Work units to generate, None stops the generator.
+        free (multiprocessing.Queue): Indices of the free slots.
+        ready (multiprocessing.Queue): Generated mazes for the solvers.
+        events (multiprocessing.Queue): Every generated maze and, once it stops, the utilization of the generator.
+        slot_names (List[str]): Names of the shared memory slots.
+        analyzer_kwargs (Dict[str, Any]): Seed, timing and output settings shared by the whole sweep.
+        root (str): Directory holding the configs of the sweep.
+    """
+    time_start = time.perf_counter()
+    slots = [SharedMemory(name=name) for name in slot_names]
+    analyzers: Dict[Tuple[int, int], AlgorithmAnalyzer] = {}
+    busy = blocked = 0.0
+    mazes = 0
+    try:
+        while (unit := tasks.get()) is not None:
+            size, pct, iteration, names = unit
+            busy_start = time.perf_counter()
+            if (size, pct) not in analyzers:
+                analyzers[(size, pct)] = create_analyzer(size, pct, analyzer_kwargs, root)
+            analyzer = analyzers[(size, pct)]
+            random.seed(maze_seed(analyzer.rows, pct, iteration, analyzer.base_seed))
+            analyzer.generate_maze()
+            maze, start, end = analyzer.grid_object.to_arrays()
+            blocked_start = time.perf_counter()
+            slot = free.get()
+            waited = time.perf_counter() - blocked_start
+            slots[slot].buf[:len(maze)] = maze
+            ready.put((slot, len(maze), start, end, unit))
+            events.put(('generated',))
+            busy += time.perf_counter() - busy_start - waited
+            blocked += waited
+            mazes += 1
+    finally:
+        for slot in slots:
+            slot.close()
+    events.put(('generator', os.getpid(), mazes, busy, blocked, time.perf_counter() - time_start))
+
+
+def solve_mazes(ready: Any, free: Any, events: Any, slot_names: List[str], analyzer_kwargs: Dict[str, Any],
+                root: str) -> None:
+    """
+    Run the algorithms of the work units on the generated mazes, run in the solver processes.
+
+    The slot is released as soon as its maze is copied out, before the algorithms run.
+
+    Args:
+        ready (multiprocessing.Queue): Generated mazes, None stops the solver.
+        free (multiprocessing.Queue): Indices of the free slots.
+        events (multiprocessing.Queue): Taken mazes, finished work units and, once it stops, the utilization of the
+                                        solver.
+        slot_names (List[str]): Names of the shared memory slots.
+        analyzer_kwargs (Dict[str, Any]): Seed, timing and output settings shared by the whole sweep.
+        root (str): Directory holding the configs of the sweep.
+    """
+    time_start = time.perf_counter()
+    slots = [SharedMemory(name=name) for name in slot_names]
+    busy = starved = 0.0
+    mazes = 0
+    try:
+        while True:
+            starved_start = time.perf_counter()
+            item = ready.get()
+            starved += time.perf_counter() - starved_start
+            if item is None:
+                break
+            busy_start = time.perf_counter()
+            slot, length, start, end, unit = item
+            maze = bytes(slots[slot].buf[:length])
+            free.put(slot)
+            events.put(('taken',))
+            events.put(('unit', *run_work_unit(*unit, analyzer_kwargs, root, arrays=(maze, start, end))))
+            busy += time.perf_counter() - busy_start
+            mazes += 1
+    finally:
+        for slot in slots:
+            slot.close()
+    events.put(('solver', os.getpid(), mazes, busy, starved, time.perf_counter() - time_start))
+
+
+class PipelinedSweep(ParallelSweep):
+    def __init__(self, *args: Any, generators: int = 1, queue_size: int = QUEUE_SIZE, **kwargs: Any):
+        """
+        Initialize the PipelinedSweep, a ParallelSweep whose mazes are generated ahead by separate processes.
+
+        Generator processes put the seeded mazes into a bounded pool of shared memory slots and the solver processes,
+        the sweep's workers, run the algorithms on them, so the solvers do not wait for the next Grid to be built.
+        The results match the ParallelSweep and the serial run with the same seed.
+
+        Args:
+            args (Any): Arguments of ParallelSweep, workers is the number of solver processes.
+            generators (int): Number of generator processes.
+            queue_size (int): Number of mazes generated ahead of the solvers.
+            kwargs (Any): Keyword arguments of ParallelSweep.
+        """
+        super().__init__(*args, **kwargs)
+        self.generators = generators
+        self.queue_size = max(queue_size, 1)
+
+    def execute(self, units: List[Tuple[int, int, int, List[str]]],
+                analyzers: Dict[Tuple[int, int], AlgorithmAnalyzer]) -> None:
+        """
+        Run the work units through the generator and solver processes and report their utilization.
+
+        Args:
+            units (List[Tuple[int, int, int, List[str]]]): Pending (size, cell_open_percentage, iteration, algorithm
+                                                           names) work units.
+            analyzers (Dict[Tuple[int, int], AlgorithmAnalyzer]): Analyzers of the configs, recording the finished
+                                                                  units in their checkpoints.
+        """
+        if not units:
+            return
+        self.logger.info(f"Running {len(units)} work units on {self.generators} generator and {self.workers} solver "
+                         f"processes, {self.queue_size} mazes ahead...")
+        slot_size = max(analyzer.rows for analyzer in analyzers.values()) ** 2
+        slots = [SharedMemory(create=True, size=slot_size) for _ in range(self.queue_size)]
+        tasks, free, ready, events = (multiprocessing.Queue() for _ in range(4))
+        for unit in units:
+            tasks.put(unit)
+        for _ in range(self.generators):
+            tasks.put(None)
+        for slot in range(self.queue_size):
+            free.put(slot)
+
+        slot_names = [slot.name for slot in slots]
+        # Processes attaching to the slots have to share the parent's tracker, their own would unlink them on exit
+        resource_tracker.ensure_running()
+        generators = [multiprocessing.Process(target=generate_mazes, daemon=True,
+                                              args=(tasks, free, ready, events, slot_names, self.analyzer_kwargs,
+                                                    self.root))
+                      for _ in range(self.generators)]
+        solvers = [multiprocessing.Process(target=solve_mazes, daemon=True,
+                                           args=(ready, free, events, slot_names, self.analyzer_kwargs, self.root))
+                   for _ in range(self.workers)]
+        time_start = time.perf_counter()
+        for process in generators + solvers:
+            process.start()
+
+        utilization = []
+        done = 0
+        # Mazes in the ready queue, counted from the events since Queue.qsize is not implemented on macOS
+        depth = 0
+        queue_depths = []
+        try:
+            while len(utilization) < len(generators) + len(solvers):
+                try:
+                    event = events.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    crashed = [process.pid for process in generators + solvers if process.exitcode]
+                    if crashed:
+                        raise RuntimeError(f"Pipeline processes {crashed} crashed, the sweep can be resumed.")
+                    continue
+                if event[0] in ('generated', 'taken'):
+                    depth += 1 if event[0] == 'generated' else -1
+                    continue
+                if event[0] == 'unit':
+                    _, size, pct, iteration, names, rows = event
+                    self.record_unit(analyzers[(size, pct)], iteration, names, rows)
+                    done += 1
+                    queue_depths.append(depth)
+                    if not done % 100:
+                        self.logger.info(f"{done}/{len(units)} work units done")
+                    continue
+                utilization.append(event)
+                if event[0] == 'generator' and sum(role == 'generator' for role, *_ in utilization) == len(generators):
+                    # Every maze is in the ready queue, the solvers stop after draining it
+                    for _ in solvers:
+                        ready.put(None)
+            for process in generators + solvers:
+                process.join()
+        finally:
+            for process in generators + solvers:
+                if process.is_alive():
+                    process.terminate()
+            for slot in slots:
+                slot.close()
+                slot.unlink()
+        self.report(utilization, queue_depths, time.perf_counter() - time_start)
+
+    def report(self, utilization: List[Tuple[Any, ...]], queue_depths: List[int], elapsed: float) -> None:
+        """
+        Log the utilization of the generator and solver stages and write it to PIPELINE_REPORT in the sweep's root.
+
+        Busy generators blocked on full slots mean more solvers are needed, solvers starved of mazes mean more
+        generators are.
+
+        Args:
+            utilization (List[Tuple[Any, ...]]): (role, pid, mazes, busy, waiting, lifetime) of every process, the
+                                                 generators wait for free slots and the solvers for mazes.
+            queue_depths (List[int]): Mazes waiting in the ready queue whenever a work unit finished.
+            elapsed (float): Wall time of the pipeline in seconds.
+        """
+        stages = {}
+        for role in ('generator', 'solver'):
+            processes = [event for event in utilization if event[0] == role]
+            lifetime = sum(event[5] for event in processes)
+            stages[role] = {
+                'processes': len(processes),
+                'mazes': sum(event[2] for event in processes),
+                'busy_pct': round(100 * sum(event[3] for event in processes) / lifetime, 1) if lifetime else 0.0,
+                'waiting_pct': round(100 * sum(event[4] for event in processes) / lifetime, 1) if lifetime else 0.0,
+            }
+        report = {
+            'elapsed_s': round(elapsed, 3),
+            'queue_size': self.queue_size,
+            'mean_queue_depth': round(sum(queue_depths) / len(queue_depths), 2) if queue_depths else 0.0,
+            'stages': stages,
+        }
+        with open(os.path.join(self.root, PIPELINE_REPORT), mode='w') as file:
+            json.dump(report, file, indent=2)
+        generator, solver = stages['generator'], stages['solver']
+        self.logger.info(f"Pipeline done in {elapsed:.2f}s, mean ready queue depth {report['mean_queue_depth']}:\n"
+                         f"\tgenerators: {generator['busy_pct']}% busy, {generator['waiting_pct']}% blocked on "
+                         f"full slots\n"
+                         f"\tsolvers: {solver['busy_pct']}% busy, {solver['waiting_pct']}% waiting for mazes")
+        if solver['waiting_pct'] > generator['waiting_pct']:
+            self.logger.info("The solvers wait for mazes, more generator processes would keep them busy.")
+        elif generator['waiting_pct'] > solver['waiting_pct']:
+            self.logger.info("The generators wait for free slots, more solver processes would drain the queue faster.")
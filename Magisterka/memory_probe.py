@@ -0,0 +1,32 @@
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+
+def measure_memory(run: Callable[[], Any]) -> Tuple[Any, int, int]:
+    """
+    Run a callable under tracemalloc and measure the memory it allocates.
+
+    Tracing only covers the call itself, so the measurement is independent of everything allocated before it. The
+    tracing overhead makes this run unsuitable for timing, it has to be separate from the timed runs.
+
+    Args:
+        run (Callable[[], Any]): The measured call.
+
+    Returns:
+        Tuple[Any, int, int]: The result of the call, the peak traced allocation in bytes and the number of memory
+        blocks allocated by the call that are still alive when it returns (including its result).
+
+    Raises:
+        RuntimeError: If tracemalloc is already tracing.
+    """
+    if tracemalloc.is_tracing():
+        raise RuntimeError('tracemalloc is already tracing, the measurement would include foreign allocations')
+    tracemalloc.start()
+    try:
+        result = run()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+    return result, peak, blocks
@@ -0,0 +1,273 @@
+import math
+import random
+from typing import Any, Dict, List, Sequence, Tuple
+
+EXECUTION_TIME = "Execution Time (ms)"
+QUARTILES = (0.25, 0.5, 0.75)
+RESERVOIR_SIZE = 1024
+
+
+class RunningStats:
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self):
+        """
+        Initialize the RunningStats, a single pass mean and variance (Welford's algorithm).
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the sample.
+
+        Args:
+            value (float): The new value.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """
+        Get the sample variance.
+
+        Returns:
+            float: The unbiased variance, 0 for less than two values.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """
+        Get the sample standard deviation.
+
+        Returns:
+            float: The standard deviation.
+        """
+        return math.sqrt(self.variance)
+
+    def relative_ci_width(self, z: float) -> float:
+        """
+        Get the width of the normal confidence interval of the mean relative to the mean.
+
+        Args:
+            z (float): Standard normal quantile of the confidence level, 1.96 for 95%.
+
+        Returns:
+            float: The relative width, infinite for less than two values or a zero mean with spread.
+        """
+        if self.count < 2:
+            return math.inf
+        width = 2 * z * self.std / math.sqrt(self.count)
+        if not width:
+            return 0.0
+        return width / abs(self.mean) if self.mean else math.inf
+
+
+class P2Quantile:
+    __slots__ = ('p', 'heights', 'positions', 'desired', 'increments', 'count')
+
+    def __init__(self, p: float):
+        """
+        Initialize the P2Quantile, a constant memory quantile estimate (the P² algorithm of Jain and Chlamtac).
+
+        Args:
+            p (float): The estimated quantile, 0.5 for the median.
+        """
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the sample.
+
+        Args:
+            value (float): The new value.
+        """
+        self.count += 1
+        heights, positions = self.heights, self.positions
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+                        (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i])
+                        / (positions[i + 1] - positions[i])
+                        + (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1])
+                        / (positions[i] - positions[i - 1]))
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    @property
+    def value(self) -> float:
+        """
+        Get the quantile estimate, exact while there are at most 5 values.
+
+        Returns:
+            float: The estimate, NaN for an empty sample.
+        """
+        if not self.count:
+            return math.nan
+        if self.count > 5:
+            return self.heights[2]
+        index = self.p * (self.count - 1)
+        low = math.floor(index)
+        high = min(low + 1, self.count - 1)
+        return self.heights[low] + (self.heights[high] - self.heights[low]) * (index - low)
+
+
+class Reservoir:
+    __slots__ = ('size', 'values', 'count', 'random')
+
+    def __init__(self, size: int, seed: int = 0):
+        """
+        Initialize the Reservoir, a uniform random sample of bounded size from a stream.
+
+        Args:
+            size (int): Maximum number of kept values.
+            seed (int): Seed of the replacement choices, so summaries are reproducible.
+        """
+        self.size = size
+        self.values = []
+        self.count = 0
+        self.random = random.Random(seed)
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the stream.
+
+        Args:
+            value (float): The new value.
+        """
+        self.count += 1
+        if len(self.values) < self.size:
+            self.values.append(value)
+        else:
+            index = self.random.randrange(self.count)
+            if index < self.size:
+                self.values[index] = value
+
+    @property
+    def complete(self) -> bool:
+        """
+        Check if the reservoir still holds every value of the stream.
+
+        Returns:
+            bool: True if no value was dropped.
+        """
+        return self.count <= self.size
+
+
+class OnlineAggregator:
+    def __init__(self, header: Sequence[str], reservoir_size: int = RESERVOIR_SIZE):
+        """
+        Initialize the OnlineAggregator, the per algorithm summary of a config updated with every results row.
+
+        Every metric keeps a running mean and variance. The execution time also keeps P² quartile sketches and a
+        reservoir sample for the bootstrap confidence interval. While the reservoir holds every run, the median and
+        IQR are exact, the sketches take over for longer runs.
+
+        Args:
+            header (Sequence[str]): Column names of the rows, starting with the algorithm name.
+            reservoir_size (int): Execution times kept per algorithm.
+        """
+        self.header = list(header)
+        self.reservoir_size = reservoir_size
+        self.running: Dict[Tuple[str, str], RunningStats] = {}
+        self.quartiles: Dict[str, List[P2Quantile]] = {}
+        self.reservoirs: Dict[str, Reservoir] = {}
+
+    @classmethod
+    def from_frame(cls, df: 'pd.DataFrame') -> 'OnlineAggregator':
+        """
+        Aggregate the rows of a loaded results file.
+
+        Args:
+            df (pd.DataFrame): The results.
+
+        Returns:
+            OnlineAggregator: The aggregator holding every row.
+        """
+        aggregator = cls(df.columns)
+        for row in df.itertuples(index=False, name=None):
+            aggregator.add(row)
+        return aggregator
+
+    def add(self, row: Sequence[Any]) -> None:
+        """
+        Add a results row.
+
+        Args:
+            row (Sequence[Any]): Values in header order.
+        """
+        name = row[0]
+        for column, value in zip(self.header[1:], row[1:]):
+            key = (name, column)
+            if key not in self.running:
+                self.running[key] = RunningStats()
+            self.running[key].add(float(value))
+            if column == EXECUTION_TIME:
+                if name not in self.quartiles:
+                    self.quartiles[name] = [P2Quantile(p) for p in QUARTILES]
+                    self.reservoirs[name] = Reservoir(self.reservoir_size)
+                for quantile in self.quartiles[name]:
+                    quantile.add(float(value))
+                self.reservoirs[name].add(float(value))
+
+    def summary_frame(self) -> 'pd.DataFrame':
+        """
+        Build the summary of every algorithm aggregated so far, in the columns of summary.csv before ranking.
+
+        Returns:
+            pd.DataFrame: One row per algorithm.
+        """
+        import pandas as pd
+        from ranking import summary_column
+        from result_statistics import median_iqr, bootstrap_ci
+
+        rows = []
+        for name in dict.fromkeys(name for name, _ in self.running):
+            row = {'Algorithm_name': name}
+            for column in self.header[1:]:
+                row[summary_column(column)] = self.running[(name, column)].mean
+            reservoir = self.reservoirs.get(name)
+            if reservoir is not None:
+                if reservoir.complete:
+                    row['median_exec_time'], row['exec_time_iqr'] = median_iqr(reservoir.values)
+                else:
+                    q1, median, q3 = (quantile.value for quantile in self.quartiles[name])
+                    row['median_exec_time'], row['exec_time_iqr'] = median, q3 - q1
+                row['exec_time_ci_low'], row['exec_time_ci_high'] = bootstrap_ci(reservoir.values)
+            row['runs'] = self.running[(name, self.header[1])].count
+            rows.append(row)
+        return pd.DataFrame(rows)
@@ -0,0 +1,322 @@
+import csv
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from enums.results_format import ResultsFormat as results_format
+from enums.tie_breaking import TieBreaking as tie_breaking
+from logger import ProjectLogger
+from main import AlgorithmAnalyzer, ALGORITHMS, SUMMARY_INTERVAL
+from online_stats import OnlineAggregator
+from profiling import merge_profiles, PROFILES_DIRECTORY, WORKER_SUFFIX
+from results_store import ResultsSink, COLUMN_TYPES, load_results
+
+PARTS_DIRECTORY = "parts"
+ITERATION_COLUMN = "Iteration"
+
+# Analyzers and part file sinks of the current worker process, keyed by (root, size, cell_open_percentage)
+_worker_analyzers: Dict[Tuple[str, int, int], Tuple[AlgorithmAnalyzer, ResultsSink]] = {}
+
+
+def config_directory(size: int, cell_open_percentage: int, root: str = '') -> str:
+    """
+    Get the directory storing the CSV and PNG files of a config.
+
+    Args:
+        size (int): Requested maze size.
+        cell_open_percentage (int): The percentage of opened passages to complicate maze.
+        root (str): Directory holding the configs of the sweep. Defaults to the working directory.
+
+    Returns:
+        str: Directory name.
+    """
+    return os.path.join(root, f"size{size}_open_cells_pct{cell_open_percentage}")
+
+
+def create_analyzer(size: int, cell_open_percentage: int, analyzer_kwargs: Dict[str, Any],
+                    root: str = '') -> AlgorithmAnalyzer:
+    """
+    Create a headless AlgorithmAnalyzer of a config that does not run on its own.
+
+    Args:
+        size (int): Requested maze size.
+        cell_open_percentage (int): The percentage of opened passages to complicate maze.
+        analyzer_kwargs (Dict[str, Any]): Seed, timing and output settings shared by the whole sweep.
+        root (str): Directory holding the configs of the sweep. Defaults to the working directory.
+
+    Returns:
+        AlgorithmAnalyzer: The analyzer.
+    """
+    return AlgorithmAnalyzer(rows=size, draw_updates=False,
+                             directory=config_directory(size, cell_open_percentage, root), window_mode=False,
+                             cell_open_percentage=cell_open_percentage, run=False, **analyzer_kwargs)
+
+
+def run_work_unit(size: int, cell_open_percentage: int, iteration: int, algorithm_names: List[str],
+                  analyzer_kwargs: Dict[str, Any], root: str = '', arrays: Optional[Tuple[bytes, int, int]] = None) \
+        -> Tuple[int, int, int, List[str], List[Tuple[Any, ...]]]:
+    """
+    Run the given algorithms on the seeded maze of one (config, iteration) work unit inside a worker process.
+
+    The rows are appended, together with the iteration number, to the worker's own part file, and returned for the
+    parent's running summary.
+
+    Args:
+        size (int): Requested maze size.
+        cell_open_percentage (int): The percentage of opened passages to complicate maze.
+        iteration (int): Iteration number within the config.
+        algorithm_names (List[str]): Names of the algorithms still to run on the iteration.
+        analyzer_kwargs (Dict[str, Any]): Seed, timing and output settings shared by the whole sweep.
+        root (str): Directory holding the configs of the sweep. Defaults to the working directory.
+        arrays (Optional[Tuple[bytes, int, int]]): The seeded maze of the unit from Grid.to_arrays, generated by
+                                                   another process. Defaults to generating it here.
+
+    Returns:
+        Tuple[int, int, int, List[str], List[Tuple[Any, ...]]]: The finished work unit and its result rows, which are
+                                                                already written.
+    """
+    key = (root, size, cell_open_percentage)
+    if key not in _worker_analyzers:
+        analyzer = create_analyzer(size, cell_open_percentage, analyzer_kwargs, root)
+        part_sink = ResultsSink(os.path.join(analyzer.directory, PARTS_DIRECTORY, f"worker_{os.getpid()}"),
+                                [ITERATION_COLUMN, *analyzer.results_header], metadata=analyzer.run_metadata(),
+                                append=True)
+        _worker_analyzers[key] = (analyzer, part_sink)
+    analyzer, part_sink = _worker_analyzers[key]
+    algorithms = {name: analyzer.algorithms[name] for name in algorithm_names}
+    rows = analyzer.run_iteration(iteration, algorithms, None, arrays)
+    part_sink.extend([[iteration, *row] for row in rows])
+    # Flushed per work unit, a unit must be on disk before the parent records it in the checkpoint
+    part_sink.flush()
+    if analyzer.profiler is not None:
+        # The profiles accumulate in the worker, every dump replaces the previous one
+        analyzer.profiler.dump(os.path.join(analyzer.directory, PROFILES_DIRECTORY, PARTS_DIRECTORY),
+                               suffix=f"{WORKER_SUFFIX}{os.getpid()}")
+    return size, cell_open_percentage, iteration, algorithm_names, rows
+
+
+class ParallelSweep(ProjectLogger):
+    def __init__(self, sizes: List[int], cell_open_percentages: List[int], iterations: int,
+                 workers: Optional[int] = None, base_seed: int = 0, show_plot: bool = False,
+                 tie_breaking_policy: tie_breaking = tie_breaking.FIFO, warmup_runs: int = 0, repetitions: int = 1,
+                 disable_gc: bool = True, output_format: results_format = results_format.CSV,
+                 algorithm_names: Optional[List[str]] = None, fresh: bool = False, measure_memory: bool = False,
+                 memory_weight: float = 0.0, count_operations: bool = False, profile: bool = False,
+                 charts: bool = True, record_traces: bool = False, metrics_path: Optional[str] = None,
+                 root: str = ''):
+        """
+        Initialize the ParallelSweep.
+
+        Args:
+            sizes (List[int]): Maze sizes to benchmark.
+            cell_open_percentages (List[int]): Open percentages to benchmark for every size.
+            iterations (int): Number of mazes per config.
+            workers (Optional[int]): Number of worker processes. Defaults to one per core.
+            base_seed (int): Seed of the whole sweep, matches the serial AlgorithmAnalyzer run with the same seed.
+            show_plot (bool): Flag to show plot after analysis.
+            tie_breaking_policy (tie_breaking): Tie-breaking policy for the A*-family frontiers.
+            warmup_runs (int): Untimed runs of every algorithm before its measurement.
+            repetitions (int): Timed runs of every algorithm per maze.
+            disable_gc (bool): Pause the garbage collector during the timed regions.
+            output_format (results_format): Format of the merged results files.
+            algorithm_names (Optional[List[str]]): Names of the algorithms to run. Defaults to all of ALGORITHMS.
+            fresh (bool): Remove existing results and start every config over instead of resuming it.
+            measure_memory (bool): Record the peak memory and allocated blocks of every algorithm run.
+            memory_weight (float): Exponent of the peak memory in the overall score, 0 leaves it out of the ranking.
+            count_operations (bool): Record the frontier operation counts of every algorithm run.
+            profile (bool): Write the profiles of every config, merged across the worker processes.
+            charts (bool): Draw the charts of every config after its analysis, disable it when the reporting stage
+                           draws them.
+            record_traces (bool): Write a search trace of every algorithm run.
+            metrics_path (Optional[str]): JSON lines file all processes append their stage timings to.
+            root (str): Directory the config directories are created in. Defaults to the working directory.
+        """
+        super().__init__()
+        self.sizes = sizes
+        self.cell_open_percentages = cell_open_percentages
+        self.iterations = iterations
+        self.workers = workers or os.cpu_count()
+        self.show_plot = show_plot
+        self.fresh = fresh
+        self.root = root
+        self.analyzer_kwargs = {
+            'algorithms': {name: ALGORITHMS[name] for name in algorithm_names or ALGORITHMS},
+            'tie_breaking_policy': tie_breaking_policy,
+            'base_seed': base_seed,
+            'warmup_runs': warmup_runs,
+            'repetitions': repetitions,
+            'disable_gc': disable_gc,
+            'iterations': iterations,
+            'output_format': output_format,
+            'show_plot': show_plot,
+            'resume': not fresh,
+            'measure_memory': measure_memory,
+            'memory_weight': memory_weight,
+            'count_operations': count_operations,
+            'profile': profile,
+            'charts': charts,
+            'record_traces': record_traces,
+            'metrics_path': metrics_path and os.path.abspath(metrics_path),
+        }
+
+    def run(self) -> None:
+        """
+        Spread the pending (config, iteration) work units across the process pool, then merge and analyze every config.
+
+        Finished work units are recorded in each config's checkpoint as soon as their worker returns, so an
+        interrupted sweep resumes from there.
+        """
+        analyzers = self.prepare_configs()
+        # Largest mazes first, so the long work units do not end up alone at the tail of the sweep
+        units = [(size, pct, i, names) for size, pct in sorted(analyzers, reverse=True)
+                 for i, names in analyzers[(size, pct)].checkpoint.pending(self.iterations,
+                                                                           analyzers[(size, pct)].algorithms).items()]
+        self.execute(units, analyzers)
+
+        for (size, pct), analyzer in analyzers.items():
+            self.merge_results(analyzer)
+            analyzer.analyze_results(size)
+            if analyzer.profiler is not None:
+                self.merge_profiles(analyzer)
+
+    def prepare_configs(self) -> Dict[Tuple[int, int], AlgorithmAnalyzer]:
+        """
+        Create the directory, the checkpoint and the headless analyzer of every config.
+
+        Returns:
+            Dict[Tuple[int, int], AlgorithmAnalyzer]: The analyzers, keyed by (size, cell_open_percentage).
+        """
+        analyzers = {}
+        for size in self.sizes:
+            for pct in self.cell_open_percentages:
+                directory = config_directory(size, pct, self.root)
+                if self.fresh and os.path.exists(directory):
+                    shutil.rmtree(directory)
+                os.makedirs(directory, exist_ok=True)
+                analyzer = create_analyzer(size, pct, self.analyzer_kwargs, self.root)
+                analyzer.open_checkpoint()
+                parts_directory = os.path.join(directory, PARTS_DIRECTORY)
+                # Part files of an interrupted run hold checkpointed units that were not merged yet
+                if not analyzer.resumed and os.path.exists(parts_directory):
+                    shutil.rmtree(parts_directory)
+                os.makedirs(parts_directory, exist_ok=True)
+                self.start_summary(analyzer)
+                analyzers[(size, pct)] = analyzer
+        return analyzers
+
+    def start_summary(self, analyzer: AlgorithmAnalyzer) -> None:
+        """
+        Create the aggregator of the running summary, fed with the rows a resumed config already has.
+
+        Args:
+            analyzer (AlgorithmAnalyzer): The headless analyzer of the config.
+        """
+        analyzer.aggregator = OnlineAggregator(analyzer.results_header)
+        if not analyzer.resumed:
+            return
+        if os.path.exists(analyzer.filename):
+            for row in load_results(analyzer.filename)[analyzer.results_header].itertuples(index=False, name=None):
+                analyzer.aggregator.add(row)
+        for record in self.read_parts(analyzer).values():
+            analyzer.aggregator.add(record[1:])
+
+    def record_unit(self, analyzer: AlgorithmAnalyzer, iteration: int, names: List[str],
+                    rows: List[Tuple[Any, ...]]) -> None:
+        """
+        Record a finished work unit in the checkpoint and the running summary, written every SUMMARY_INTERVAL.
+
+        Args:
+            analyzer (AlgorithmAnalyzer): The headless analyzer of the config.
+            iteration (int): Iteration of the work unit.
+            names (List[str]): Names of the algorithms that finished on it.
+            rows (List[Tuple[Any, ...]]): Result rows of the work unit.
+        """
+        analyzer.checkpoint.record([(iteration, names)])
+        for row in rows:
+            analyzer.aggregator.add(row)
+        if time.perf_counter() - analyzer.summary_written >= SUMMARY_INTERVAL:
+            analyzer.write_summary()
+
+    def execute(self, units: List[Tuple[int, int, int, List[str]]],
+                analyzers: Dict[Tuple[int, int], AlgorithmAnalyzer]) -> None:
+        """
+        Run the work units on the process pool, every worker generates the mazes of its own units.
+
+        Args:
+            units (List[Tuple[int, int, int, List[str]]]): Pending (size, cell_open_percentage, iteration, algorithm
+                                                           names) work units.
+            analyzers (Dict[Tuple[int, int], AlgorithmAnalyzer]): Analyzers of the configs, recording the finished
+                                                                  units in their checkpoints.
+        """
+        self.logger.info(f"Running {len(units)} work units on {self.workers} worker processes...")
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(run_work_unit, size, pct, i, names, self.analyzer_kwargs, self.root)
+                       for size, pct, i, names in units]
+            for done, future in enumerate(as_completed(futures), start=1):
+                size, pct, iteration, names, rows = future.result()
+                self.record_unit(analyzers[(size, pct)], iteration, names, rows)
+                if not done % 100:
+                    self.logger.info(f"{done}/{len(units)} work units done")
+
+    def merge_results(self, analyzer: AlgorithmAnalyzer) -> None:
+        """
+        Merge the worker part files of a config into its results file in serial run order.
+
+        Only checkpointed work units are merged, once each, and they are appended to the results of a resumed config.
+
+        Args:
+            analyzer (AlgorithmAnalyzer): The headless analyzer of the config.
+        """
+        records = self.read_parts(analyzer)
+        algorithm_order = {name: index for index, name in enumerate(ALGORITHMS)}
+        analyzer.create_results_sink(append=analyzer.resumed)
+        rows = [records[key][1:] for key in sorted(records, key=lambda key: (key[0], algorithm_order[key[1]]))]
+        analyzer.results_sink.extend(rows)
+        analyzer.results_sink.close()
+        # The analysis summarizes the aggregated rows instead of reading the merged file back
+        for row in rows:
+            analyzer.aggregator.add(row)
+        shutil.rmtree(os.path.join(analyzer.directory, PARTS_DIRECTORY))
+
+    @staticmethod
+    def read_parts(analyzer: AlgorithmAnalyzer) -> Dict[Tuple[int, str], List[Any]]:
+        """
+        Read the checkpointed records of the worker part files of a config, once each.
+
+        Args:
+            analyzer (AlgorithmAnalyzer): The headless analyzer of the config.
+
+        Returns:
+            Dict[Tuple[int, str], List[Any]]: Iteration and result row of every record, keyed by (iteration, algorithm
+                                              name).
+        """
+        parts_directory = os.path.join(analyzer.directory, PARTS_DIRECTORY)
+        column_types = [COLUMN_TYPES[column] for column in [ITERATION_COLUMN, *analyzer.results_header]]
+        records = {}
+        for part in os.listdir(parts_directory):
+            if not part.endswith('.csv'):
+                continue
+            with open(os.path.join(parts_directory, part), newline='') as file:
+                reader = csv.reader(file)
+                next(reader)
+                for record in reader:
+                    record = [cast(value) for cast, value in zip(column_types, record)]
+                    key = (record[0], record[1])
+                    if key in analyzer.checkpoint.completed and key not in records:
+                        records[key] = record
+        return records
+
+    def merge_profiles(self, analyzer: AlgorithmAnalyzer) -> None:
+        """
+        Merge the worker profiles of a config and write them next to the profile of its analysis.
+
+        Args:
+            analyzer (AlgorithmAnalyzer): The headless analyzer of the config.
+        """
+        profiles_directory = os.path.join(analyzer.directory, PROFILES_DIRECTORY)
+        parts_directory = os.path.join(profiles_directory, PARTS_DIRECTORY)
+        analyzer.profiler.dump(profiles_directory)
+        if os.path.exists(parts_directory):
+            merge_profiles(parts_directory, profiles_directory)
+            shutil.rmtree(parts_directory)
@@ -0,0 +1,484 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from statistics import quantiles
+from typing import Any, Dict, List, Optional, Tuple
+from enums.tie_breaking import TieBreaking as tie_breaking
+from grid import Grid
+from logger import ProjectLogger
+from main import ALGORITHMS, maze_seed
+from online_stats import Reservoir, RESERVOIR_SIZE
+from utils import reset_grid
+
+SOCKET_PATH = "path_service.sock"
+BATCH_SIZE = 32
+# Seconds the batcher waits for more queries to arrive together with the first one
+BATCH_WINDOW = 0.002
+LATENCY_PERCENTILES = (50, 95, 99)
+
+# Grids rebuilt by a worker process from shared memory, keyed by the name of the block
+_worker_grids: Dict[str, Grid] = {}
+
+
+def generate_grid(size: int, cell_open_percentage: int, seed: int = 0) -> Tuple[int, bytes, int, int]:
+    """
+    Generate the maze of a config, the same maze as the first iteration of a sweep with the same seed.
+
+    Args:
+        size (int): Maze size, raised to the next odd number like AlgorithmAnalyzer does.
+        cell_open_percentage (int): The percentage of opened passages to complicate maze.
+        seed (int): Seed of the sweep.
+
+    Returns:
+        Tuple[int, bytes, int, int]: Number of rows, followed by the maze from Grid.to_arrays.
+    """
+    rows = size if size % 2 else size + 1
+    random.seed(maze_seed(rows, cell_open_percentage, 0, seed))
+    return (rows, *Grid(rows, 1, cell_open_percentage).to_arrays())
+
+
+def attach_grid(name: str, rows: int, start: int, end: int) -> Grid:
+    """
+    Rebuild a grid from its shared memory block, once per worker process.
+
+    Args:
+        name (str): Name of the shared memory block holding the maze weights.
+        rows (int): Number of rows of the maze.
+        start (int): Cell index of the start spot.
+        end (int): Cell index of the end spot.
+
+    Returns:
+        Grid: The grid, cached for the following batches.
+    """
+    grid = _worker_grids.get(name)
+    if grid is None:
+        memory = SharedMemory(name=name)
+        try:
+            maze = bytes(memory.buf[:rows * rows])
+        finally:
+            memory.close()
+        grid = _worker_grids[name] = Grid(rows, 1, arrays=(maze, start, end))
+    return grid
+
+
+def solve_batch(name: str, rows: int, start: int, end: int,
+                queries: List[Tuple[str, int, int]]) -> List[Dict[str, Any]]:
+    """
+    Answer a batch of path queries on a single grid, run in the worker processes.
+
+    Args:
+        name (str): Name of the shared memory block of the grid.
+        rows (int): Number of rows of the maze.
+        start (int): Cell index of the grid's start spot.
+        end (int): Cell index of the grid's end spot.
+        queries (List[Tuple[str, int, int]]): Algorithm name, start and end cell index of every query.
+
+    Returns:
+        List[Dict[str, Any]]: Path, path cost, number of searched cells and search time of every query.
+    """
+    grid = attach_grid(name, rows, start, end)
+    results = []
+    for algorithm_name, query_start, query_end in queries:
+        start_spot = grid.grid_maze[query_start // rows][query_start % rows]
+        end_spot = grid.grid_maze[query_end // rows][query_end % rows]
+        time_start = time.perf_counter_ns()
+        path, visited = ALGORITHMS[algorithm_name](grid.grid_maze, start_spot, end_spot, draw_updates=False,
+                                                   window_mode=False, tie_breaking=tie_breaking.FIFO)
+        search_time = time.perf_counter_ns() - time_start
+        results.append({
+            'path': [[spot.row, spot.col] for spot in path],
+            'path_cost': sum(spot.spot_value for spot in path),
+            'searched_cells': len(visited),
+            'search_ms': search_time / 1e6,
+        })
+        reset_grid(grid.grid_maze, window_mode=False)
+    return results
+
+
+class PathService(ProjectLogger):
+    def __init__(self, workers: Optional[int] = None, batch_size: int = BATCH_SIZE,
+                 batch_window: float = BATCH_WINDOW):
+        """
+        Initialize the PathService, answering path queries on grids kept in memory.
+
+        Grids are generated once, their weights are put in shared memory and every worker process rebuilds a grid
+        on its first query. Queries are JSON lines, those arriving together are batched per grid into one task of
+        the process pool.
+
+        Args:
+            workers (Optional[int]): Number of worker processes. Defaults to one per core.
+            batch_size (int): Maximal number of queries of a batch.
+            batch_window (float): Seconds a batch waits for more queries after its first one, 0 batches only the
+                                  queries already waiting.
+        """
+        super().__init__()
+        self.workers = workers or os.cpu_count()
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.executor = None
+        self.queue: Optional[asyncio.Queue] = None
+        self.slots: Optional[asyncio.Semaphore] = None
+        self.batcher: Optional[asyncio.Task] = None
+        self.grids: Dict[str, Dict[str, Any]] = {}
+        self.loading: Dict[str, asyncio.Future] = {}
+        self.latencies = Reservoir(RESERVOIR_SIZE)
+        self.queries = 0
+        self.batches = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.started = time.perf_counter()
+
+    async def start(self, socket_path: str = SOCKET_PATH, port: Optional[int] = None) -> asyncio.AbstractServer:
+        """
+        Start the worker pool, the batcher and the server.
+
+        Args:
+            socket_path (str): Path of the Unix socket.
+            port (Optional[int]): Listen on this localhost TCP port instead of the Unix socket.
+
+        Returns:
+            asyncio.AbstractServer: The started server.
+        """
+        # Workers attaching to the grids have to share the parent's tracker, their own would unlink the blocks on exit
+        resource_tracker.ensure_running()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(self.workers)
+        self.batcher = asyncio.create_task(self.run_batches())
+        if port is not None:
+            server = await asyncio.start_server(self.handle_client, '127.0.0.1', port)
+        else:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle_client, socket_path)
+        self.logger.info(f"Path service listening on {port if port is not None else socket_path} "
+                         f"with {self.workers} workers")
+        return server
+
+    async def close(self) -> None:
+        """
+        Stop the batcher and the worker pool and release the shared memory of the grids.
+        """
+        if self.batcher is not None:
+            self.batcher.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        for grid in self.grids.values():
+            grid['memory'].close()
+            grid['memory'].unlink()
+        self.grids.clear()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the JSON-line requests of a connection, pipelined requests are answered as they finish.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's reader.
+            writer (asyncio.StreamWriter): The connection's writer.
+        """
+        lock = asyncio.Lock()
+        pending = set()
+        while line := await reader.readline():
+            task = asyncio.create_task(self.respond(line, writer, lock))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        await asyncio.gather(*pending)
+        writer.close()
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        """
+        Answer a single request, its 'id' is echoed so pipelining clients can match the responses.
+
+        Args:
+            line (bytes): The JSON request.
+            writer (asyncio.StreamWriter): The connection's writer.
+            lock (asyncio.Lock): Serializes the responses of the connection.
+        """
+        message = {}
+        try:
+            message = json.loads(line)
+            response = await self.dispatch(message)
+        except Exception as error:
+            # Bad requests and failed searches are answered, the service keeps running
+            response = {'error': f"{type(error).__name__}: {error}"}
+        if 'id' in message:
+            response['id'] = message['id']
+        async with lock:
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+    async def dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Route a request by its 'op': 'load' a grid, query a 'path' or get the 'stats'.
+
+        Args:
+            message (Dict[str, Any]): The request.
+
+        Returns:
+            Dict[str, Any]: The response.
+
+        Raises:
+            ValueError: If the op is unknown.
+        """
+        op = message.get('op')
+        if op == 'load':
+            return await self.load_grid(int(message['size']), int(message.get('open_pct', 0)),
+                                        int(message.get('seed', 0)))
+        if op == 'path':
+            return await self.query(message)
+        if op == 'stats':
+            return self.metrics()
+        raise ValueError(f"Unknown op {op!r}, expected load, path or stats.")
+
+    async def load_grid(self, size: int, cell_open_percentage: int, seed: int = 0) -> Dict[str, Any]:
+        """
+        Generate a grid in a worker and put it in shared memory, concurrent loads of a grid wait for the same one.
+
+        Args:
+            size (int): Maze size.
+            cell_open_percentage (int): The percentage of opened passages to complicate maze.
+            seed (int): Seed of the maze, see generate_grid.
+
+        Returns:
+            Dict[str, Any]: Id, rows and start and end spots of the grid.
+        """
+        grid_id = f"size{size}_pct{cell_open_percentage}_seed{seed}"
+        if grid_id not in self.grids:
+            if grid_id not in self.loading:
+                self.loading[grid_id] = asyncio.ensure_future(
+                    asyncio.get_running_loop().run_in_executor(self.executor, generate_grid, size,
+                                                               cell_open_percentage, seed))
+            try:
+                rows, maze, start, end = await self.loading[grid_id]
+            except Exception:
+                self.loading.pop(grid_id, None)
+                raise
+            if grid_id not in self.grids:
+                memory = SharedMemory(create=True, size=len(maze))
+                memory.buf[:len(maze)] = maze
+                self.grids[grid_id] = {'memory': memory, 'rows': rows, 'start': start, 'end': end}
+                self.loading.pop(grid_id)
+        grid = self.grids[grid_id]
+        return {'grid': grid_id, 'rows': grid['rows'], 'start': divmod(grid['start'], grid['rows']),
+                'end': divmod(grid['end'], grid['rows'])}
+
+    async def query(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a path query for the batcher and wait for its answer.
+
+        Args:
+            message (Dict[str, Any]): The 'grid' id, optional 'algorithm' (defaults to A*) and optional [row, col]
+                                      'start' and 'end' (default to the grid's own).
+
+        Returns:
+            Dict[str, Any]: Path as [row, col] cells, path cost, searched cells and search time.
+
+        Raises:
+            KeyError: If the grid is not loaded.
+            ValueError: If the algorithm is unknown or a cell is outside the grid.
+        """
+        grid = self.grids.get(message['grid'])
+        if grid is None:
+            raise KeyError(f"Grid {message['grid']} is not loaded.")
+        algorithm_name = message.get('algorithm', 'A*')
+        if algorithm_name not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm_name}, expected one of {', '.join(ALGORITHMS)}.")
+        rows = grid['rows']
+        cells = []
+        for key in ('start', 'end'):
+            if message.get(key) is None:
+                cells.append(grid[key])
+                continue
+            row, col = message[key]
+            if not (0 <= row < rows and 0 <= col < rows):
+                raise ValueError(f"{key} cell {row}, {col} is outside the {rows}x{rows} grid.")
+            cells.append(row * rows + col)
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((message['grid'], (algorithm_name, *cells), future, time.perf_counter()))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    async def run_batches(self) -> None:
+        """
+        Take the waiting queries in batches, once a worker is free, and send every batch to the process pool.
+        """
+        while True:
+            await self.slots.acquire()
+            batch = [await self.queue.get()]
+            if self.batch_window and self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            asyncio.create_task(self.solve(batch))
+
+    async def solve(self, batch: List[Tuple[str, Tuple[str, int, int], asyncio.Future, float]]) -> None:
+        """
+        Solve a batch, one pool task per grid, and resolve the futures of its queries.
+
+        Args:
+            batch (List[Tuple[str, Tuple[str, int, int], asyncio.Future, float]]): Grid id, query, future and
+                                                                                   arrival time of every query.
+        """
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            groups = defaultdict(list)
+            for item in batch:
+                groups[item[0]].append(item)
+            tasks = []
+            for grid_id, items in groups.items():
+                grid = self.grids[grid_id]
+                tasks.append(loop.run_in_executor(self.executor, solve_batch, grid['memory'].name, grid['rows'],
+                                                  grid['start'], grid['end'], [query for _, query, _, _ in items]))
+            for items, results in zip(groups.values(), await asyncio.gather(*tasks, return_exceptions=True)):
+                for index, (_, _, future, arrived) in enumerate(items):
+                    if future.done():
+                        continue
+                    if isinstance(results, BaseException):
+                        future.set_exception(results)
+                    else:
+                        future.set_result(results[index])
+                    self.latencies.add((time.perf_counter() - arrived) * 1e3)
+            self.queries += len(batch)
+            self.batches += 1
+        finally:
+            self.in_flight -= 1
+            self.slots.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Report the load of the service.
+
+        Returns:
+            Dict[str, Any]: Loaded grids, current and maximal queue depth, batches in flight, answered queries,
+            batches and their mean size, and the latency percentiles in ms from arrival to answer.
+        """
+        latencies = {}
+        if len(self.latencies.values) > 1:
+            cut_points = quantiles(self.latencies.values, n=100, method='inclusive')
+            latencies = {f"p{percentile}": cut_points[percentile - 1] for percentile in LATENCY_PERCENTILES}
+        return {
+            'grids': list(self.grids),
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'max_queue_depth': self.max_queue_depth,
+            'in_flight_batches': self.in_flight,
+            'queries': self.queries,
+            'batches': self.batches,
+            'mean_batch_size': self.queries / self.batches if self.batches else 0.0,
+            'latency_ms': latencies,
+            'uptime_s': time.perf_counter() - self.started,
+        }
+
+
+class PathClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Initialize the PathClient, sending one request at a time over a connection to the service.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's reader.
+            writer (asyncio.StreamWriter): The connection's writer.
+        """
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, socket_path: str = SOCKET_PATH, port: Optional[int] = None) -> 'PathClient':
+        """
+        Connect to the service.
+
+        Args:
+            socket_path (str): Path of the service's Unix socket.
+            port (Optional[int]): Connect to this localhost TCP port instead of the Unix socket.
+
+        Returns:
+            PathClient: The connected client.
+        """
+        if port is not None:
+            return cls(*await asyncio.open_connection('127.0.0.1', port))
+        return cls(*await asyncio.open_unix_connection(socket_path))
+
+    async def request(self, **message: Any) -> Dict[str, Any]:
+        """
+        Send a request and wait for its response.
+
+        Args:
+            message (Any): The request fields, like op='path' and grid.
+
+        Returns:
+            Dict[str, Any]: The response.
+
+        Raises:
+            RuntimeError: If the service answered with an error.
+        """
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    async def close(self) -> None:
+        """
+        Close the connection.
+        """
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """
+    Run the service until it is interrupted, preloading the requested grids.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+    """
+    service = PathService(args.workers, args.batch_size, args.batch_window)
+    server = await service.start(args.socket, args.port)
+    try:
+        for size in args.preload:
+            for pct in args.open_pcts:
+                service.logger.info(f"Loaded {await service.load_grid(size, pct, args.seed)}")
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the listening address and the pool options from the command line.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Serve path queries on in-memory mazes over a Unix socket, one "
+                                                 "JSON object per line: {\"op\": \"load\", \"size\": 161, "
+                                                 "\"open_pct\": 5}, {\"op\": \"path\", \"grid\": ID, \"algorithm\": "
+                                                 "\"A*\", \"start\": [row, col], \"end\": [row, col]} or "
+                                                 "{\"op\": \"stats\"}.")
+    parser.add_argument('--socket', default=SOCKET_PATH, help='Path of the Unix socket.')
+    parser.add_argument('--port', type=int, default=None, help='Listen on this localhost TCP port instead.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of worker processes.')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Maximal number of queries of a batch.')
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW,
+                        help='Seconds a batch waits for more queries.')
+    parser.add_argument('--preload', type=int, nargs='*', default=[], help='Maze sizes to generate at start-up.')
+    parser.add_argument('--open-pcts', type=int, nargs='+', default=[5], help='Open percentages of preloaded mazes.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the preloaded mazes.')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_arguments()))
+    except KeyboardInterrupt:
+        pass
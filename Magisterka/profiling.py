@@ -0,0 +1,146 @@
+import cProfile
+import os
+import pstats
+import re
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+PROFILES_DIRECTORY = "profiles"
+WORKER_SUFFIX = ".worker_"
+MAX_STACK_DEPTH = 64
+# Stack branches below the resolution of the collapsed stack file (1 us) are dropped, wide caller graphs would explode
+MIN_STACK_TIME = 5e-7
+
+
+def profile_filename(label: str) -> str:
+    """
+    Build a file name for a profile label, algorithm names like 'BA*' are not valid file names everywhere.
+
+    Args:
+        label (str): Algorithm name or profiled stage.
+
+    Returns:
+        str: File name without extension.
+    """
+    return re.sub(r'[^\w-]', '_', label.replace('*', '_star'))
+
+
+def frame_name(func: Tuple[str, int, str]) -> str:
+    """
+    Format a pstats function key as a collapsed stack frame.
+
+    Args:
+        func (Tuple[str, int, str]): File name, line number and function name.
+
+    Returns:
+        str: The frame, without the ';' frame separator.
+    """
+    filename, line, name = func
+    if filename == '~':
+        return name.replace(';', ':')
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(';', ':')
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """
+    Rebuild collapsed stacks, the flame graph input format, from the caller graph of a profile.
+
+    cProfile only keeps caller-callee pairs, so the own time of a function is split between its callers by the time
+    spent under each of them, and the same split is repeated up to the roots of the graph.
+
+    Args:
+        stats (pstats.Stats): The profile.
+
+    Returns:
+        Dict[str, int]: Own time in microseconds, keyed by the ';' separated stack from the root.
+    """
+    raw = stats.stats
+    folded: Dict[str, float] = defaultdict(float)
+
+    def walk(func: Tuple[str, int, str], stack: List[str], weight: float, seen: frozenset) -> None:
+        if weight < MIN_STACK_TIME:
+            return
+        _, _, _, cumulative_time, callers = raw[func]
+        parents = [(caller, timings[3]) for caller, timings in callers.items() if caller in raw and caller not in seen]
+        total = sum(time_under for _, time_under in parents)
+        if not parents or total <= 0 or len(stack) >= MAX_STACK_DEPTH:
+            folded[';'.join(reversed(stack))] += weight
+            return
+        for caller, time_under in parents:
+            walk(caller, stack + [frame_name(caller)], weight * time_under / total, seen | {caller})
+
+    for func, (_, _, own_time, _, callers) in raw.items():
+        if own_time > 0:
+            walk(func, [frame_name(func)], own_time, frozenset([func]))
+    return {stack: round(weight * 1e6) for stack, weight in folded.items() if round(weight * 1e6) > 0}
+
+
+def write_profile(stats: pstats.Stats, base_path: str) -> None:
+    """
+    Write a profile as a pstats file and as a collapsed stack file for flame graph tools.
+
+    Args:
+        stats (pstats.Stats): The profile.
+        base_path (str): Path of the files without extension.
+    """
+    stats.dump_stats(base_path + '.pstats')
+    with open(base_path + '.folded', mode='w') as file:
+        for stack, weight in sorted(collapsed_stacks(stats).items()):
+            file.write(f"{stack} {weight}\n")
+
+
+def merge_profiles(parts_directory: str, directory: str) -> None:
+    """
+    Merge the per worker pstats files of every label into a single profile.
+
+    Args:
+        parts_directory (str): Directory of the worker profiles.
+        directory (str): Directory of the merged profiles.
+    """
+    parts = defaultdict(list)
+    for part in sorted(os.listdir(parts_directory)):
+        if part.endswith('.pstats') and WORKER_SUFFIX in part:
+            parts[part.split(WORKER_SUFFIX)[0]].append(os.path.join(parts_directory, part))
+    for name, paths in parts.items():
+        write_profile(pstats.Stats(*paths), os.path.join(directory, name))
+
+
+class AlgorithmProfiler:
+    def __init__(self):
+        """
+        Initialize the AlgorithmProfiler, deterministic profiles of the analyzer stages aggregated across iterations.
+        """
+        self.profiles: Dict[str, cProfile.Profile] = {}
+
+    def run(self, label: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a function under the profile of the label.
+
+        Args:
+            label (str): Algorithm name or profiled stage, calls with the same label are aggregated.
+            func (Callable[..., Any]): The profiled function.
+            args (Any): Positional arguments of the function.
+            kwargs (Any): Keyword arguments of the function.
+
+        Returns:
+            Any: The result of the function.
+        """
+        profile = self.profiles.setdefault(label, cProfile.Profile())
+        return profile.runcall(func, *args, **kwargs)
+
+    def dump(self, directory: str, suffix: str = '') -> None:
+        """
+        Write a pstats and a collapsed stack file for every label.
+
+        Args:
+            directory (str): Directory of the profiles.
+            suffix (str): Appended to the file names, keeps the profiles of worker processes apart.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for label, profile in self.profiles.items():
+            base_path = os.path.join(directory, profile_filename(label) + suffix)
+            if suffix:
+                # Worker profiles are only merged by the parent, the collapsed stacks are built from the merged one
+                pstats.Stats(profile).dump_stats(base_path + '.pstats')
+            else:
+                write_profile(pstats.Stats(profile), base_path)
@@ -0,0 +1,71 @@
+import pandas as pd
+
+SUMMARY_FILENAME = "summary.csv"
+
+# Custom weights emphasizing path cost and searched cells percentage
+WEIGHTS = {
+    'exec_time': 0.2,
+    'searched_cells': 0.40,
+    'path_cost': 0.40,
+}
+
+# Summary names of the results columns, the other columns are averaged as 'avg_<snake_case name>'
+AVERAGE_COLUMNS = {
+    "Execution Time (ms)": 'avg_exec_time',
+    "Total Path Cost": 'avg_path_cost',
+    "Peak Memory (KiB)": 'avg_peak_memory',
+}
+
+
+def summary_column(column: str) -> str:
+    """
+    Get the summary column holding the average of a results column.
+
+    Args:
+        column (str): Name of the results column.
+
+    Returns:
+        str: Name of the summary column.
+    """
+    return AVERAGE_COLUMNS.get(column, 'avg_' + column.lower().replace(' ', '_'))
+
+
+def rank_algorithms(summary: pd.DataFrame, memory_weight: float = 0.0) -> pd.DataFrame:
+    """
+    Score and rank the algorithms of a config summary.
+
+    The overall score is the product of the weighted averages of execution time, searched cells and path cost, and
+    of the peak memory raised to its weight when it was measured. A constant factor would scale every algorithm
+    alike, the exponent is what lets the memory weight shift the ranking. The score is normalized to the best
+    algorithm as 100%.
+
+    Args:
+        summary (pd.DataFrame): One row per algorithm with the averaged metrics.
+        memory_weight (float): Exponent of the peak memory in the overall score, 1 counts it like the other metrics,
+                               larger values favour frugal algorithms and 0 leaves it out of the ranking.
+
+    Returns:
+        pd.DataFrame: The summary with overall_performance and overall_rank, best algorithm first.
+    """
+    weights = {**WEIGHTS, 'memory': memory_weight}
+    summary = summary.copy()
+
+    # Calculate overall score by multiplying all weighted metrics together
+    overall_score = (
+            summary['avg_exec_time'] * weights['exec_time'] *
+            summary['avg_searched_cells'] * weights['searched_cells'] *
+            summary['avg_path_cost'] * weights['path_cost']
+    )
+    # The weight is an exponent, a zero weight makes the factor 1 and leaves the memory out
+    if 'avg_peak_memory' in summary.columns and weights['memory']:
+        overall_score *= summary['avg_peak_memory'] ** weights['memory']
+
+    # Normalize the overall score to convert it into a percentage (best score as 100%)
+    summary['overall_performance'] = round((overall_score.min() / overall_score) * 100, 2)
+
+    # Sort by overall performance (higher percentages are better)
+    summary = summary.sort_values('overall_performance', ascending=False)
+
+    # Rank the algorithms based on the sorted overall performance (1 for best performance)
+    summary['overall_rank'] = summary['overall_performance'].rank(ascending=False, method='min')
+    return summary
@@ -0,0 +1,176 @@
+import time
+from typing import List, Optional, TYPE_CHECKING
+from enums.colors import Colors as colors
+from spot import FIXED, STATE_COLORS, WEIGHT_COLORS
+
+# pygame and numpy are imported on the first draw, headless searches never load them
+if TYPE_CHECKING:
+    import pygame
+    from spot import Spot
+
+TARGET_FPS = 60
+# Palette of the color-index array, a color's index is its position in Colors
+PALETTE = list(colors)
+
+
+class RenderQueue:
+    def __init__(self, fps: Optional[int] = TARGET_FPS):
+        """
+        Initialize the RenderQueue, the dirty rectangles drawn since the last display update.
+
+        The searches draw their cells on the window surface and queue the changed rectangles, the display is only
+        updated with them once per frame, so a search never waits for a full-screen update after every cell.
+
+        Args:
+            fps (Optional[int]): Maximal display updates per second, None updates after every queued rectangle.
+        """
+        self.dirty: List['pygame.Rect'] = []
+        self.interval = 1 / fps if fps else 0.0
+        self.flushed = 0.0
+
+    def add(self, rect: 'pygame.Rect') -> None:
+        """
+        Queue a changed rectangle, the display is updated once a frame interval passed since the last update.
+
+        Args:
+            rect (pygame.Rect): The changed area of the window surface.
+        """
+        self.dirty.append(rect)
+        if time.perf_counter() - self.flushed >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Update the display with all queued rectangles and keep the window responsive.
+        """
+        if not self.dirty:
+            return
+        import pygame
+
+        pygame.display.update(self.dirty)
+        pygame.event.pump()
+        self.dirty = []
+        self.flushed = time.perf_counter()
+
+    def discard(self) -> None:
+        """
+        Drop the queued rectangles, used after a full-screen update already showed them.
+        """
+        self.dirty = []
+        self.flushed = time.perf_counter()
+
+
+class GridRenderer:
+    def __init__(self):
+        """
+        Initialize the GridRenderer, drawing the whole grid from a color-index array in one blit.
+
+        The array holds the palette index of every spot, it is mapped through the palette to an RGB array of one
+        pixel per spot, which pygame.surfarray turns into a surface that is scaled by the cell gap onto the window.
+        It is built from all spots once per maze and then kept up to date by the drawn spots and the grid resets, so
+        a redraw only maps it through the palette.
+        """
+        self.indices = None
+        # Indices of the maze without the search states, restored by reset
+        self.base = None
+        self.palette = None
+        self.state_table = None
+        self.weight_table = None
+        self.supported: Optional[bool] = None
+
+    def load(self) -> bool:
+        """
+        Build the palette and the lookup tables on first use.
+
+        Returns:
+            bool: False if numpy or pygame.surfarray is missing, the grid is then drawn spot by spot.
+        """
+        if self.supported is None:
+            try:
+                import numpy as np
+                import pygame.surfarray  # noqa: F401, needs numpy
+            except ImportError:
+                self.supported = False
+                return False
+            index = {color: position for position, color in enumerate(PALETTE)}
+            self.palette = np.array([color.value for color in PALETTE], dtype=np.uint8)
+            self.state_table = np.full(max(STATE_COLORS) + 1, index[colors.WHITE_1], dtype=np.uint8)
+            for state, color in STATE_COLORS.items():
+                self.state_table[state] = index[color]
+            self.weight_table = np.full(max(WEIGHT_COLORS) + 2, index[colors.WHITE_1], dtype=np.uint8)
+            for weight, color in WEIGHT_COLORS.items():
+                self.weight_table[weight] = index[color]
+            self.supported = True
+        return self.supported
+
+    def update(self, grid: List[List['Spot']]) -> None:
+        """
+        Rebuild the color-index array from the states and weights of the spots, needed for a new maze or after a
+        search that did not draw its spots.
+
+        Args:
+            grid (List[List[Spot]]): The grid of spots, grid[row][col].
+        """
+        import numpy as np
+
+        shape = (len(grid), len(grid[0]))
+        states = np.fromiter((spot.state for row in grid for spot in row), dtype=np.int64,
+                             count=shape[0] * shape[1]).reshape(shape)
+        weights = np.fromiter((spot.spot_value for row in grid for spot in row), dtype=np.int64,
+                              count=shape[0] * shape[1]).reshape(shape)
+        # Weights without a color of their own fall into the last, default entry
+        weights = np.minimum(weights, len(self.weight_table) - 1)
+        self.indices = np.where(states, self.state_table[states], self.weight_table[weights])
+        fixed = states & FIXED
+        self.base = np.where(fixed, self.state_table[fixed], self.weight_table[weights])
+
+    def set_spot(self, spot: 'Spot') -> None:
+        """
+        Update the color index of a drawn spot.
+
+        Args:
+            spot (Spot): The spot whose state changed.
+        """
+        if self.indices is None:
+            return
+        if spot.state:
+            index = self.state_table[spot.state]
+        else:
+            index = self.weight_table[min(spot.spot_value, len(self.weight_table) - 1)]
+        self.indices[spot.row, spot.col] = index
+
+    def reset(self) -> None:
+        """
+        Restore the color indices of the maze after its spots were reset.
+        """
+        if self.base is not None:
+            self.indices = self.base.copy()
+
+    def draw(self, win: 'pygame.Surface', grid: List[List['Spot']], rebuild: bool = True) -> bool:
+        """
+        Draw the whole grid on the window surface in one blit, the display is updated by the caller.
+
+        Args:
+            win (pygame.Surface): The window surface to draw on.
+            grid (List[List[Spot]]): The grid of spots.
+            rebuild (bool): Rebuild the color-index array from the spots, otherwise it is drawn as kept up to date.
+
+        Returns:
+            bool: False if the array renderer is unavailable and nothing was drawn.
+        """
+        if not self.load():
+            return False
+        import pygame
+
+        if rebuild or self.indices is None or self.indices.shape != (len(grid), len(grid[0])):
+            self.update(grid)
+        gap = grid[0][0].geometry.width
+        # surfarray indexes pixels by [x][y], spots are drawn at x = row * gap and y = col * gap
+        surface = pygame.surfarray.make_surface(self.palette[self.indices])
+        win.blit(pygame.transform.scale(surface, (self.indices.shape[0] * gap, self.indices.shape[1] * gap)), (0, 0))
+        return True
+
+
+# The queue and the renderer of the single search window
+render_queue = RenderQueue()
+grid_renderer = GridRenderer()
@@ -0,0 +1,204 @@
+import argparse
+from typing import List, Optional, TYPE_CHECKING
+import numpy as np
+from enums.colors import Colors as colors
+from enums.trace_event import TraceEvent as trace_event
+from logger import ProjectLogger
+from rendering import PALETTE
+from search_trace import SearchTrace, EVENT_BITS
+from spot import WEIGHT_COLORS
+
+if TYPE_CHECKING:
+    import pygame
+
+REPLAY_WIDTH = 1440
+REPLAY_FPS = 60
+DEFAULT_SPEED = 500
+# Fraction of the longest trace skipped by a single seek
+SEEK_STEP = 0.05
+PANEL_MARGIN = 8
+
+# Palette index of every event kind, the colors match the live window mode
+EVENT_COLORS = {
+    trace_event.OPEN: colors.GREEN,
+    trace_event.CLOSE: colors.RED,
+    trace_event.PATH: colors.TURQUOISE,
+    trace_event.PATH_ALT: colors.LIME,
+}
+CONTROLS = "space: pause, left/right: seek, up/down: speed, home/end: jump, esc: quit"
+
+
+class TraceReplay:
+    def __init__(self, trace: SearchTrace):
+        """
+        Initialize the TraceReplay, the color-index array of a traced maze at any event position.
+
+        Args:
+            trace (SearchTrace): The recorded search.
+        """
+        index = {color: position for position, color in enumerate(PALETTE)}
+        event_table = np.zeros(1 << EVENT_BITS, dtype=np.uint8)
+        for event, color in EVENT_COLORS.items():
+            event_table[event.value] = index[color]
+        weight_table = np.full(256, index[colors.WHITE_1], dtype=np.uint8)
+        for weight, color in WEIGHT_COLORS.items():
+            weight_table[weight] = index[color]
+        weight_table[0] = index[colors.BLACK]
+
+        self.trace = trace
+        self.palette = np.array([color.value for color in PALETTE], dtype=np.uint8)
+        events = np.frombuffer(trace.events, dtype=np.uint32)
+        self.cells = (events >> EVENT_BITS).astype(np.int64)
+        self.colors = event_table[events & ((1 << EVENT_BITS) - 1)]
+        self.base = weight_table[np.frombuffer(trace.maze, dtype=np.uint8)]
+        self.fixed = (np.array([trace.start, trace.end]), np.array([index[colors.ORANGE], index[colors.PURPLE]]))
+        self.indices = self.base.copy()
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def seek(self, position: int) -> None:
+        """
+        Move the replay to an event position, forwards by applying the events in between, backwards by replaying
+        from the start.
+
+        Args:
+            position (int): Number of applied events, clamped to the trace.
+        """
+        position = max(0, min(int(position), len(self.cells)))
+        if position < self.position:
+            self.indices = self.base.copy()
+            self.position = 0
+        cells = self.cells[self.position:position]
+        if len(cells):
+            # Only the last event of a cell in the applied range decides its color
+            unique, first_reversed = np.unique(cells[::-1], return_index=True)
+            self.indices[unique] = self.colors[self.position:position][len(cells) - 1 - first_reversed]
+        self.indices[self.fixed[0]] = self.fixed[1]
+        self.position = position
+
+    def frame(self) -> np.ndarray:
+        """
+        Map the current color indices through the palette.
+
+        Returns:
+            np.ndarray: RGB array of one pixel per cell, indexed [row][col] like the spots' x and y.
+        """
+        rows = self.trace.rows
+        return self.palette[self.indices.reshape(rows, rows)]
+
+
+class ReplayViewer(ProjectLogger):
+    def __init__(self, traces: List[SearchTrace], speed: float = DEFAULT_SPEED, gap: Optional[int] = None):
+        """
+        Initialize the ReplayViewer, playing one or two search traces side by side.
+
+        Args:
+            traces (List[SearchTrace]): The traces, usually of two algorithms on the same maze.
+            speed (float): Events played per second.
+            gap (Optional[int]): Cell size in pixels. Defaults to fitting the panels into REPLAY_WIDTH.
+        """
+        super().__init__()
+        self.replays = [TraceReplay(trace) for trace in traces]
+        if any(trace.maze != traces[0].maze for trace in traces[1:]):
+            self.logger.warning('The traces were recorded on different mazes.')
+        rows = max(trace.rows for trace in traces)
+        self.gap = gap or max(1, (REPLAY_WIDTH - PANEL_MARGIN * (len(traces) - 1)) // (rows * len(traces)))
+        self.panel_width = rows * self.gap
+        self.speed = speed
+        self.position = 0.0
+        self.paused = False
+        self.length = max(len(replay) for replay in self.replays)
+
+    def run(self) -> None:
+        """
+        Open the window and play the traces until it is closed.
+        """
+        import pygame
+
+        pygame.init()
+        win = pygame.display.set_mode((len(self.replays) * (self.panel_width + PANEL_MARGIN) - PANEL_MARGIN,
+                                       self.panel_width))
+        self.logger.info(CONTROLS)
+        clock = pygame.time.Clock()
+        running = True
+        while running:
+            elapsed = clock.tick(REPLAY_FPS) / 1000
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    self.handle_key(event.key)
+            if not self.paused:
+                self.position = min(self.position + self.speed * elapsed, self.length)
+            self.draw(win)
+        pygame.quit()
+
+    def handle_key(self, key: int) -> None:
+        """
+        Apply a playback control.
+
+        Args:
+            key (int): The pressed pygame key.
+        """
+        import pygame
+
+        step = max(1.0, self.length * SEEK_STEP)
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key == pygame.K_RIGHT:
+            self.position = min(self.position + step, self.length)
+        elif key == pygame.K_LEFT:
+            self.position = max(self.position - step, 0.0)
+        elif key == pygame.K_UP:
+            self.speed *= 2
+        elif key == pygame.K_DOWN:
+            self.speed = max(1.0, self.speed / 2)
+        elif key == pygame.K_HOME:
+            self.position = 0.0
+        elif key == pygame.K_END:
+            self.position = float(self.length)
+
+    def draw(self, win: 'pygame.Surface') -> None:
+        """
+        Draw every replay at the current position and show the progress in the window caption.
+
+        Args:
+            win (pygame.Surface): The window surface.
+        """
+        import pygame
+
+        captions = []
+        for panel, replay in enumerate(self.replays):
+            replay.seek(self.position)
+            surface = pygame.surfarray.make_surface(replay.frame())
+            size = replay.trace.rows * self.gap
+            win.blit(pygame.transform.scale(surface, (size, size)), (panel * (self.panel_width + PANEL_MARGIN), 0))
+            captions.append(f"{replay.trace.algorithm_name} {replay.position}/{len(replay)}")
+        pygame.display.flip()
+        pygame.display.set_caption(f"{' | '.join(captions)} | {self.speed:g} events/s"
+                                   f"{' (paused)' if self.paused else ''}")
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the traces and the playback options from the command line.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Replay search traces recorded with --record-traces, two traces "
+                                                 "of the same maze are shown side by side. " + CONTROLS)
+    parser.add_argument('traces', nargs='+', help='Trace files, at most two.')
+    parser.add_argument('--speed', type=float, default=DEFAULT_SPEED, help='Events played per second.')
+    parser.add_argument('--gap', type=int, default=None, help='Cell size in pixels.')
+    args = parser.parse_args()
+    if len(args.traces) > 2:
+        parser.error('At most two traces can be shown side by side.')
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    ReplayViewer([SearchTrace.load(path) for path in args.traces], args.speed, args.gap).run()
@@ -0,0 +1,243 @@
+import argparse
+import html
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import matplotlib
+
+# The report is only written to files, workers and the parent never open a window
+matplotlib.use('Agg')
+
+import pandas as pd
+from matplotlib import pyplot as plt
+from logger import ProjectLogger
+from ranking import SUMMARY_FILENAME
+from scoring_and_plot import CHARTS, chart_filename, generate_charts
+
+REPORT_DIRECTORY = "report"
+INDEX_FILENAME = "index.html"
+CONFIG_PATTERN = re.compile(r"size(\d+)_open_cells_pct(\d+)$")
+
+# Cross-config line charts against the maze size: summary column, file name and axis label
+TREND_CHARTS = [
+    ('avg_exec_time', 'exec_time_vs_size', 'Average Execution Time (ms)'),
+    ('avg_searched_cells', 'searched_cells_vs_size', 'Average Searched Cells'),
+    ('avg_path_cost', 'path_cost_vs_size', 'Average Path Cost'),
+]
+# Summary columns listed in the config tables of the index
+INDEX_COLUMNS = ['overall_rank', 'Algorithm_name', 'avg_exec_time', 'median_exec_time', 'exec_time_ci_low',
+                 'exec_time_ci_high', 'avg_searched_cells', 'avg_path_cost', 'avg_peak_memory', 'overall_performance',
+                 'runs']
+
+
+def find_configs(root: str) -> List[Tuple[int, int, str]]:
+    """
+    Find the analyzed config directories below the root.
+
+    Args:
+        root (str): Directory holding the size*_open_cells_pct* config directories.
+
+    Returns:
+        List[Tuple[int, int, str]]: Maze size, open percentage and directory of every config with a summary, ordered
+                                    by open percentage and size.
+    """
+    configs = []
+    for name in os.listdir(root):
+        match = CONFIG_PATTERN.match(name)
+        directory = os.path.join(root, name)
+        if match and os.path.exists(os.path.join(directory, SUMMARY_FILENAME)):
+            configs.append((int(match.group(1)), int(match.group(2)), directory))
+    return sorted(configs, key=lambda config: (config[1], config[0]))
+
+
+def render_config(size: int, cell_open_percentage: int, directory: str) -> Tuple[int, int, List[str]]:
+    """
+    Draw the bar charts of a config from its summary, run in the worker processes.
+
+    Args:
+        size (int): Maze size of the config.
+        cell_open_percentage (int): Open percentage of the config.
+        directory (str): Directory of the config.
+
+    Returns:
+        Tuple[int, int, List[str]]: The config and the paths of its charts.
+    """
+    summary = pd.read_csv(os.path.join(directory, SUMMARY_FILENAME))
+    generate_charts(summary, False, size, cell_open_percentage, directory=directory)
+    return size, cell_open_percentage, [os.path.join(directory, chart_filename(filename, size, cell_open_percentage))
+                                        for column, filename, *_ in CHARTS if column in summary.columns]
+
+
+class ReportGenerator(ProjectLogger):
+    def __init__(self, root: str = '.', workers: Optional[int] = None, directory: Optional[str] = None,
+                 configs: Optional[List[Tuple[int, int]]] = None):
+        """
+        Initialize the ReportGenerator, the single reporting stage run once after the sweep.
+
+        Args:
+            root (str): Directory holding the analyzed config directories.
+            workers (Optional[int]): Number of processes drawing the config charts. Defaults to one per core.
+            directory (Optional[str]): Directory of the cross-config figures and the HTML index. Defaults to 'report'
+                                       inside the root.
+            configs (Optional[List[Tuple[int, int]]]): (size, cell_open_percentage) pairs to report. Defaults to
+                                                       every analyzed config in the root.
+        """
+        super().__init__()
+        self.root = root
+        self.workers = workers or os.cpu_count()
+        self.directory = directory or os.path.join(root, REPORT_DIRECTORY)
+        self.configs = configs
+
+    def run(self) -> Optional[str]:
+        """
+        Draw the charts of every config in parallel, then the cross-config figures and the HTML index.
+
+        Returns:
+            Optional[str]: Path of the HTML index, None if no config was analyzed yet.
+        """
+        configs = find_configs(self.root)
+        if self.configs is not None:
+            # Configs of earlier sweeps in the same root are left out
+            configs = [config for config in configs if config[:2] in self.configs]
+        if not configs:
+            self.logger.warning(f"No analyzed configs in {self.root}, nothing to report.")
+            return None
+        self.logger.info(f"Drawing the charts of {len(configs)} configs on {self.workers} processes...")
+        if self.workers > 1 and len(configs) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(configs))) as executor:
+                rendered = list(executor.map(render_config, *zip(*configs)))
+        else:
+            rendered = [render_config(*config) for config in configs]
+        charts = {(size, pct): paths for size, pct, paths in rendered}
+
+        os.makedirs(self.directory, exist_ok=True)
+        summaries = self.load_summaries(configs)
+        trends = self.plot_trends(summaries) + [self.plot_ranks(summaries)]
+        index = self.write_index(summaries, charts, trends)
+        self.logger.info(f"Report written to {index}")
+        return index
+
+    @staticmethod
+    def load_summaries(configs: List[Tuple[int, int, str]]) -> pd.DataFrame:
+        """
+        Concatenate the summaries of all configs.
+
+        Args:
+            configs (List[Tuple[int, int, str]]): The configs from find_configs.
+
+        Returns:
+            pd.DataFrame: Every summary row with the size and open percentage of its config.
+        """
+        summaries = []
+        for size, pct, directory in configs:
+            summary = pd.read_csv(os.path.join(directory, SUMMARY_FILENAME))
+            summary.insert(0, 'cell_open_percentage', pct)
+            summary.insert(0, 'size', size)
+            summaries.append(summary)
+        return pd.concat(summaries, ignore_index=True)
+
+    def plot_trends(self, summaries: pd.DataFrame) -> List[str]:
+        """
+        Plot every algorithm's averages against the maze size, one figure per metric and open percentage.
+
+        Args:
+            summaries (pd.DataFrame): The summaries from load_summaries.
+
+        Returns:
+            List[str]: Paths of the figures.
+        """
+        paths = []
+        figure = plt.figure(figsize=(10, 6))
+        for pct, configs in summaries.groupby('cell_open_percentage'):
+            for column, filename, label in TREND_CHARTS:
+                figure.clf()
+                for algorithm_name, group in configs.groupby('Algorithm_name'):
+                    group = group.sort_values('size')
+                    plt.plot(group['size'], group[column], marker='o', label=algorithm_name)
+                plt.xlabel('Maze Size')
+                plt.ylabel(label)
+                plt.title(f'{label} by Maze Size (Open Cells: {pct}%)')
+                plt.legend()
+                plt.tight_layout()
+                paths.append(os.path.join(self.directory, f"{filename}_open_cells_pct{pct}.png"))
+                plt.savefig(paths[-1])
+        plt.close(figure)
+        return paths
+
+    def plot_ranks(self, summaries: pd.DataFrame) -> str:
+        """
+        Plot the overall rank of every algorithm in every config as a heatmap.
+
+        Args:
+            summaries (pd.DataFrame): The summaries from load_summaries.
+
+        Returns:
+            str: Path of the figure.
+        """
+        ranks = summaries.pivot_table(index='Algorithm_name', columns=['cell_open_percentage', 'size'],
+                                      values='overall_rank')
+        figure = plt.figure(figsize=(max(6, len(ranks.columns)), max(4, len(ranks.index) * 0.5)))
+        plt.imshow(ranks.values, cmap='RdYlGn_r', aspect='auto')
+        for (row, col), rank in pd.DataFrame(ranks.values).stack().items():
+            plt.text(col, row, f"{rank:g}", ha='center', va='center')
+        plt.xticks(range(len(ranks.columns)), [f"{size} / {pct}%" for pct, size in ranks.columns], rotation=45)
+        plt.yticks(range(len(ranks.index)), ranks.index)
+        plt.xlabel('Maze Size / Open Cells')
+        plt.title('Overall Rank by Config')
+        plt.tight_layout()
+        path = os.path.join(self.directory, "overall_rank_by_config.png")
+        plt.savefig(path)
+        plt.close(figure)
+        return path
+
+    def write_index(self, summaries: pd.DataFrame, charts: Dict[Tuple[int, int], List[str]], trends: List[str]) -> str:
+        """
+        Write the static HTML index linking the cross-config figures and the tables and charts of every config.
+
+        Args:
+            summaries (pd.DataFrame): The summaries from load_summaries.
+            charts (Dict[Tuple[int, int], List[str]]): Chart paths of every config, keyed by (size, open percentage).
+            trends (List[str]): Paths of the cross-config figures.
+
+        Returns:
+            str: Path of the index.
+        """
+        def image(path: str) -> str:
+            source = html.escape(os.path.relpath(path, self.directory))
+            return f'<a href="{source}"><img src="{source}" width="480"></a>'
+
+        sections = ['<h2>All configs</h2>', *[image(path) for path in trends]]
+        for (size, pct), paths in sorted(charts.items(), key=lambda item: (item[0][1], item[0][0])):
+            summary = summaries[(summaries['size'] == size) & (summaries['cell_open_percentage'] == pct)]
+            columns = [column for column in INDEX_COLUMNS if column in summary.columns]
+            sections.append(f'<h2 id="size{size}_pct{pct}">Maze size {size}, open cells {pct}%</h2>')
+            sections.append(summary[columns].to_html(index=False, float_format=lambda value: f"{value:.4g}"))
+            sections.extend(image(path) for path in paths)
+
+        path = os.path.join(self.directory, INDEX_FILENAME)
+        with open(path, mode='w') as file:
+            file.write('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>Path finding benchmark report'
+                       '</title></head>\n<body>\n<h1>Path finding benchmark report</h1>\n'
+                       + '\n'.join(sections) + '\n</body>\n</html>\n')
+        return path
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the results root and the number of drawing processes from the command line.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Draw the charts of every analyzed config in parallel, the "
+                                                 "cross-config figures and a static HTML index.")
+    parser.add_argument('--root', default='.', help='Directory with the size*_open_cells_pct* configs.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of drawing processes.')
+    parser.add_argument('--output', default=None, help='Directory of the report, defaults to ROOT/report.')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    ReportGenerator(args.root, args.workers, args.output).run()
@@ -0,0 +1,142 @@
+import math
+import numpy as np
+from typing import Callable, Sequence, Tuple
+
+BOOTSTRAP_RESAMPLES = 2000
+CONFIDENCE = 0.95
+
+
+def median_iqr(values: Sequence[float]) -> Tuple[float, float]:
+    """
+    Calculate the median and the interquartile range of the values.
+
+    Args:
+        values (Sequence[float]): The sample.
+
+    Returns:
+        Tuple[float, float]: Median and IQR.
+    """
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    return float(median), float(q3 - q1)
+
+
+def bootstrap_ci(values: Sequence[float], statistic: Callable[..., np.ndarray] = np.median,
+                 confidence: float = CONFIDENCE, resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0) \
+        -> Tuple[float, float]:
+    """
+    Calculate the percentile bootstrap confidence interval of a statistic.
+
+    Args:
+        values (Sequence[float]): The sample.
+        statistic (Callable[..., np.ndarray]): Vectorised statistic accepting an 'axis' argument. Defaults to median.
+        confidence (float): Confidence level of the interval.
+        resamples (int): Number of bootstrap resamples.
+        seed (int): Seed of the resampling, so reports are reproducible.
+
+    Returns:
+        Tuple[float, float]: Lower and upper bound of the interval.
+    """
+    sample = np.asarray(values, dtype=float)
+    if sample.size < 2:
+        value = float(statistic(sample)) if sample.size else float('nan')
+        return value, value
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, sample.size, size=(resamples, sample.size))
+    estimates = statistic(sample[indices], axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(estimates, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def r_squared(observed: np.ndarray, predicted: np.ndarray) -> float:
+    """
+    Calculate the coefficient of determination of a fit.
+
+    Args:
+        observed (np.ndarray): Observed values.
+        predicted (np.ndarray): Values predicted by the fit.
+
+    Returns:
+        float: R², 1 for a perfect fit.
+    """
+    total = np.sum((observed - observed.mean()) ** 2)
+    if total == 0:
+        return 1.0
+    return float(1 - np.sum((observed - predicted) ** 2) / total)
+
+
+def fit_power_law(n: Sequence[float], values: Sequence[float]) -> Tuple[float, float, float]:
+    """
+    Fit values = coefficient * n ** exponent by least squares in log-log space.
+
+    Args:
+        n (Sequence[float]): Problem sizes.
+        values (Sequence[float]): Measured costs, must be positive.
+
+    Returns:
+        Tuple[float, float, float]: Exponent, coefficient and R² in log space.
+    """
+    log_n, log_values = np.log(np.asarray(n, dtype=float)), np.log(np.asarray(values, dtype=float))
+    exponent, intercept = np.polyfit(log_n, log_values, 1)
+    return float(exponent), float(np.exp(intercept)), r_squared(log_values, intercept + exponent * log_n)
+
+
+def fit_n_log_n(n: Sequence[float], values: Sequence[float]) -> Tuple[float, float]:
+    """
+    Fit values = coefficient * n * log(n) by least squares in log space, comparable with fit_power_law.
+
+    Args:
+        n (Sequence[float]): Problem sizes, larger than 1.
+        values (Sequence[float]): Measured costs, must be positive.
+
+    Returns:
+        Tuple[float, float]: Coefficient and R² in log space.
+    """
+    n = np.asarray(n, dtype=float)
+    log_model, log_values = np.log(n * np.log(n)), np.log(np.asarray(values, dtype=float))
+    log_coefficient = np.mean(log_values - log_model)
+    return float(np.exp(log_coefficient)), r_squared(log_values, log_model + log_coefficient)
+
+
+def local_exponents(n: Sequence[float], values: Sequence[float]) -> np.ndarray:
+    """
+    Calculate the log-log slope between every pair of consecutive sizes.
+
+    Args:
+        n (Sequence[float]): Increasing problem sizes.
+        values (Sequence[float]): Measured costs, must be positive.
+
+    Returns:
+        np.ndarray: One slope less than there are sizes, slope i is measured between size i and i + 1.
+    """
+    return np.diff(np.log(np.asarray(values, dtype=float))) / np.diff(np.log(np.asarray(n, dtype=float)))
+
+
+def mann_whitney_u(baseline: Sequence[float], candidate: Sequence[float]) -> Tuple[float, float]:
+    """
+    Run the two-sided Mann-Whitney U test with the tie-corrected normal approximation.
+
+    Args:
+        baseline (Sequence[float]): The first sample.
+        candidate (Sequence[float]): The second sample.
+
+    Returns:
+        Tuple[float, float]: U statistic of the candidate sample and the p-value, 1 when a sample is empty or all
+        values are tied.
+    """
+    baseline, candidate = np.asarray(baseline, dtype=float), np.asarray(candidate, dtype=float)
+    n1, n2 = baseline.size, candidate.size
+    if not n1 or not n2:
+        return float('nan'), 1.0
+    values = np.concatenate([baseline, candidate])
+    # Average ranks, tied values share the mean of the ranks they span
+    unique, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ranks = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+    u = float(ranks[n1:].sum() - n2 * (n2 + 1) / 2)
+    n = n1 + n2
+    variance = n1 * n2 / 12 * (n + 1 - np.sum(counts ** 3 - counts) / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    # Continuity correction towards the mean
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return u, float(min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2))))
@@ -0,0 +1,287 @@
+import csv
+import glob
+import importlib.util
+import json
+import os
+import platform
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+from enums.results_format import ResultsFormat as results_format
+from search_stats import STATS_HEADER
+
+# Python type of every known results column, unknown columns are stored as floats
+COLUMN_TYPES = {
+    "Iteration": int,
+    "Algorithm_name": str,
+    "Execution Time (ms)": float,
+    "Searched Cells": int,
+    "Total Path Cost": int,
+    "Peak Memory (KiB)": float,
+    "Allocated Blocks": int,
+    **{column: int for column in STATS_HEADER},
+}
+EXTENSIONS = {
+    results_format.CSV: '.csv',
+    results_format.PARQUET: '.parquet',
+    results_format.NPZ: '.npz',
+}
+METADATA_KEY = '__metadata__'
+METADATA_SUFFIX = '.meta.json'
+# Infix of the files every columnar flush writes, combined into the results file on close
+PART_INFIX = '.part'
+
+
+def resolve_format(fmt: results_format) -> results_format:
+    """
+    Resolve COLUMNAR to Parquet when pyarrow is installed and to npz otherwise.
+
+    Args:
+        fmt (results_format): Requested format.
+
+    Returns:
+        results_format: Concrete format of the file.
+    """
+    if fmt == results_format.COLUMNAR:
+        return results_format.PARQUET if importlib.util.find_spec('pyarrow') else results_format.NPZ
+    return fmt
+
+
+def environment_metadata() -> Dict[str, Any]:
+    """
+    Describe the environment the results were measured in.
+
+    Returns:
+        Dict[str, Any]: Interpreter, platform and CPU information.
+    """
+    return {
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+class ResultsSink:
+    def __init__(self, base_path: str, columns: Sequence[str], fmt: results_format = results_format.CSV,
+                 batch_size: int = 1000, metadata: Optional[Dict[str, Any]] = None, append: bool = False):
+        """
+        Initialize the ResultsSink, a buffered writer of algorithm results.
+
+        Rows are kept in memory and written in batches of 'batch_size'. CSV batches are appended to the file. Columnar
+        batches are written to part files next to it and combined into it on close, so a flush costs the same at any
+        point of a run and the flushed rows are not kept in memory. The parts left by an interrupted run are combined
+        when the file is appended to again.
+
+        Args:
+            base_path (str): Path of the results file without extension.
+            columns (Sequence[str]): Column names of the rows.
+            fmt (results_format): File format. COLUMNAR picks Parquet when pyarrow is installed and npz otherwise.
+            batch_size (int): Number of buffered rows that triggers a flush.
+            metadata (Optional[Dict[str, Any]]): Seed and config of the run, the environment is added automatically.
+            append (bool): Keep the rows of an existing file and add the new ones after them.
+        """
+        self.format = resolve_format(fmt)
+        self.base_path = base_path
+        self.path = base_path + EXTENSIONS[self.format]
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.metadata = {**(metadata or {}), 'environment': environment_metadata()}
+        self.buffer: List[Sequence[Any]] = []
+        self.parts = 0
+        append = append and os.path.exists(self.path)
+
+        if self.format == results_format.CSV:
+            if not append:
+                with open(self.path, mode='w', newline='') as file:
+                    csv.writer(file).writerow(self.columns)
+            with open(self.path + METADATA_SUFFIX, mode='w') as file:
+                json.dump(self.metadata, file, indent=2, default=str)
+        elif append:
+            self._combine_parts()
+        else:
+            for path in self._part_paths():
+                os.remove(path)
+            self._write_columnar(self.path, {column: [] for column in self.columns})
+
+    def __enter__(self) -> 'ResultsSink':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def append(self, row: Sequence[Any]) -> None:
+        """
+        Buffer a single row, flushing when the batch is full.
+
+        Args:
+            row (Sequence[Any]): Values in column order.
+        """
+        self.buffer.append(row)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def extend(self, rows: Sequence[Sequence[Any]]) -> None:
+        """
+        Buffer several rows, flushing when the batch is full.
+
+        Args:
+            rows (Sequence[Sequence[Any]]): Rows with values in column order.
+        """
+        self.buffer.extend(rows)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows to the file.
+        """
+        if not self.buffer:
+            return
+        if self.format == results_format.CSV:
+            with open(self.path, mode='a', newline='') as file:
+                csv.writer(file).writerows(self.buffer)
+        else:
+            self._write_columnar(self.base_path + f"{PART_INFIX}{self.parts:06d}" + EXTENSIONS[self.format],
+                                 dict(zip(self.columns, zip(*self.buffer))))
+            self.parts += 1
+        self.buffer = []
+
+    def close(self) -> None:
+        """
+        Flush the remaining rows and combine the columnar part files into the results file.
+        """
+        self.flush()
+        if self.parts:
+            self._combine_parts()
+
+    def _part_paths(self) -> List[str]:
+        # Zero-padded part numbers sort in flush order
+        return sorted(glob.glob(glob.escape(self.base_path) + PART_INFIX + '*' + EXTENSIONS[self.format]))
+
+    def _combine_parts(self) -> None:
+        parts = self._part_paths()
+        paths = [self.path] if os.path.exists(self.path) else []
+        self._write_columnar(self.path, concatenate_columns([read_columns(path, self.columns)
+                                                             for path in paths + parts], self.columns))
+        for path in parts:
+            os.remove(path)
+        self.parts = 0
+
+    def _write_columnar(self, path: str, columns: Dict[str, Sequence[Any]]) -> None:
+        if self.format == results_format.PARQUET:
+            self._write_parquet(path, columns)
+        else:
+            self._write_npz(path, columns)
+
+    def _write_parquet(self, path: str, columns: Dict[str, Sequence[Any]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+        schema = pa.schema([(column, arrow_types[COLUMN_TYPES.get(column, float)]) for column in self.columns],
+                           metadata={METADATA_KEY: json.dumps(self.metadata, default=str)})
+        table = pa.Table.from_arrays([pa.array(columns[field.name], type=field.type) for field in schema],
+                                     schema=schema)
+        pq.write_table(table, path)
+
+    def _write_npz(self, path: str, columns: Dict[str, Sequence[Any]]) -> None:
+        import numpy as np
+
+        numpy_types = {int: np.int64, float: np.float64, str: np.str_}
+        arrays = {column: np.asarray(columns[column], dtype=numpy_types[COLUMN_TYPES.get(column, float)])
+                  for column in self.columns}
+        arrays[METADATA_KEY] = np.asarray(json.dumps(self.metadata, default=str))
+        # np.savez appends '.npz' to paths without it, write through a file object to keep the exact name
+        with open(path, mode='wb') as file:
+            np.savez(file, **arrays)
+
+
+def read_columns(filename: str, columns: Sequence[str]) -> Dict[str, 'np.ndarray']:
+    """
+    Read the columns of a Parquet or npz results file as numpy arrays, without building a DataFrame.
+
+    Args:
+        filename (str): Path of the results file.
+        columns (Sequence[str]): Column names to read.
+
+    Returns:
+        Dict[str, np.ndarray]: The values of every column.
+    """
+    import numpy as np
+
+    if filename.endswith(EXTENSIONS[results_format.PARQUET]):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(filename, columns=list(columns))
+        return {column: np.asarray(table.column(column).to_pylist() if COLUMN_TYPES.get(column) is str
+                                   else table.column(column).to_numpy()) for column in columns}
+    with np.load(filename) as data:
+        return {column: data[column] for column in columns}
+
+
+def concatenate_columns(parts: List[Dict[str, 'np.ndarray']], columns: Sequence[str]) -> Dict[str, 'np.ndarray']:
+    """
+    Concatenate the columns read from several results files.
+
+    Args:
+        parts (List[Dict[str, np.ndarray]]): Columns of every file, in row order.
+        columns (Sequence[str]): Column names.
+
+    Returns:
+        Dict[str, np.ndarray]: The values of every column, empty lists when there are no files.
+    """
+    import numpy as np
+
+    if not parts:
+        return {column: [] for column in columns}
+    return {column: np.concatenate([part[column] for part in parts]) for column in columns}
+
+
+def load_results(filename: str) -> 'pd.DataFrame':
+    """
+    Load a results file written by ResultsSink, columnar formats are read without text parsing.
+
+    Args:
+        filename (str): Path of the results file.
+
+    Returns:
+        pd.DataFrame: The results, one row per algorithm run.
+    """
+    import pandas as pd
+
+    if filename.endswith(EXTENSIONS[results_format.PARQUET]):
+        return pd.read_parquet(filename)
+    if filename.endswith(EXTENSIONS[results_format.NPZ]):
+        import numpy as np
+
+        with np.load(filename) as data:
+            return pd.DataFrame({column: data[column] for column in data.files if column != METADATA_KEY})
+    return pd.read_csv(filename)
+
+
+def load_metadata(filename: str) -> Dict[str, Any]:
+    """
+    Load the seed, config and environment metadata stored with a results file.
+
+    Args:
+        filename (str): Path of the results file.
+
+    Returns:
+        Dict[str, Any]: The metadata, empty when the file has none.
+    """
+    if filename.endswith(EXTENSIONS[results_format.PARQUET]):
+        import pyarrow.parquet as pq
+
+        schema_metadata = pq.read_schema(filename).metadata or {}
+        return json.loads(schema_metadata.get(METADATA_KEY.encode(), b'{}'))
+    if filename.endswith(EXTENSIONS[results_format.NPZ]):
+        import numpy as np
+
+        with np.load(filename) as data:
+            return json.loads(str(data[METADATA_KEY])) if METADATA_KEY in data.files else {}
+    if os.path.exists(filename + METADATA_SUFFIX):
+        with open(filename + METADATA_SUFFIX) as file:
+            return json.load(file)
+    return {}
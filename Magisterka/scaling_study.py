@@ -0,0 +1,211 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from matplotlib import pyplot as plt
+from typing import Dict, List, Optional
+from enums.tie_breaking import TieBreaking as tie_breaking
+from logger import ProjectLogger
+from main import ALGORITHMS
+from parallel_sweep import ParallelSweep, create_analyzer
+from result_statistics import fit_power_law, fit_n_log_n, local_exponents
+from results_store import load_results
+
+SCALING_DIRECTORY = "scaling_study"
+MIN_SCALING_SIZE = 41
+MAX_SCALING_SIZE = 2561
+SCALING_ITERATIONS = 20
+
+# Fitted metrics, keyed by the name used in the output files
+SCALING_METRICS = {
+    'exec_time': 'Execution Time (ms)',
+    'searched_cells': 'Searched Cells',
+}
+
+
+def geometric_sizes(min_size: int, max_size: int, factor: int = 2) -> List[int]:
+    """
+    Build maze sizes growing geometrically, every size keeps the odd row count the maze generator needs.
+
+    Args:
+        min_size (int): Smallest maze size.
+        max_size (int): Largest maze size, included when it is on the sequence.
+        factor (int): Growth factor of the passage count between consecutive sizes.
+
+    Returns:
+        List[int]: The sizes, for example 41, 81, 161, ..., 2561.
+    """
+    sizes = []
+    size = min_size
+    while size <= max_size:
+        sizes.append(size)
+        size = (size - 1) * factor + 1
+    return sizes
+
+
+class ScalingStudy(ProjectLogger):
+    def __init__(self, sizes: List[int], cell_open_percentages: List[int], iterations: int = SCALING_ITERATIONS,
+                 workers: Optional[int] = None, base_seed: int = 0,
+                 tie_breaking_policy: tie_breaking = tie_breaking.FIFO, algorithm_names: Optional[List[str]] = None,
+                 directory: str = SCALING_DIRECTORY):
+        """
+        Initialize the ScalingStudy, a sweep over geometrically growing mazes fitted to complexity models.
+
+        Args:
+            sizes (List[int]): Maze sizes, see geometric_sizes.
+            cell_open_percentages (List[int]): Open percentages to study for every size.
+            iterations (int): Number of mazes per config.
+            workers (Optional[int]): Number of worker processes. Defaults to one per core.
+            base_seed (int): Seed of the sweep.
+            tie_breaking_policy (tie_breaking): Tie-breaking policy for the A*-family frontiers.
+            algorithm_names (Optional[List[str]]): Names of the algorithms to study. Defaults to all of ALGORITHMS.
+            directory (str): Directory for the configs of the study, the fitted exponents and the plots.
+        """
+        super().__init__()
+        self.sizes = sizes
+        self.cell_open_percentages = cell_open_percentages
+        self.directory = directory
+        self.sweep = ParallelSweep(sizes=sizes, cell_open_percentages=cell_open_percentages, iterations=iterations,
+                                   workers=workers, base_seed=base_seed, tie_breaking_policy=tie_breaking_policy,
+                                   algorithm_names=algorithm_names, root=directory)
+
+    def run(self) -> None:
+        """
+        Run the sweep, resuming finished configs, then fit and plot the scaling of every algorithm.
+        """
+        self.sweep.run()
+        os.makedirs(self.directory, exist_ok=True)
+        points = self.collect_points()
+        points.to_csv(os.path.join(self.directory, 'scaling_points.csv'), index=False)
+        exponents = self.fit(points)
+        exponents.to_csv(os.path.join(self.directory, 'scaling_exponents.csv'), index=False)
+        self.logger.info(f"Fitted scaling exponents:\n{exponents.to_string(index=False)}\n")
+        self.plot(points, exponents)
+
+    def collect_points(self) -> pd.DataFrame:
+        """
+        Load the results of every config and take the median cost of each algorithm.
+
+        Returns:
+            pd.DataFrame: One row per (open percentage, algorithm, size) with the number of cells and the medians.
+        """
+        points = []
+        for size in self.sizes:
+            for pct in self.cell_open_percentages:
+                analyzer = create_analyzer(size, pct, self.sweep.analyzer_kwargs, self.directory)
+                medians = load_results(analyzer.filename).groupby('Algorithm_name')[list(SCALING_METRICS.values())]
+                for algorithm_name, row in medians.median().iterrows():
+                    points.append({
+                        'cell_open_percentage': pct,
+                        'Algorithm_name': algorithm_name,
+                        'size': analyzer.rows,
+                        'cells': analyzer.rows ** 2,
+                        **{metric: row[column] for metric, column in SCALING_METRICS.items()},
+                    })
+        return pd.DataFrame(points)
+
+    @staticmethod
+    def fit(points: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fit the power-law and n log n models to the median costs, n being the number of cells.
+
+        The local exponents between consecutive sizes show where the cost of an algorithm blows up, the largest one
+        is reported together with the size it is reached at.
+
+        Args:
+            points (pd.DataFrame): The medians from collect_points.
+
+        Returns:
+            pd.DataFrame: One row per (open percentage, algorithm, metric) with the fitted models.
+        """
+        fits = []
+        for (pct, algorithm_name), group in points.groupby(['cell_open_percentage', 'Algorithm_name']):
+            group = group.sort_values('cells')
+            for metric in SCALING_METRICS:
+                # Costs below the timer resolution cannot be fitted in log space
+                measured = group[group[metric] > 0]
+                if len(measured) < 2:
+                    continue
+                exponent, coefficient, power_law_r2 = fit_power_law(measured['cells'], measured[metric])
+                n_log_n_coefficient, n_log_n_r2 = fit_n_log_n(measured['cells'], measured[metric])
+                slopes = local_exponents(measured['cells'], measured[metric])
+                steepest = int(np.argmax(slopes))
+                fits.append({
+                    'cell_open_percentage': pct,
+                    'Algorithm_name': algorithm_name,
+                    'metric': metric,
+                    'power_law_exponent': exponent,
+                    'power_law_coefficient': coefficient,
+                    'power_law_r2': power_law_r2,
+                    'n_log_n_coefficient': n_log_n_coefficient,
+                    'n_log_n_r2': n_log_n_r2,
+                    'best_model': 'power_law' if power_law_r2 >= n_log_n_r2 else 'n_log_n',
+                    'max_local_exponent': float(slopes[steepest]),
+                    'max_local_exponent_size': int(measured['size'].iloc[steepest + 1]),
+                })
+        return pd.DataFrame(fits)
+
+    def plot(self, points: pd.DataFrame, exponents: pd.DataFrame) -> None:
+        """
+        Plot the median costs against the number of cells on log-log axes, with the fitted power laws.
+
+        Args:
+            points (pd.DataFrame): The medians from collect_points.
+            exponents (pd.DataFrame): The fits from fit.
+        """
+        fitted: Dict[tuple, pd.Series] = {(row['cell_open_percentage'], row['Algorithm_name'], row['metric']): row
+                                          for _, row in exponents.iterrows()}
+        for pct in self.cell_open_percentages:
+            for metric, column in SCALING_METRICS.items():
+                plt.figure(figsize=(10, 6))
+                for algorithm_name, group in points[points['cell_open_percentage'] == pct].groupby('Algorithm_name'):
+                    group = group.sort_values('cells')
+                    line, = plt.loglog(group['cells'], group[metric], marker='o', linestyle='none')
+                    fit = fitted.get((pct, algorithm_name, metric))
+                    label = algorithm_name
+                    if fit is not None:
+                        plt.loglog(group['cells'],
+                                   fit['power_law_coefficient'] * group['cells'] ** fit['power_law_exponent'],
+                                   color=line.get_color())
+                        label = f"{algorithm_name} (n^{fit['power_law_exponent']:.2f})"
+                    line.set_label(label)
+                plt.xlabel('Cells (n)')
+                plt.ylabel(f'Median {column}')
+                plt.title(f'Scaling of {column} by Algorithm (Open Cells: {pct}%)')
+                plt.legend()
+                plt.tight_layout()
+                plt.savefig(os.path.join(self.directory, f"scaling_{metric}_open_cells_pct{pct}.png"))
+                plt.close()
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the size range and the sweep options from the command line.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Sweep the maze size geometrically and fit the scaling of every "
+                                                 "algorithm to power-law and n log n models.")
+    parser.add_argument('--min-size', type=int, default=MIN_SCALING_SIZE, help='Smallest maze size.')
+    parser.add_argument('--max-size', type=int, default=MAX_SCALING_SIZE, help='Largest maze size.')
+    parser.add_argument('--factor', type=int, default=2, help='Growth factor between consecutive sizes.')
+    parser.add_argument('--open-pcts', type=int, nargs='+', default=[25, 5, 0],
+                        help='Open cell percentages to study for every size.')
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS),
+                        help='Algorithms to study.')
+    parser.add_argument('--iterations', type=int, default=SCALING_ITERATIONS, help='Number of mazes per config.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of worker processes.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the sweep.')
+    parser.add_argument('--tie-breaking', type=tie_breaking, default=tie_breaking.FIFO, choices=list(tie_breaking),
+                        metavar='{' + ','.join(t.value for t in tie_breaking) + '}',
+                        help='Tie-breaking policy for the A*-family frontiers.')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    ScalingStudy(sizes=geometric_sizes(args.min_size, args.max_size, args.factor),
+                 cell_open_percentages=args.open_pcts, iterations=args.iterations, workers=args.workers,
+                 base_seed=args.seed, tie_breaking_policy=args.tie_breaking,
+                 algorithm_names=args.algorithms).run()
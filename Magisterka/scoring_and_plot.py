@@ -1,167 +1,141 @@
 import os
 import pandas as pd
 from matplotlib import pyplot as plt
+from typing import Optional
+from online_stats import OnlineAggregator
+from ranking import rank_algorithms, SUMMARY_FILENAME
+from results_store import load_results
+
+# Bar charts of a config: summary column, file name, axis label, title and color
+CHARTS = [
+    ('avg_exec_time', 'avg_execution_time', 'Average Execution Time (ms)', 'Average Execution Time', 'blue'),
+    ('avg_searched_cells', 'avg_searched_cells', 'Average Searched Cells', 'Average Searched Cells', 'orange'),
+    ('avg_path_cost', 'avg_path_cost', 'Average Path Cost', 'Average Path Cost', 'red'),
+    ('avg_peak_memory', 'avg_peak_memory', 'Average Peak Memory (KiB)', 'Average Peak Memory', 'green'),
+    ('overall_rank', 'overall_rank', 'Overall Rank', 'Overall Rank', 'purple'),
+]
 
 
 def analyze_results_and_generate_plot(filename: str, maze_size: int, logger, show: bool,
-                                      cell_open_percentage: int) -> None:
+                                      cell_open_percentage: int, memory_weight: float = 0.0,
+                                      summary: Optional[pd.DataFrame] = None, charts: bool = True,
+                                      directory: Optional[str] = None) -> None:
     """
-    Analyze the algorithm performance results from a CSV file and generate plots.
+    Analyze the algorithm performance results and generate plots.
 
-    This function reads the CSV file, calculates weighted scores based on execution time,
-    searched cells, and path cost, and ranks the algorithms accordingly. It then generates
-    and saves various plots to visualize the performance of the algorithms.
+    This function summarizes the results (or takes the summary aggregated online during the run), calculates
+    weighted scores based on execution time, searched cells, and path cost, and ranks the algorithms accordingly.
+    Results recorded in memory mode are also summarized by peak memory and allocated blocks, the peak memory joins
+    the score when it has a weight. It then generates and saves various plots to visualize the performance of the
+    algorithms.
 
     Args:
-        filename (str): Path to the CSV file containing algorithm performance data.
+        filename (str): Path to the results file (CSV, Parquet or npz) containing algorithm performance data.
         maze_size (int): The size of the maze (number of rows/columns).
         logger: Logger instance to log messages.
         show (bool): Whether to display the plots after generating them.
         cell_open_percentage (int): The percentage of opened passages to complicate maze.
+        memory_weight (float): Exponent of the peak memory in the overall score, 0 leaves it out of the ranking.
+        summary (Optional[pd.DataFrame]): Summary from OnlineAggregator.summary_frame, the results file is only
+                                          read when it is not given.
+        charts (bool): Draw the charts right away, otherwise they are left to the reporting stage.
+        directory (Optional[str]): Directory of the summary and the charts. Defaults to the config directory in the
+                                   working directory.
 
     Returns:
         None
     """
-    # Custom weights emphasizing path cost and searched cells percentage
-    weights = {
-        'exec_time': 0.2,
-        'searched_cells': 0.40,
-        'path_cost': 0.40
-    }
-
     # Display maze size in the console
     logger.info(f"Analyzing maze of size: {maze_size}x{maze_size} cell_open_percentage: {cell_open_percentage}")
 
-    # Load the CSV file into a pandas DataFrame
-    try:
-        df = pd.read_csv(filename)
-    except FileNotFoundError:
-        logger.error(f"File {filename} not found.")
-        return
-
-    # Summarize the data by algorithm
-    summary = df.groupby('Algorithm_name').agg(
-        avg_exec_time=('Execution Time (ms)', 'mean'),
-        avg_searched_cells=('Searched Cells', 'mean'),
-        avg_path_cost=('Total Path Cost', 'mean')
-    ).reset_index()
-
-    # Apply weights before multiplying or dividing
-    summary['weighted_exec_time'] = summary['avg_exec_time'] * weights['exec_time']
-    summary['weighted_searched_cells'] = summary['avg_searched_cells'] * weights['searched_cells']
-    summary['weighted_path_cost'] = summary['avg_path_cost'] * weights['path_cost']
-
-    # Calculate overall score by multiplying all weighted metrics together
-    summary['overall_score'] = (
-            summary['weighted_exec_time'] *
-            summary['weighted_searched_cells'] *
-            summary['weighted_path_cost']
-    )
-
-    # Normalize the overall score to convert it into a percentage (best score as 100%)
-    best_score = summary['overall_score'].min()
-    summary['overall_performance'] = round((best_score / summary['overall_score']) * 100, 2)
-
-    # Sort by overall performance (higher percentages are better)
-    summary = summary.sort_values('overall_performance', ascending=False)
-
-    # Rank the algorithms based on the sorted overall performance (1 for best performance)
-    summary['overall_rank'] = summary['overall_performance'].rank(ascending=False, method='min')
+    if summary is None:
+        # Load the results file into a pandas DataFrame, columnar formats are read without text parsing
+        try:
+            df = load_results(filename)
+        except FileNotFoundError:
+            logger.error(f"File {filename} not found.")
+            return
+        summary = OnlineAggregator.from_frame(df).summary_frame()
+
+    summary = rank_algorithms(summary, memory_weight)
 
     # Log the ranked summary with overall_performance as a percentage
     logger.info("Ranked Algorithm Performance (Normalized to Best Performance as 100%):")
-    logger.info(
-        f"\n{summary[['Algorithm_name', 'avg_exec_time', 'avg_searched_cells', 'avg_path_cost',
-                      'overall_performance', 'overall_rank']].to_string(index=False)}\n")
+    logged_columns = ['Algorithm_name', 'avg_exec_time', 'median_exec_time', 'exec_time_iqr', 'exec_time_ci_low',
+                      'exec_time_ci_high', 'avg_searched_cells', 'avg_path_cost', 'overall_performance', 'overall_rank']
+    if 'avg_peak_memory' in summary.columns:
+        logged_columns[-2:-2] = ['avg_peak_memory', 'avg_allocated_blocks']
+    logger.info(f"\n{summary[logged_columns].to_string(index=False)}\n")
 
-    folder_name = f"size{maze_size}_open_cells_pct{cell_open_percentage}"
-    summary = summary.drop(columns=['overall_score'])
-    summary = summary.drop(columns=['weighted_exec_time'])
-    summary = summary.drop(columns=['weighted_searched_cells'])
-    summary = summary.drop(columns=['weighted_path_cost'])
-    summary.to_csv(os.path.join(folder_name, 'summary.csv'), index=False)
+    folder_name = directory or f"size{maze_size}_open_cells_pct{cell_open_percentage}"
+    summary.to_csv(os.path.join(folder_name, SUMMARY_FILENAME), index=False)
 
     # Generate Charts
-    generate_charts(summary, show, maze_size, cell_open_percentage)
+    if charts:
+        generate_charts(summary, show, maze_size, cell_open_percentage, directory=folder_name)
 
 
-def generate_charts(summary: pd.DataFrame, show: bool, maze_size: int, cell_open_percentage: int = 0) -> None:
+def generate_charts(summary: pd.DataFrame, show: bool, maze_size: int, cell_open_percentage: int = 0,
+                    directory: Optional[str] = None) -> None:
     """
     Generate and save bar charts based on the algorithm performance summary.
 
-    This function creates bar charts for average execution time, searched cells, path cost,
-    and overall rank. The charts are saved as PNG files.
+    This function creates bar charts for average execution time, searched cells, path cost, peak memory
+    (when measured) and overall rank. The charts are saved as PNG files. Unless they are shown, all charts are drawn
+    on a single reused figure.
 
     Args:
         summary (pd.DataFrame): The DataFrame containing the summarized performance data.
         show (bool): Whether to display the plots after generating them.
         maze_size (int): The size of the maze (number of rows/columns).
         cell_open_percentage (int): The percentage of opened passages to complicate maze.
+        directory (Optional[str]): Directory of the PNG files. Defaults to the config directory in the working
+                                   directory.
 
     Returns:
         None
     """
-    folder_name = f"size{maze_size}_open_cells_pct{cell_open_percentage}"
+    folder_name = directory or f"size{maze_size}_open_cells_pct{cell_open_percentage}"
 
     def get_file_path(filename: str) -> str:
-        return os.path.join(folder_name, f"{filename}_size{maze_size}_open_cells_pct{cell_open_percentage}.png")
+        return os.path.join(folder_name, chart_filename(filename, maze_size, cell_open_percentage))
 
     # Ensure the directory exists
     if not os.path.exists(folder_name):
         os.makedirs(folder_name)
 
-    # Average Execution Time
-    plt.figure(figsize=(10, 6))
-    plt.bar(summary['Algorithm_name'], summary['avg_exec_time'], color='blue')
-    plt.xlabel('Algorithm')
-    plt.ylabel('Average Execution Time (ms)')
-    plt.title(f'Average Execution Time by Algorithm (Maze Size: {maze_size})')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(get_file_path('avg_execution_time'))
-    if show:
-        plt.show()
-    else:
-        plt.close()
-
-    # Average Searched Cells
-    plt.figure(figsize=(10, 6))
-    plt.bar(summary['Algorithm_name'], summary['avg_searched_cells'], color='orange')
-    plt.xlabel('Algorithm')
-    plt.ylabel('Average Searched Cells')
-    plt.title(f'Average Searched Cells by Algorithm (Maze Size: {maze_size})')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(get_file_path('avg_searched_cells'))
-    if show:
-        plt.show()
-    else:
-        plt.close()
-
-    # Average Path Cost
-    plt.figure(figsize=(10, 6))
-    plt.bar(summary['Algorithm_name'], summary['avg_path_cost'], color='red')
-    plt.xlabel('Algorithm')
-    plt.ylabel('Average Path Cost')
-    plt.title(f'Average Path Cost by Algorithm (Maze Size: {maze_size})')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(get_file_path('avg_path_cost'))
-    if show:
-        plt.show()
-    else:
-        plt.close()
-
-    # Overall Rank
-    plt.figure(figsize=(10, 6))
-    plt.bar(summary['Algorithm_name'], summary['overall_rank'], color='purple')
-    plt.xlabel('Algorithm')
-    plt.ylabel('Overall Rank')
-    plt.title(f'Overall Rank by Algorithm (Maze Size: {maze_size})')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(get_file_path('overall_rank'))
-    if show:
-        plt.show()
-    else:
-        plt.close()
+    figure = None
+    for column, filename, label, title, color in CHARTS:
+        # Peak memory is only present for results recorded in memory mode
+        if column not in summary.columns:
+            continue
+        if show or figure is None:
+            figure = plt.figure(figsize=(10, 6))
+        else:
+            figure.clf()
+        plt.bar(summary['Algorithm_name'], summary[column], color=color)
+        plt.xlabel('Algorithm')
+        plt.ylabel(label)
+        plt.title(f'{title} by Algorithm (Maze Size: {maze_size})')
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+        plt.savefig(get_file_path(filename))
+        if show:
+            plt.show()
+    if figure is not None and not show:
+        plt.close(figure)
+
+
+def chart_filename(chart: str, maze_size: int, cell_open_percentage: int) -> str:
+    """
+    Build the PNG file name of a config chart.
+
+    Args:
+        chart (str): Name of the chart, one of the CHARTS file names.
+        maze_size (int): The size of the maze (number of rows/columns).
+        cell_open_percentage (int): The percentage of opened passages to complicate maze.
+
+    Returns:
+        str: The file name.
+    """
+    return f"{chart}_size{maze_size}_open_cells_pct{cell_open_percentage}.png"
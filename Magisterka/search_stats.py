@@ -0,0 +1,83 @@
+from typing import List
+
+COUNTER_NAMES = ["Pushes", "Pops", "Stale Pops", "Relaxations", "Improvements", "Max Frontier"]
+DIRECTIONS = ["Forward", "Backward"]
+STATS_HEADER = [f"{direction} {name}" for direction in DIRECTIONS for name in COUNTER_NAMES]
+
+
+class FrontierStats:
+    __slots__ = ('pushes', 'pops', 'stale_pops', 'relaxations', 'improvements', 'max_frontier')
+
+    def __init__(self):
+        """
+        Initialize the FrontierStats, the operation counters of a single search frontier.
+
+        Pops and stale pops are not counted in the search loop, finish derives them from the pushes, the final
+        frontier size and the number of expanded spots.
+        """
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.relaxations = 0
+        self.improvements = 0
+        self.max_frontier = 0
+
+    def record_expansion(self, pushed: int, frontier_size: int, relaxations: int) -> None:
+        """
+        Record the expansion of a spot.
+
+        Args:
+            pushed (int): Number of neighbors pushed to the frontier, each of them improved the neighbor's score.
+            frontier_size (int): Size of the frontier after the expansion.
+            relaxations (int): Number of edges to unvisited neighbors that were relaxed.
+        """
+        self.pushes += pushed
+        self.improvements += pushed
+        self.relaxations += relaxations
+        if frontier_size > self.max_frontier:
+            self.max_frontier = frontier_size
+
+    def finish(self, frontier_size: int, expanded: int) -> None:
+        """
+        Derive the pops when the search stops, every push was either popped or is still in the frontier.
+
+        The frontier is seeded with its start spot before the search loop, finish adds that push.
+
+        Args:
+            frontier_size (int): Size of the frontier when the search stops.
+            expanded (int): Number of spots expanded by the frontier, every other pop was stale.
+        """
+        self.pushes += 1
+        self.max_frontier = max(self.max_frontier, 1)
+        self.pops = self.pushes - frontier_size
+        self.stale_pops = self.pops - expanded
+
+    def as_row(self) -> List[int]:
+        """
+        Get the counters in COUNTER_NAMES order.
+
+        Returns:
+            List[int]: The counter values.
+        """
+        return [self.pushes, self.pops, self.stale_pops, self.relaxations, self.improvements, self.max_frontier]
+
+
+class SearchStats:
+    def __init__(self):
+        """
+        Initialize the SearchStats, the operation counters of a search.
+
+        Unidirectional searches only use the forward frontier, bidirectional searches count the search from the end
+        spot in the backward one.
+        """
+        self.forward = FrontierStats()
+        self.backward = FrontierStats()
+
+    def as_row(self) -> List[int]:
+        """
+        Get the counters in STATS_HEADER order.
+
+        Returns:
+            List[int]: The forward counters followed by the backward counters.
+        """
+        return self.forward.as_row() + self.backward.as_row()
@@ -0,0 +1,171 @@
+import os
+import struct
+import sys
+from array import array
+from typing import List, Tuple, TYPE_CHECKING
+from enums.trace_event import TraceEvent as trace_event
+from profiling import profile_filename
+from spot import CLOSED, NEXT, PATH, PATH_ALT
+
+if TYPE_CHECKING:
+    from spot import Spot
+
+TRACES_DIRECTORY = "traces"
+TRACE_EXTENSION = ".trace"
+MAGIC = b'MTRC'
+VERSION = 1
+# Magic, version, rows, start cell, end cell, algorithm name length and event count
+HEADER = struct.Struct('<4sHHIIHI')
+# Events are little-endian uint32 packed with the cell index, the low bits hold the event kind
+EVENT_BITS = 2
+
+# Plain int copies of the event kinds, keyed by the spot state they are recorded from
+STATE_EVENTS = {
+    NEXT: trace_event.OPEN.value,
+    CLOSED: trace_event.CLOSE.value,
+    PATH: trace_event.PATH.value,
+    PATH | PATH_ALT: trace_event.PATH_ALT.value,
+}
+
+
+def trace_filename(iteration: int, algorithm_name: str) -> str:
+    """
+    Build the file name of the trace of an algorithm's search on an iteration's maze.
+
+    Args:
+        iteration (int): Iteration number within the config.
+        algorithm_name (str): Name of the algorithm.
+
+    Returns:
+        str: The file name.
+    """
+    return f"{iteration:05d}_{profile_filename(algorithm_name)}{TRACE_EXTENSION}"
+
+
+class SearchTrace:
+    __slots__ = ('rows', 'maze', 'start', 'end', 'algorithm_name', 'events')
+
+    def __init__(self, rows: int, maze: bytes, start: int, end: int, algorithm_name: str = ''):
+        """
+        Initialize a SearchTrace, the maze of a search and the sequence of cells it opened, closed and put on the path.
+
+        The trace is passed to the algorithms as their window, draw_spot records the state of every drawn spot
+        instead of drawing it, so a trace is recorded by an untimed display run without a display.
+
+        Args:
+            rows (int): Number of rows (and columns) of the maze.
+            maze (bytes): Weight of every cell in row-major order, 0 for barriers.
+            start (int): Cell index of the start spot.
+            end (int): Cell index of the end spot.
+            algorithm_name (str): Name of the traced algorithm.
+        """
+        self.rows = rows
+        self.maze = maze
+        self.start = start
+        self.end = end
+        self.algorithm_name = algorithm_name
+        self.events = array('I')
+
+    @classmethod
+    def from_grid(cls, grid: List[List['Spot']], start_spot: 'Spot', end_spot: 'Spot',
+                  algorithm_name: str = '') -> 'SearchTrace':
+        """
+        Start a trace of a search on the grid.
+
+        Args:
+            grid (List[List[Spot]]): The grid of spots.
+            start_spot (Spot): The starting spot.
+            end_spot (Spot): The target spot.
+            algorithm_name (str): Name of the traced algorithm.
+
+        Returns:
+            SearchTrace: The empty trace.
+        """
+        rows = len(grid)
+        maze = bytes(0 if spot.is_barrier() else spot.spot_value for row in grid for spot in row)
+        return cls(rows, maze, start_spot.row * rows + start_spot.col, end_spot.row * rows + end_spot.col,
+                   algorithm_name)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def record(self, spot: 'Spot') -> None:
+        """
+        Record the current state of a drawn spot as an event.
+
+        Args:
+            spot (Spot): The spot the algorithm has just opened, closed or put on the path.
+        """
+        kind = STATE_EVENTS.get(spot.state)
+        if kind is not None:
+            self.events.append((spot.row * self.rows + spot.col) << EVENT_BITS | kind)
+
+    def decoded(self) -> List[Tuple[int, trace_event]]:
+        """
+        Decode the events.
+
+        Returns:
+            List[Tuple[int, trace_event]]: Cell index and kind of every event, in search order.
+        """
+        mask = (1 << EVENT_BITS) - 1
+        return [(event >> EVENT_BITS, trace_event(event & mask)) for event in self.events]
+
+    def save(self, path: str) -> None:
+        """
+        Write the trace to a binary file.
+
+        Args:
+            path (str): Path of the trace file.
+        """
+        name = self.algorithm_name.encode()
+        events = self.events
+        if sys.byteorder == 'big':
+            events = array('I', events)
+            events.byteswap()
+        with open(path, mode='wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.rows, self.start, self.end, len(name), len(events)))
+            file.write(name)
+            file.write(self.maze)
+            file.write(events.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'SearchTrace':
+        """
+        Read a trace from a binary file.
+
+        Args:
+            path (str): Path of the trace file.
+
+        Returns:
+            SearchTrace: The trace.
+
+        Raises:
+            ValueError: If the file is not a trace of a supported version.
+        """
+        with open(path, mode='rb') as file:
+            magic, version, rows, start, end, name_length, count = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} search trace.")
+            name = file.read(name_length).decode()
+            trace = cls(rows, file.read(rows * rows), start, end, name)
+            trace.events.frombytes(file.read(count * trace.events.itemsize))
+        if sys.byteorder == 'big':
+            trace.events.byteswap()
+        return trace
+
+
+def trace_path(directory: str, iteration: int, algorithm_name: str) -> str:
+    """
+    Build the path of a trace inside a config directory, creating the traces directory.
+
+    Args:
+        directory (str): Directory of the config.
+        iteration (int): Iteration number within the config.
+        algorithm_name (str): Name of the algorithm.
+
+    Returns:
+        str: The path.
+    """
+    traces_directory = os.path.join(directory, TRACES_DIRECTORY)
+    os.makedirs(traces_directory, exist_ok=True)
+    return os.path.join(traces_directory, trace_filename(iteration, algorithm_name))
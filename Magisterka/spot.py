@@ -1,11 +1,60 @@
-import pygame
 from enums.colors import Colors as colors
+from enums.spot_state import SpotState as spot_state
 from enums.weight import Weight as spot_weight
-from typing import List, Tuple
+from typing import List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pygame
+
+# Plain int copies of the state flags, IntFlag arithmetic is too slow for the search hot path
+BARRIER = spot_state.BARRIER.value
+START = spot_state.START.value
+END = spot_state.END.value
+CLOSED = spot_state.CLOSED.value
+NEXT = spot_state.NEXT.value
+PATH = spot_state.PATH.value
+PATH_ALT = spot_state.PATH_ALT.value
+FIXED = BARRIER | START | END
+
+# Colors are only resolved when a spot is drawn or printed
+STATE_COLORS = {
+    BARRIER: colors.BLACK,
+    START: colors.ORANGE,
+    END: colors.PURPLE,
+    CLOSED: colors.RED,
+    NEXT: colors.GREEN,
+    PATH: colors.TURQUOISE,
+    PATH | PATH_ALT: colors.LIME,
+}
+WEIGHT_COLORS = {
+    spot_weight.DEFAULT.value: colors.WHITE_1,
+    spot_weight.LIGHT.value: colors.WHITE_5,
+    spot_weight.HEAVY.value: colors.WHITE_15,
+}
+
+
+class GridGeometry:
+    """
+    Grid-level constants shared by every spot of a single grid instead of being copied per cell.
+    """
+    __slots__ = ('width', 'total_rows')
+
+    def __init__(self, width: int, total_rows: int):
+        """
+        Initialize the GridGeometry.
+
+        Args:
+            width (int): The width (and height) of a single spot in pixels.
+            total_rows (int): The total number of rows in the grid.
+        """
+        self.width = width
+        self.total_rows = total_rows
 
 
 class Spot:
-    def __init__(self, row: int, col: int, width: int, total_rows: int, color: colors,
+    __slots__ = ('row', 'col', 'geometry', 'state', 'spot_value', 'neighbors')
+
+    def __init__(self, row: int, col: int, geometry: GridGeometry, state: int = spot_state.OPEN,
                  spot_value: int = spot_weight.DEFAULT.value):
         """
         Initialize a Spot.
@@ -13,19 +62,15 @@ class Spot:
         Args:
             row (int): The row position of the spot in the grid.
             col (int): The column position of the spot in the grid.
-            width (int): The width (and height) of the spot.
-            total_rows (int): The total number of rows in the grid.
-            color (colors): The initial color of the spot.
+            geometry (GridGeometry): The grid-level constants shared by all spots of the grid.
+            state (int): The initial state bit field of the spot (see SpotState).
             spot_value (int): The weight or cost associated with moving through the spot.
         """
         self.row = row
         self.col = col
-        self.x = row * width
-        self.y = col * width
-        self.color = color
+        self.geometry = geometry
+        self.state = int(state)
         self.neighbors = []
-        self.width = width
-        self.total_rows = total_rows
         self.spot_value = spot_value
 
     def __lt__(self, other) -> bool:
@@ -49,6 +94,58 @@ class Spot:
         """
         return f"Spot({self.row}, {self.col}, {self.color})"
 
+    @property
+    def width(self) -> int:
+        """
+        Get the width (and height) of the spot in pixels.
+
+        Returns:
+            int: The width of the spot.
+        """
+        return self.geometry.width
+
+    @property
+    def total_rows(self) -> int:
+        """
+        Get the total number of rows in the grid the spot belongs to.
+
+        Returns:
+            int: The total number of rows.
+        """
+        return self.geometry.total_rows
+
+    @property
+    def x(self) -> int:
+        """
+        Get the pixel x coordinate of the spot.
+
+        Returns:
+            int: The x coordinate of the spot's top-left corner.
+        """
+        return self.row * self.geometry.width
+
+    @property
+    def y(self) -> int:
+        """
+        Get the pixel y coordinate of the spot.
+
+        Returns:
+            int: The y coordinate of the spot's top-left corner.
+        """
+        return self.col * self.geometry.width
+
+    @property
+    def color(self) -> colors:
+        """
+        Map the spot's state bit field to its display color.
+
+        Returns:
+            colors: The color of the spot, open spots are shaded by their weight.
+        """
+        if self.state:
+            return STATE_COLORS[self.state]
+        return WEIGHT_COLORS.get(self.spot_value, colors.WHITE_1)
+
     def get_pos(self) -> Tuple[int, int]:
         """
         Get the grid position of the spot.
@@ -65,7 +162,7 @@ class Spot:
         Returns:
             bool: True if the spot is a barrier, False otherwise.
         """
-        return self.color == colors.BLACK
+        return (self.state & BARRIER) != 0
 
     def is_start(self) -> bool:
         """
@@ -74,7 +171,7 @@ class Spot:
         Returns:
             bool: True if the spot is the start spot, False otherwise.
         """
-        return self.color == colors.ORANGE
+        return (self.state & START) != 0
 
     def is_end(self) -> bool:
         """
@@ -83,7 +180,7 @@ class Spot:
         Returns:
             bool: True if the spot is the end spot, False otherwise.
         """
-        return self.color == colors.PURPLE
+        return (self.state & END) != 0
 
     def is_closed(self) -> bool:
         """
@@ -92,7 +189,7 @@ class Spot:
         Returns:
             bool: True if the spot is closed, False otherwise.
         """
-        return self.color == colors.RED
+        return (self.state & CLOSED) != 0
 
     def is_path(self) -> bool:
         """
@@ -101,36 +198,31 @@ class Spot:
         Returns:
             bool: True if the spot is part of the path, False otherwise.
         """
-        return self.color in [colors.TURQUOISE, colors.LIME]
+        return (self.state & PATH) != 0
 
     def make_open(self) -> None:
         """
-        Mark the spot as open (not a barrier) and assign a color based on its value.
+        Mark the spot as open (not a barrier), its color is derived from its value when drawn.
         """
-        if self.spot_value == spot_weight.DEFAULT.value:
-            self.color = colors.WHITE_1
-        elif self.spot_value == spot_weight.LIGHT.value:
-            self.color = colors.WHITE_5
-        elif self.spot_value == spot_weight.HEAVY.value:
-            self.color = colors.WHITE_15
+        self.state = 0
 
     def make_closed(self) -> None:
         """
         Mark the spot as closed (visited).
         """
-        self.color = colors.RED
+        self.state = CLOSED
 
     def make_next(self) -> None:
         """
         Mark the spot as the next spot to be checked (e.g., part of the frontier).
         """
-        self.color = colors.GREEN
+        self.state = NEXT
 
     def make_barrier(self) -> None:
         """
         Mark the spot as a barrier.
         """
-        self.color = colors.BLACK
+        self.state = BARRIER
 
     def make_path(self, color: colors = colors.TURQUOISE) -> None:
         """
@@ -139,35 +231,41 @@ class Spot:
         Args:
             color (colors, optional): The color to use for marking the path. Defaults to TURQUOISE.
         """
-        self.color = colors.TURQUOISE if color is None else color
+        self.state = PATH | PATH_ALT if color == colors.LIME else PATH
 
     def make_start(self) -> None:
         """
         Mark the spot as the start spot.
         """
-        self.color = colors.ORANGE
+        self.state = START
 
     def make_end(self) -> None:
         """
         Mark the spot as the end spot.
         """
-        self.color = colors.PURPLE
+        self.state = END
 
     def reset(self) -> None:
         """
         Reset the spot to its open state, unless it's a barrier, start, or end spot.
         """
-        if not self.is_barrier() and not self.is_start() and not self.is_end():
-            self.make_open()
+        if not self.state & FIXED:
+            self.state = 0
 
-    def draw(self, win: pygame.Surface) -> None:
+    def draw(self, win: 'pygame.Surface') -> 'pygame.Rect':
         """
-        Draw the spot on the window.
+        Draw the spot on the window surface, the display is updated by the caller.
 
         Args:
             win (pygame.Surface): The Pygame surface to draw on.
+
+        Returns:
+            pygame.Rect: The drawn area of the surface.
         """
-        pygame.draw.rect(win, self.color.value, (self.x, self.y, self.width, self.width))
+        import pygame
+
+        width = self.geometry.width
+        return pygame.draw.rect(win, self.color.value, (self.row * width, self.col * width, width, width))
 
     def update_open_neighbors(self, grid: List[List['Spot']]) -> None:
         """
@@ -177,13 +275,14 @@ class Spot:
             grid (List[List[Spot]]): The grid of spots.
         """
         self.neighbors = []
+        last = self.geometry.total_rows - 1
         if self.row > 0 and not grid[self.row - 1][self.col].is_barrier():  # UP
             self.neighbors.append(grid[self.row - 1][self.col])
 
-        if self.col < self.total_rows - 1 and not grid[self.row][self.col + 1].is_barrier():  # RIGHT
+        if self.col < last and not grid[self.row][self.col + 1].is_barrier():  # RIGHT
             self.neighbors.append(grid[self.row][self.col + 1])
 
-        if self.row < self.total_rows - 1 and not grid[self.row + 1][self.col].is_barrier():  # DOWN
+        if self.row < last and not grid[self.row + 1][self.col].is_barrier():  # DOWN
             self.neighbors.append(grid[self.row + 1][self.col])
 
         if self.col > 0 and not grid[self.row][self.col - 1].is_barrier():  # LEFT
@@ -197,13 +296,14 @@ class Spot:
             grid (List[List[Spot]]): The grid of spots.
         """
         self.neighbors = []
+        last = self.geometry.total_rows - 1
         if self.row > 0 and grid[self.row - 1][self.col].is_barrier():  # UP
             self.neighbors.append(grid[self.row - 1][self.col])
 
-        if self.col < self.total_rows - 1 and grid[self.row][self.col + 1].is_barrier():  # RIGHT
+        if self.col < last and grid[self.row][self.col + 1].is_barrier():  # RIGHT
             self.neighbors.append(grid[self.row][self.col + 1])
 
-        if self.row < self.total_rows - 1 and grid[self.row + 1][self.col].is_barrier():  # DOWN
+        if self.row < last and grid[self.row + 1][self.col].is_barrier():  # DOWN
             self.neighbors.append(grid[self.row + 1][self.col])
 
         if self.col > 0 and grid[self.row][self.col - 1].is_barrier():  # LEFT
@@ -0,0 +1,131 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+METRICS_FILENAME = "metrics.jsonl"
+
+# Sink of the stage records of this process, see open_sink
+_sink: Optional['MetricsSink'] = None
+
+
+class EventFields:
+    __slots__ = ('fields',)
+
+    def __init__(self, fields: Dict[str, Any]):
+        """
+        Initialize the EventFields, formatted only when a handler emits the record.
+
+        Args:
+            fields (Dict[str, Any]): Fields of the event.
+        """
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return ' '.join(f"{key}={value}" for key, value in self.fields.items())
+
+
+def debug_event(logger: logging.Logger, event: str, **fields: Any) -> None:
+    """
+    Log a debug event, nothing is formatted unless the logger is enabled for DEBUG.
+
+    Hot paths guard the call itself with logger.isEnabledFor(logging.DEBUG) when computing the fields costs more than
+    the call.
+
+    Args:
+        logger (logging.Logger): Logger of the emitting class.
+        event (str): Name of the event.
+        fields (Any): Fields of the event, logged as key=value.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('%s %s', event, EventFields(fields))
+
+
+class MetricsSink:
+    def __init__(self, path: str):
+        """
+        Initialize the MetricsSink, JSON lines appended to a file.
+
+        Every record is a single write to a descriptor opened in append mode, so the worker processes of a sweep can
+        share one file without interleaving their lines.
+
+        Args:
+            path (str): Path of the JSON lines file.
+        """
+        self.path = path
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Append a record.
+
+        Args:
+            record (Dict[str, Any]): JSON serializable record.
+        """
+        os.write(self.fd, (json.dumps(record, separators=(',', ':')) + '\n').encode())
+
+    def close(self) -> None:
+        """
+        Close the file.
+        """
+        os.close(self.fd)
+
+
+def open_sink(path: str) -> None:
+    """
+    Send the stage records of this process to a JSON lines file, replacing the previous sink.
+
+    Args:
+        path (str): Path of the JSON lines file.
+    """
+    global _sink
+    if _sink is not None and _sink.path == path:
+        return
+    close_sink()
+    _sink = MetricsSink(path)
+
+
+def close_sink() -> None:
+    """
+    Close the sink of this process, stages are no longer recorded.
+    """
+    global _sink
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+
+class Stage:
+    __slots__ = ('name', 'logger', 'fields', 'time_start')
+
+    def __init__(self, name: str, logger: Optional[logging.Logger] = None, **fields: Any):
+        """
+        Initialize the Stage, a context manager timing a block into the metrics sink and a debug event.
+
+        With no sink open and DEBUG disabled the block is not even timed.
+
+        Args:
+            name (str): Name of the stage.
+            logger (Optional[logging.Logger]): Logger of the debug event, None records the stage to the sink only.
+            fields (Any): Fields of the record, like the maze size.
+        """
+        self.name = name
+        self.logger = logger
+        self.fields = fields
+        self.time_start = None
+
+    def __enter__(self) -> 'Stage':
+        if _sink is not None or (self.logger is not None and self.logger.isEnabledFor(logging.DEBUG)):
+            self.time_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.time_start is None:
+            return
+        seconds = time.perf_counter() - self.time_start
+        if _sink is not None:
+            _sink.write({'stage': self.name, 'seconds': seconds, 'time': time.time(), 'pid': os.getpid(),
+                         **self.fields})
+        if self.logger is not None:
+            debug_event(self.logger, self.name, seconds=round(seconds, 4), **self.fields)
@@ -0,0 +1,292 @@
+import argparse
+import itertools
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+from enums.weight import Weight as spot_weight
+from logger import ProjectLogger
+from telemetry import Stage
+
+TILES_PER_SIDE = 4
+# Moves between neighbouring passage cells, a wall byte lies half way
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+# Every order of the moves, one random pick per carving step instead of a shuffle
+DIRECTION_ORDERS = list(itertools.permutations(DIRECTIONS))
+
+
+def share_out(total: int, weights: List[int]) -> List[int]:
+    """
+    Share a count out in proportion to the weights by the largest remainder, the shares add up to the total.
+
+    Args:
+        total (int): The count to share out.
+        weights (List[int]): Weight of every share, the shares of zero weights stay 0.
+
+    Returns:
+        List[int]: The shares.
+    """
+    weight_sum = sum(weights)
+    if not weight_sum:
+        return [0] * len(weights)
+    shares = [total * weight // weight_sum for weight in weights]
+    # The rest goes one by one to the largest remainders, ties to the first share
+    by_remainder = sorted(range(len(weights)), key=lambda index: -(total * weights[index] % weight_sum))
+    for index in by_remainder[:total - sum(shares)]:
+        shares[index] += 1
+    return shares
+
+
+def carve_tile(name: str, rows: int, bounds: Tuple[int, int, int, int], cell_open_percentage: int, seed: int,
+               regions: Tuple[int, int, int], heavy_bounds: Optional[Tuple[int, int, int, int]]) -> None:
+    """
+    Generate one tile of a maze into the shared maze block, run in the worker processes.
+
+    The tile is carved with the same depth-first search as Grid.carve_path, then its walls are opened and its
+    weighted regions painted like Grid.carve_additional_passages and Grid.add_special_spots do for a whole maze. The
+    wall lines between tiles belong to no tile, they stay barriers until the stitching pass.
+
+    Args:
+        name (str): Name of the shared memory block, rows * rows bytes of weights with 0 for barriers.
+        rows (int): Number of rows of the maze.
+        bounds (Tuple[int, int, int, int]): First and past-the-end passage row and column of the tile.
+        cell_open_percentage (int): Percentage of the tile's removable walls to open.
+        seed (int): Seed of the tile.
+        regions (Tuple[int, int, int]): Number of light and heavy regions of the tile, and the light region size.
+        heavy_bounds (Optional[Tuple[int, int, int, int]]): Part of the tile in the end spot's quadrant, in passages of
+                                                            the tile, None if they do not overlap.
+    """
+    generator = random.Random(seed)
+    first_row, last_row, first_col, last_col = bounds
+    dim_y, dim_x = last_row - first_row, last_col - first_col
+    height, width = 2 * dim_y - 1, 2 * dim_x - 1
+    tile = bytearray(height * width)
+    default = spot_weight.DEFAULT.value
+
+    tile[0] = default
+    stack = [(0, 0)]
+    while stack:
+        y, x = stack[-1]
+        for dy, dx in DIRECTION_ORDERS[int(generator.random() * len(DIRECTION_ORDERS))]:
+            ny, nx = y + dy, x + dx
+            if 0 <= ny < dim_y and 0 <= nx < dim_x and not tile[2 * ny * width + 2 * nx]:
+                tile[2 * ny * width + 2 * nx] = default
+                tile[(2 * y + dy) * width + 2 * x + dx] = default
+                stack.append((ny, nx))
+                break
+        else:
+            stack.pop()
+
+    if cell_open_percentage != 0:
+        # Every passage is carved, so each remaining wall separates two opposite passages, the walls Grid removes. The
+        # width is odd, walls sit on the odd indices and the barriers on the even ones are pillars
+        walls = [index for index in range(1, len(tile), 2) if not tile[index]]
+        for index in generator.sample(walls, int(len(walls) * (cell_open_percentage / 100))):
+            tile[index] = default
+
+    def is_open(y: int, x: int) -> bool:
+        return 0 <= y < height and 0 <= x < width and tile[y * width + x] != 0
+
+    def paint(weight: int, region_size: int, row_range: Tuple[int, int], col_range: Tuple[int, int]) -> None:
+        y = 2 * generator.randrange(*row_range)
+        x = 2 * generator.randrange(*col_range)
+        queue = deque([(y, x)])
+        visited = {(y, x)}
+        counter = 0
+        while queue and counter < region_size:
+            y, x = queue.popleft()
+            if tile[y * width + x] == default:
+                tile[y * width + x] = weight
+                counter += 1
+            for dy, dx in DIRECTIONS:
+                if is_open(y + dy, x + dx) and (y + dy, x + dx) not in visited:
+                    visited.add((y + dy, x + dx))
+                    queue.append((y + dy, x + dx))
+
+    light_regions, heavy_regions, region_size = regions
+    for _ in range(light_regions):
+        paint(spot_weight.LIGHT.value, region_size, (0, dim_y), (0, dim_x))
+    if heavy_bounds is not None:
+        for _ in range(heavy_regions):
+            paint(spot_weight.HEAVY.value, region_size // 2, heavy_bounds[:2], heavy_bounds[2:])
+
+    memory = SharedMemory(name=name)
+    try:
+        for y in range(height):
+            offset = (2 * first_row + 1 + y) * rows + 2 * first_col + 1
+            memory.buf[offset:offset + width] = tile[y * width:(y + 1) * width]
+    finally:
+        memory.close()
+
+
+class TiledMazeGenerator(ProjectLogger):
+    def __init__(self, rows: int, tiles_per_side: int = TILES_PER_SIDE, cell_open_percentage: int = 0,
+                 seed: int = 0, workers: Optional[int] = None):
+        """
+        Initialize the TiledMazeGenerator, maze generation split into square tiles generated in parallel processes.
+
+        Args:
+            rows (int): Number of rows of the maze, an odd count like Grid.carve_path produces.
+            tiles_per_side (int): Tiles along each side, the maze has tiles_per_side ** 2 tiles.
+            cell_open_percentage (int): Percentage of removable walls to open in every tile.
+            seed (int): Seed of the maze, the result does not depend on the number of workers.
+            workers (Optional[int]): Number of worker processes. Defaults to one per core.
+
+        Raises:
+            ValueError: If the maze is too small for the tile count.
+        """
+        super().__init__()
+        self.rows = rows if rows % 2 else rows + 1
+        self.dim = self.rows // 2
+        if tiles_per_side < 1 or self.dim < tiles_per_side:
+            raise ValueError(f"A {self.rows}x{self.rows} maze cannot be split into {tiles_per_side} tiles per side.")
+        self.tiles_per_side = tiles_per_side
+        self.cell_open_percentage = cell_open_percentage
+        self.seed = seed
+        self.workers = workers
+        # Passage row (and column) where every tile starts, the last entry is past the end
+        self.bounds = [self.dim * i // tiles_per_side for i in range(tiles_per_side + 1)]
+
+    def select_start_end(self, generator: random.Random) -> Tuple[int, int]:
+        """
+        Select the start and end passages in opposite quadrants, before the tiles exist, every passage is carved.
+
+        Args:
+            generator (random.Random): Generator of the maze.
+
+        Returns:
+            Tuple[int, int]: Cell indices of the start and end spots.
+        """
+        half = self.dim // 2
+        quadrants = [(0, half, 0, half), (0, half, half, self.dim), (half, self.dim, 0, half),
+                     (half, self.dim, half, self.dim)]
+        start_quadrant = generator.randrange(4)
+        cells = []
+        for first_row, last_row, first_col, last_col in (quadrants[start_quadrant], quadrants[3 - start_quadrant]):
+            row = 2 * generator.randrange(first_row, max(first_row + 1, last_row)) + 1
+            col = 2 * generator.randrange(first_col, max(first_col + 1, last_col)) + 1
+            cells.append(row * self.rows + col)
+        return cells[0], cells[1]
+
+    def stitch(self, maze: memoryview, generator: random.Random) -> None:
+        """
+        Open one passage through the wall line of every tile pair on a random spanning tree of the tiles, every tile
+        is a connected maze, so the whole maze is connected as well.
+
+        Args:
+            maze (memoryview): The maze block.
+            generator (random.Random): Generator of the maze.
+        """
+        side = self.tiles_per_side
+        visited = {(0, 0)}
+        stack = [(0, 0)]
+        while stack:
+            tile_row, tile_col = stack[-1]
+            directions = list(DIRECTIONS)
+            generator.shuffle(directions)
+            for d_row, d_col in directions:
+                next_row, next_col = tile_row + d_row, tile_col + d_col
+                if 0 <= next_row < side and 0 <= next_col < side and (next_row, next_col) not in visited:
+                    if d_row:
+                        row = 2 * self.bounds[max(tile_row, next_row)]
+                        col = 2 * generator.randrange(self.bounds[tile_col], self.bounds[tile_col + 1]) + 1
+                    else:
+                        row = 2 * generator.randrange(self.bounds[tile_row], self.bounds[tile_row + 1]) + 1
+                        col = 2 * self.bounds[max(tile_col, next_col)]
+                    maze[row * self.rows + col] = spot_weight.DEFAULT.value
+                    visited.add((next_row, next_col))
+                    stack.append((next_row, next_col))
+                    break
+            else:
+                stack.pop()
+
+    def generate(self) -> Tuple[bytes, int, int]:
+        """
+        Generate the tiles in the worker processes into a shared maze block and stitch them together.
+
+        Returns:
+            Tuple[bytes, int, int]: The maze like Grid.to_arrays returns it, Grid(rows, gap, arrays=...) rebuilds it.
+        """
+        generator = random.Random(self.seed)
+        start, end = self.select_start_end(generator)
+        # Grid.add_special_spots paints rows // 25 regions per quadrant and as many heavy ones in the end's quadrant,
+        # shared out among the tiles by area so the totals match however small the tiles are
+        region_amount = self.rows // 25
+        half = self.dim // 2
+        end_row, end_col = divmod(end, self.rows)
+        end_rows = (0, half) if end_row // 2 < half else (half, self.dim)
+        end_cols = (0, half) if end_col // 2 < half else (half, self.dim)
+        memory = SharedMemory(create=True, size=self.rows * self.rows)
+        try:
+            memory.buf[:self.rows * self.rows] = bytes(self.rows * self.rows)
+            tile_bounds, areas, heavy_areas, all_heavy_bounds = [], [], [], []
+            for tile_row in range(self.tiles_per_side):
+                for tile_col in range(self.tiles_per_side):
+                    bounds = (self.bounds[tile_row], self.bounds[tile_row + 1],
+                              self.bounds[tile_col], self.bounds[tile_col + 1])
+                    overlap_rows = (max(bounds[0], end_rows[0]), min(bounds[1], end_rows[1]))
+                    overlap_cols = (max(bounds[2], end_cols[0]), min(bounds[3], end_cols[1]))
+                    heavy_bounds, heavy_area = None, 0
+                    if overlap_rows[0] < overlap_rows[1] and overlap_cols[0] < overlap_cols[1]:
+                        heavy_bounds = (overlap_rows[0] - bounds[0], overlap_rows[1] - bounds[0],
+                                        overlap_cols[0] - bounds[2], overlap_cols[1] - bounds[2])
+                        heavy_area = (overlap_rows[1] - overlap_rows[0]) * (overlap_cols[1] - overlap_cols[0])
+                    tile_bounds.append(bounds)
+                    areas.append((bounds[1] - bounds[0]) * (bounds[3] - bounds[2]))
+                    heavy_areas.append(heavy_area)
+                    all_heavy_bounds.append(heavy_bounds)
+            light_shares = share_out(4 * region_amount, areas)
+            heavy_shares = share_out(region_amount, heavy_areas)
+            tiles = [(bounds, generator.getrandbits(32), (light, heavy, self.rows // 2), heavy_bounds)
+                     for bounds, light, heavy, heavy_bounds
+                     in zip(tile_bounds, light_shares, heavy_shares, all_heavy_bounds)]
+
+            # Workers attaching to the block have to share the parent's tracker, their own would unlink it on exit
+            resource_tracker.ensure_running()
+            with Stage('generate_tiles', self.logger, rows=self.rows, tiles=len(tiles)):
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [executor.submit(carve_tile, memory.name, self.rows, bounds, self.cell_open_percentage,
+                                               tile_seed, regions, heavy_bounds)
+                               for bounds, tile_seed, regions, heavy_bounds in tiles]
+                    for future in futures:
+                        future.result()
+            with Stage('stitch_tiles', self.logger, rows=self.rows, tiles=len(tiles)):
+                self.stitch(memory.buf, generator)
+            # The start and end spots keep the default weight, like Grid.add_special_spots leaves them
+            memory.buf[start] = memory.buf[end] = spot_weight.DEFAULT.value
+            maze = bytes(memory.buf[:self.rows * self.rows])
+        finally:
+            memory.close()
+            memory.unlink()
+        return maze, start, end
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description='Generate a large maze in parallel tiles.')
+    parser.add_argument('--rows', type=int, default=5001, help='Number of rows of the maze.')
+    parser.add_argument('--tiles-per-side', type=int, default=TILES_PER_SIDE, help='Tiles along each side.')
+    parser.add_argument('--open-pct', type=int, default=5, help='Percentage of removable walls to open.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the maze.')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes.')
+    parser.add_argument('--output', type=str, required=True, help='File to write the maze weights to.')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    generator = TiledMazeGenerator(args.rows, args.tiles_per_side, args.open_pct, args.seed, args.workers)
+    time_start = time.perf_counter()
+    maze_bytes, start_cell, end_cell = generator.generate()
+    with open(args.output, mode='wb') as file:
+        file.write(maze_bytes)
+    generator.logger.info(f"{generator.rows}x{generator.rows} maze in {generator.tiles_per_side ** 2} tiles generated "
+                          f"in {time.perf_counter() - time_start:.2f}s, start {start_cell}, end {end_cell}")
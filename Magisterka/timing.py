@@ -0,0 +1,53 @@
+import gc
+import time
+from typing import Any, Callable, List, Tuple
+
+
+class TimingHarness:
+    def __init__(self, warmup_runs: int = 0, repetitions: int = 1, disable_gc: bool = True):
+        """
+        Initialize the TimingHarness.
+
+        Args:
+            warmup_runs (int): Untimed runs before the measurement.
+            repetitions (int): Timed runs per measurement.
+            disable_gc (bool): Pause the garbage collector during the timed regions.
+        """
+        if repetitions < 1:
+            raise ValueError('At least one timed repetition is required')
+        self.warmup_runs = warmup_runs
+        self.repetitions = repetitions
+        self.disable_gc = disable_gc
+
+    def measure(self, run: Callable[[], Any], reset: Callable[[], None]) -> Tuple[Any, List[int]]:
+        """
+        Time a callable with perf_counter_ns, keeping the reset between runs outside the timed region.
+
+        Args:
+            run (Callable[[], Any]): The measured call.
+            reset (Callable[[], None]): Restores the state changed by run. It is not called after the last repetition,
+                                        so the caller can still inspect that state.
+
+        Returns:
+            Tuple[Any, List[int]]: The result of the last repetition and the timing of every repetition in ns.
+        """
+        for _ in range(self.warmup_runs):
+            run()
+            reset()
+
+        timings = []
+        result = None
+        for repetition in range(self.repetitions):
+            if repetition:
+                reset()
+            gc_was_enabled = gc.isenabled()
+            if self.disable_gc:
+                gc.disable()
+            try:
+                time_start = time.perf_counter_ns()
+                result = run()
+                timings.append(time.perf_counter_ns() - time_start)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+        return result, timings
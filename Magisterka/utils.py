@@ -1,7 +1,12 @@
-import pygame
+from rendering import grid_renderer, render_queue
+from search_trace import SearchTrace
 from spot import Spot
 from enums.colors import Colors as colors
-from typing import List, Optional
+from typing import List, Optional, Union, TYPE_CHECKING
+
+# pygame is imported by the drawing functions on first use, headless searches never load it
+if TYPE_CHECKING:
+    import pygame
 
 
 def manhattan_heuristic(p1: Spot, p2: Spot, weight: int = 1) -> int:
@@ -34,7 +39,7 @@ def chebyshev_heuristic(spot: Spot, end: Spot) -> int:
 
 
 def reconstruct_path(path: List[Spot], grid: List[List[Spot]], start_spot: Spot, end_spot: Spot,
-                     draw_updates: bool, win: Optional[pygame.Surface], color: Optional[colors] = None,
+                     draw_updates: bool, win: Optional['pygame.Surface'], color: Optional[colors] = None,
                      window_mode: bool = True) -> None:
     """
     Reconstruct and display the path from the start spot to the end spot.
@@ -45,7 +50,7 @@ def reconstruct_path(path: List[Spot], grid: List[List[Spot]], start_spot: Spot,
         start_spot (Spot): The starting spot of the path.
         end_spot (Spot): The ending spot of the path.
         draw_updates (bool): Whether to draw updates to the window.
-        win (Optional[pygame.Surface]): The window surface to draw on.
+        win (Optional['pygame.Surface']): The window surface to draw on.
         color (Optional[colors]): The color to draw the path. Defaults to TURQUOISE.
         window_mode (bool): Whether the window mode is enabled. Defaults to True.
     """
@@ -54,52 +59,72 @@ def reconstruct_path(path: List[Spot], grid: List[List[Spot]], start_spot: Spot,
             spot.make_path(color)
             if draw_updates and window_mode:
                 draw_spot(win, spot)
-    if not draw_updates and window_mode:
+    if draw_updates and window_mode:
+        render_queue.flush()
+    elif window_mode:
+        # The search did not draw its spots, the color-index array is rebuilt from all of them
         draw_grid(win, grid)
 
 
-def draw_grid(win: pygame.Surface, grid: List[List[Spot]]) -> None:
+def draw_grid(win: 'pygame.Surface', grid: List[List[Spot]], rebuild: bool = True) -> None:
     """
-    Draw the entire grid of spots on the window surface.
+    Draw the entire grid of spots on the window surface, in one blit of its color-index array when numpy is available.
 
     Args:
         win (pygame.Surface): The window surface to draw on.
         grid (List[List[Spot]]): The grid of spots.
+        rebuild (bool): Rebuild the color-index array from the spots, False when it was kept up to date since the
+                        last rebuild. Defaults to True.
     """
-    for row in grid:
-        for spot in row:
-            spot.draw(win)
+    import pygame
+
+    if not grid_renderer.draw(win, grid, rebuild):
+        for row in grid:
+            for spot in row:
+                spot.draw(win)
     pygame.display.update()
+    render_queue.discard()
 
 
-def draw_spot(win: pygame.Surface, spot: Spot) -> None:
+def draw_spot(win: Union['pygame.Surface', SearchTrace], spot: Spot) -> None:
     """
-    Draw a single spot on the window surface.
+    Draw a single spot on the window surface and queue its rectangle, the display is updated once per frame.
+
+    A search trace passed as the window records the spot's state instead.
 
     Args:
-        win (pygame.Surface): The window surface to draw on.
+        win (Union[pygame.Surface, SearchTrace]): The window surface to draw on, or the trace to record into.
         spot (Spot): The spot to draw.
     """
-    spot.draw(win)
-    pygame.display.update()
+    if isinstance(win, SearchTrace):
+        win.record(spot)
+        return
+    grid_renderer.set_spot(spot)
+    render_queue.add(spot.draw(win))
+
+
+def flush_display() -> None:
+    """
+    Update the display with the spots drawn since the last frame, called when a search finishes.
+    """
+    render_queue.flush()
 
 
-def reset_grid(grid: List[List[Spot]], win: Optional[pygame.Surface] = None, window_mode: bool = True) -> None:
+def reset_grid(grid: List[List[Spot]], win: Optional['pygame.Surface'] = None, window_mode: bool = True) -> None:
     """
     Reset the grid to its initial state, updating the window if necessary.
 
     Args:
         grid (List[List[Spot]]): The grid of spots.
-        win (Optional[pygame.Surface]): The window surface to draw on. Defaults to None.
+        win (Optional['pygame.Surface']): The window surface to draw on. Defaults to None.
         window_mode (bool): Whether the window mode is enabled. Defaults to True.
     """
     for row in grid:
         for spot in row:
             spot.reset()
-            if window_mode and win:
-                spot.draw(win)
     if window_mode and win:
-        pygame.display.update()
+        grid_renderer.reset()
+        draw_grid(win, grid, rebuild=False)
 
 
 def is_within_bounds(x: int, y: int, rows: int) -> bool: